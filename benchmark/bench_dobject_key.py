@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+The reclaiming and the dict throughput of dobject primary keys.
+
+    python benchmark/bench_dobject_key.py [n_items]
+
+A dset of recalled rows is dropped. If the items are in reference cycles,
+they are left to the cyclic GC, and the collection that follows is long.
+The dict throughput looks up the items of dset by the keys of other equal
+objects, as the diff of dsets does.
+"""
+
+import sys
+import gc
+import time
+
+from domainics.domobj import dobject, datt, dset
+
+
+class Row(dobject):
+    sn = datt(int)
+    line = datt(int)
+    qty = datt(int)
+    name = datt(str)
+
+    __dobject_key__ = [sn, line]
+
+
+def make_rows(n):
+    return ((i // 10, i % 10, i, 'n%d' % i) for i in range(n))
+
+
+def reclaim(n):
+    ItemSet = dset(Row)
+
+    gc.collect()
+    gc.disable()
+    try:
+        ds = ItemSet._from_rows(('sn', 'line', 'qty', 'name'), make_rows(n),
+                                trusted=True)
+
+        del ds
+        t0 = time.perf_counter()
+        unreachable = gc.collect()
+        pause = time.perf_counter() - t0
+    finally:
+        gc.enable()
+
+    return unreachable, pause
+
+
+def lookup(n):
+    ItemSet = dset(Row)
+    past = ItemSet._from_rows(('sn', 'line', 'qty', 'name'), make_rows(n),
+                              trusted=True)
+    current = ItemSet._from_rows(('sn', 'line', 'qty', 'name'), make_rows(n),
+                                 trusted=True)
+
+    t0 = time.perf_counter()
+    found = sum(1 for item in current if item in past)
+    elapsed = time.perf_counter() - t0
+
+    table = dict.fromkeys(item.__dobject_key__ for item in past)
+    keys = [item.__dobject_key__ for item in current]
+
+    t0 = time.perf_counter()
+    sum(1 for key in keys if key in table)
+    dict_elapsed = time.perf_counter() - t0
+
+    return found, elapsed, dict_elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    unreachable, pause = reclaim(n)
+    print('reclaim: %8d objects left to gc, collected in %8.2f ms' % (
+                unreachable, pause * 1e3))
+
+    found, elapsed, dict_elapsed = lookup(n)
+    print('lookup:  %8d items found, %8.1f ns per item in dset, '
+          '%6.1f ns per key in dict' % (
+                found, elapsed * 1e9 / n, dict_elapsed * 1e9 / n))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory and latency of the dobject instance storage.
+
+    python benchmark/bench_dobject_storage.py [n_objects]
+
+It reports the memory allocated for each object, which includes its values
+storage and its primary key tuple, and the time of attribute get and set.
+"""
+
+import sys
+import gc
+import timeit
+import tracemalloc
+from decimal import Decimal
+
+from domainics.domobj import dobject, datt
+
+
+class Row(dobject):
+    sn = datt(int)
+    line_no = datt(int)
+    name = datt(str)
+    qty = datt(int)
+    price = datt(Decimal)
+
+    __dobject_key__ = [sn, line_no]
+
+
+def measure_memory(n):
+    values = [(i, i % 7, 'name', i % 100, Decimal(i)) for i in range(n)]
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    rows = [Row(sn=sn, line_no=ln, name=nm, qty=qty, price=pr)
+                for sn, ln, nm, qty, pr in values]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(rows) == n
+    return (end - start) / n
+
+
+def measure_latency(number):
+    row = Row(sn=1, line_no=2, name='abc', qty=10, price=Decimal('1.5'))
+    namespace = dict(row=row, Row=Row, Decimal=Decimal)
+
+    stmts = [
+        ('get attribute', 'row.qty'),
+        ('set attribute', 'row.qty = 11'),
+        ('new object', "Row(sn=1, line_no=2, name='abc', qty=10)"),
+    ]
+
+    results = []
+    for title, stmt in stmts:
+        elapsed = min(timeit.repeat(stmt, globals=namespace,
+                                    number=number, repeat=5))
+        results.append((title, elapsed / number * 1e9))
+
+    return results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print('memory per object: %.1f bytes (%d objects)' % (
+                measure_memory(n), n))
+
+    for title, ns in measure_latency(100000):
+        print('%-16s %8.1f ns' % (title + ':', ns))
+
+
+if __name__ == '__main__':
+    main()
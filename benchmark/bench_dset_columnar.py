@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory and column scan of the dset stored by items and by columns.
+
+    python benchmark/bench_dset_columnar.py [n_items]
+
+The scan sums an int attribute of all items.
+"""
+
+import sys
+import gc
+import time
+import tracemalloc
+
+from domainics.domobj import dobject, datt, dset
+from domainics.domobj.dset import ColumnarDSetImpl
+
+
+class Row(dobject):
+    sn = datt(int)
+    qty = datt(int)
+    amount = datt(float)
+    ratio = datt(float)
+
+    __dobject_key__ = [sn]
+
+
+def build(dset_cls, n):
+    rows = ((i, i % 100, i * 0.5, i / n) for i in range(n))
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    ds = dset_cls._from_rows(('sn', 'qty', 'amount', 'ratio'), rows,
+                             trusted=True)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ds, (end - start) / n
+
+
+def scan(ds):
+    t0 = time.perf_counter()
+    if isinstance(ds, ColumnarDSetImpl):
+        values = ds._column('qty') # numpy array if numpy is installed
+        total = values.sum() if hasattr(values, 'sum') else sum(values)
+    else:
+        total = sum(item.qty for item in ds)
+    return int(total), time.perf_counter() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    for title, dset_cls in [('items', dset(Row)),
+                            ('columns', dset(Row, _columnar=True))]:
+        ds, mem = build(dset_cls, n)
+        total, elapsed = scan(ds)
+        print('%-8s %8.1f bytes/item  scan %8.2f ms  (sum %d)' % (
+                    title + ':', mem, elapsed * 1e3, total))
+
+
+if __name__ == '__main__':
+    main()
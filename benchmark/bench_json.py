@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+Time and peak memory of serializing a dset by dumps and dumps_fast.
+
+    python benchmark/bench_json.py [n_items]
+"""
+
+import sys
+import time
+import datetime
+import tracemalloc
+from decimal import Decimal
+
+from domainics.domobj import dobject, datt, dset
+from domainics.json import dumps, dumps_fast
+
+
+class Row(dobject):
+    sn = datt(int)
+    name = datt(str)
+    price = datt(Decimal)
+    created = datt(datetime.datetime)
+    qty = datt(int)
+    ratio = datt(float)
+
+    __dobject_key__ = [sn]
+
+
+def measure(func, ds):
+    t0 = time.perf_counter()
+    text = func(ds)
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    func(ds)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return text, elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    created = datetime.datetime(2020, 1, 1)
+    ds = dset(Row)(Row(sn=i, name='item %d' % i, price=Decimal('1.25'),
+                       created=created, qty=i, ratio=i / 3)
+                    for i in range(n))
+
+    dumps_fast(ds[0:1]) # generate the encoder
+
+    texts = []
+    for func in [dumps, dumps_fast]:
+        text, elapsed, peak = measure(func, ds)
+        texts.append(text)
+        print('%-11s %8.2f ms  peak %8.1f KiB' % (
+                    func.__name__ + ':', elapsed * 1e3, peak / 1024))
+
+    assert texts[0] == texts[1]
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ from sqlblock.asyncpg import transaction
 
 from ..domobj import DSetBase, DObject
 from ..db import dsequence
+from ..db.identity import _bound_identity_map
 
 
 
@@ -34,6 +35,14 @@ def drecall(obj, present=False, _dsn_db=None):
 async def _recall_dobject(obj, _dsn_db=None):
 
     obj_cls = obj.__class__
+
+    # the row recalled before in this transaction
+    identity_map = _bound_identity_map(_dsn_db)
+    if identity_map is not None:
+        origin = identity_map.get(obj_cls, obj.__dobject_key__)
+        if origin is not None:
+            return origin
+
     col_names = tuple(iter_chain(obj_cls.__dobject_key__, obj.__dobject_att__))
 
     if hasattr(obj_cls, '__table_name__'):
@@ -55,7 +64,10 @@ async def _recall_dobject(obj, _dsn_db=None):
     try:
         # get the first value
         origin = await _dsn_db.__aiter__().__anext__()
-        return obj.__class__(origin)
+        origin = obj.__class__(origin)
+        if identity_map is not None:
+            identity_map.put(origin)
+        return origin
     except StopAsyncIteration:
         return obj.__class__()
 
@@ -64,7 +76,7 @@ async def _recall_dset_by_item(item_set, _dsn_db=None):
     for item in item_set:
         origin_item = await drecall(item, _dsn_db=_dsn_db)
         if origin_item:
-            origin_set._add(origin_item)
+            origin_set._add(origin_item, adopt=True)
 
     return origin_set
 
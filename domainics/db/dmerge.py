@@ -8,7 +8,8 @@ from collections import OrderedDict, namedtuple
 from collections.abc import Iterable
 from itertools import chain as iter_chain
 
-from ..domobj import dset, DSetBase, dobject, reshape
+from ..domobj import dset, DSetBase, DSetSnapshot, dobject, reshape
+from ..domobj.dobject import _tracked_changes
 from .dtable import json_object, dtable, dsequence
 
 from .sqlblock import dbc
@@ -20,20 +21,22 @@ def _dtable_diff(current, past):
     """diff dtable object, return the delta information.
 
     The delta information is a tuple, the data is added, changged and removed.
+    The past may be a snapshot of dset, only the items diverged from it are
+    compared.
     """
 
-    inslst = [] # [obj] the objects to be inserted
-    dellst = [] # [objid] the objid to be deleted
+    if isinstance(past, DSetSnapshot):
+        inslst, chglst, dellst = past._diff(current)
+        return _dtable_delta(current.__dset_item_class__,
+                             inslst, chglst, dellst)
+
+    inslst = list(current._difference(past)) # the objects to be inserted
+    dellst = list(past._difference(current)) # the objects to be deleted
     chglst = [] # [{attr: (current, past)}],  modified
 
     item_type = current.__dset_item_class__
-    pkey_attrs = item_type.__dobject_key__
     value_attrs = item_type.__dobject_att__
-    for curr_obj in current:
-        if curr_obj not in past:
-            inslst.append(curr_obj)
-            continue
-
+    for curr_obj in current._intersection(past):
         past_obj = past[curr_obj]
 
         modified = OrderedDict()
@@ -51,9 +54,42 @@ def _dtable_diff(current, past):
         if modified:
             chglst.append((curr_obj.__dobject_key__, modified))
 
-    for past_obj in past:
-        if past_obj not in current:
-            dellst.append(past_obj)
+    return _dtable_delta(item_type, inslst, chglst, dellst)
+
+def _dtable_changes(current):
+    """
+    Return the delta information of the changes tracked in the current dset
+    or dobject, as _dtable_diff does, without the past one.
+    """
+
+    if isinstance(current, DSetBase):
+        item_type = current.__dset_item_class__
+        inslst, chglst, dellst = current._changes()
+    else:
+        item_type = current.__class__
+        modified = current._changes()
+        chglst = [(current.__dobject_key__, modified)] if modified else []
+        inslst, dellst = [], []
+
+    return _dtable_delta(item_type, inslst, chglst, dellst)
+
+def _is_tracked(obj):
+    """Return true if the changes of the dobject or dset are tracked"""
+
+    if isinstance(obj, DSetBase):
+        return obj.__dset_changes__ is not None
+
+    return _tracked_changes(obj) is not None
+
+def _dtable_delta(item_type, inslst, chglst, dellst):
+    """
+    Make the delta information from the objects to be inserted, the changes
+    of objects in [(key, {attr: (current, past)})] and the keys or objects
+    to be deleted.
+    """
+
+    pkey_attrs = item_type.__dobject_key__
+    value_attrs = item_type.__dobject_att__
 
     # inserted data tuple
     pkvals, values = [], []
@@ -75,7 +111,6 @@ def _dtable_diff(current, past):
     dt_ins = _EntryTuple(pkey_attrs, pkvals, value_attrs, values)
 
     # deleted data tuple
-    item_type = past.__dset_item_class__
     pkvals = []
     for obj in dellst:
         pkvals.append(tuple(getattr(obj, f) for f in pkey_attrs))
@@ -96,10 +131,22 @@ def _dtable_diff(current, past):
 
 def pq_dtable_merge(current, past):
 
-    dins, dchg, ddel = _dtable_diff(current, past)
-    table_name = current.__dset_item_class__.__name__
+    if past is None: # the changes tracked in current
+        dins, dchg, ddel = _dtable_changes(current)
+    else:
+        dins, dchg, ddel = _dtable_diff(current, past)
 
-    dobj_cls = current.__dset_item_class__
+    if isinstance(current, DSetBase):
+        dobj_cls = current.__dset_item_class__
+    else:
+        dobj_cls = current.__class__
+
+    # the objects of written keys recalled in this transaction are stale
+    dbc.identity_map.discard(dobj_cls, iter_chain(dins.pkey_values,
+                                                  dchg.pkey_values,
+                                                  ddel.pkey_values))
+
+    table_name = dobj_cls.__name__
     attrs = OrderedDict((attr_name, attr) for attr_name, attr in
                         iter_chain(dobj_cls.__dobject_key__.items(),
                                    dobj_cls.__dobject_att__.items()))
@@ -216,10 +263,26 @@ def dmerge(current, origin=None):
     """
     Merge the current change of object into the origin.
 
+    If the origin is not given and the changes of current are tracked by
+    current._track_changes(), the tracked changes are merged without the
+    origin, and the tracking is restarted once they are merged. The dsets
+    in the attributes of a tracked dobject are not merged with it, merge
+    them by themselves.
     """
     if current is None and origin is None:
         return
 
+    if origin is None and _is_tracked(current):
+        if dbc.dbms != 'postgres':
+            # the tracked changes are kept, not discarded without merging
+            err = "The tracked changes cannot be merged in dbms '%s'"
+            raise NotImplementedError(err % dbc.dbms)
+
+        # only the changes tracked since it was saved are merged
+        pq_dtable_merge(current, None)
+        current._track_changes()
+        return
+
     if current is not None and not isinstance(current, DSetBase):
         if not isinstance(current, dobject):
             err = 'The current object should be dobject or dset type: %s'
@@ -230,7 +293,8 @@ def dmerge(current, origin=None):
         dos._add(current)
         current = dos
 
-    if origin is not None and not isinstance(origin, DSetBase):
+    if origin is not None and not isinstance(origin,
+                                             (DSetBase, DSetSnapshot)):
         if not isinstance(origin, dobject):
             err = 'The origin object should be dobject or dset type: %s'
             err %= origin.__class__.__name__
@@ -243,7 +307,10 @@ def dmerge(current, origin=None):
         origin = dos
 
     if current is None:
-        current = origin.__class__()
+        if isinstance(origin, DSetSnapshot):
+            current = origin._dset_class()
+        else:
+            current = origin.__class__()
 
     if origin is None:
         origin = current.__class__()
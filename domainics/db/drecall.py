@@ -28,6 +28,13 @@ def drecall(obj, present=False):
 def _recall_dobject(obj):
 
     obj_cls = obj.__class__
+
+    # the row recalled before in this transaction
+    identity_map = dbc.identity_map
+    origin = identity_map.get(obj_cls, obj.__dobject_key__)
+    if origin is not None:
+        return origin
+
     col_names = tuple(iter_chain(obj_cls.__dobject_key__, obj.__dobject_att__))
 
     if hasattr(obj_cls, '__table_name__'):
@@ -50,7 +57,9 @@ def _recall_dobject(obj):
     dbc << sql << tuple(pk_values)
     origin = next(dbc)
     if origin is not None:
-        return obj.__class__(origin)
+        origin = obj.__class__(origin)
+        identity_map.put(origin)
+        return origin
     else:
         return obj.__class__()
 
@@ -59,7 +68,7 @@ def _recall_dset_by_item(item_set):
     for item in item_set:
         origin_item = drecall(item)
         if origin_item:
-            origin_set._add(origin_item)
+            origin_set._add(origin_item, adopt=True)
 
     return origin_set
 
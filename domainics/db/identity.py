@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+from ..domobj.dobject import _share_vector, _shared_copy
+from .dtable import dsequence
+
+
+def _table_name(dobj_cls):
+    return getattr(dobj_cls, '__table_name__', dobj_cls.__name__)
+
+
+def _identity_key(key_values):
+    """
+    Return the primary key values in a plain tuple, the sequence values are
+    taken by their numbers. None is returned if a sequence is unallocated.
+    """
+
+    values = []
+    for value in key_values:
+        if isinstance(value, dsequence):
+            value = value.value
+            if value is None:
+                return None
+
+        values.append(value)
+
+    return tuple(values)
+
+
+class DIdentityMap:
+    """
+    The map of the objects recalled in a transaction, keyed by the dtable
+    class and the primary key. The recalls of the same row are served from it
+    without querying the database, and the callers share the same object.
+
+    The object is shared while it is not changed. It is marked as a snapshot
+    does, once it is changed, the later recalls get a new object of the
+    values recalled, as the database has them until they are merged.
+
+    The least recently used objects are evicted beyond the limit. dmerge
+    invalidates the objects of the keys it writes. The writes in plain SQL
+    are not seen, call clear() after them.
+    """
+
+    __slots__ = ('limit', '_entries', '_tables')
+
+    def __init__(self, limit=4096):
+        self.limit = limit
+        self._entries = OrderedDict() # {(cls, key): (obj, vector)}
+        self._tables = {} # {table_name: {cls: None}}
+
+    def get(self, dobj_cls, key_values):
+        """Return the object of the key recalled before, or None"""
+
+        key = _identity_key(key_values)
+        if key is None:
+            return None
+
+        entry_key = (dobj_cls, key)
+        entry = self._entries.get(entry_key, None)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(entry_key)
+
+        obj, vector = entry
+        if obj.__value_vector__ is not vector: # changed by a caller
+            obj = _shared_copy(obj, vector)
+            self._entries[entry_key] = (obj, vector)
+
+        return obj
+
+    def put(self, obj):
+        """Keep the recalled object, which is shared from now on"""
+
+        if self.limit <= 0:
+            return
+
+        dobj_cls = obj.__class__
+        key = _identity_key(obj.__dobject_key__)
+        if key is None:
+            return
+
+        if not dobj_cls.__dobject_frozen__:
+            _share_vector(obj)
+
+        entries = self._entries
+        entries[(dobj_cls, key)] = (obj, obj.__value_vector__)
+        entries.move_to_end((dobj_cls, key))
+        self._tables.setdefault(_table_name(dobj_cls), {})[dobj_cls] = None
+
+        while len(entries) > self.limit:
+            entries.popitem(last=False)
+
+    def discard(self, dobj_cls, keys):
+        """
+        Discard the objects of the keys from the map, including those of the
+        other classes recalled from the same table.
+        """
+
+        classes = self._tables.get(_table_name(dobj_cls), None)
+        if not classes:
+            return
+
+        entries = self._entries
+        for key in keys:
+            key = _identity_key(key)
+            if key is None:
+                continue
+
+            for cls in classes:
+                entries.pop((cls, key), None)
+
+    def clear(self):
+        self._entries.clear()
+        self._tables.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '%s(%d objects, limit=%d)' % (self.__class__.__name__,
+                                             len(self._entries), self.limit)
+
+
+_bound_maps = WeakKeyDictionary()
+_bound_limit = 4096
+
+def set_identity_limit(limit):
+    """
+    Set the limit of objects in the identity map bound to each transaction
+    of asyncdb, as identity_limit of sqlblock(...) does in db. The maps are
+    not kept if the limit is 0.
+    """
+
+    global _bound_limit
+    _bound_limit = int(limit)
+
+# The sqlblock package has no public attribute of the parent block, the
+# names used by its versions are tried in turn.
+_parent_attrs = ('_parent_sqlblk', '_parent')
+
+def _parent_block(block):
+    for attr_name in _parent_attrs:
+        parent = getattr(block, attr_name, None)
+        if parent is not None:
+            return parent
+
+    return None
+
+def _is_autocommit(block):
+    for attr_name in ('autocommit', '_autocommit'):
+        autocommit = getattr(block, attr_name, None)
+        if autocommit is not None:
+            return bool(autocommit)
+
+    return False
+
+def _bound_identity_map(block):
+    """
+    Return the identity map bound to the transaction block which does not
+    keep one by itself, like the sqlblock of asyncdb. A block is made for
+    each call of function decorated by the transaction, and it shares the
+    connection of its parent block. So the map is bound to the outermost
+    block of transaction, and lives as long as it.
+
+    None is returned if the outermost block is in autocommit mode, whose
+    statements are not in a transaction, or if the limit is 0, or if the
+    block cannot be referred weakly.
+    """
+
+    seen = set() # guard against a cycle of unknown attributes
+    parent = _parent_block(block)
+    while parent is not None and id(parent) not in seen:
+        seen.add(id(block))
+        block = parent
+        parent = _parent_block(block)
+
+    if _bound_limit <= 0 or _is_autocommit(block):
+        return None
+
+    try:
+        identity_map = _bound_maps.get(block, None)
+        if identity_map is None:
+            identity_map = _bound_maps[block] = DIdentityMap(_bound_limit)
+    except TypeError:
+        return None
+
+    return identity_map
@@ -29,8 +29,10 @@ class jsonb:
 class PostgreSQLBlock(BaseSQLBlock):
     _conn_pools = {}
 
-    def __init__(self, dsn='DEFAULT', autocommit=False, record_type=None):
-        super(PostgreSQLBlock, self).__init__('postgres', dsn, autocommit, record_type)
+    def __init__(self, dsn='DEFAULT', autocommit=False, record_type=None,
+                 identity_limit=4096):
+        super(PostgreSQLBlock, self).__init__('postgres', dsn, autocommit,
+                                              record_type, identity_limit)
 
     @classmethod
     def set_dsn(cls, **kwargs):
@@ -13,8 +13,11 @@ from abc import abstractmethod
 from inspect import isgenerator
 
 from ..util     import nameddict   as _nameddict
+from ..util     import record_tuple_class as _record_tuple_class
 from ..pillar   import _pillar_history, pillar_class, PillarError, History
 from ..domobj   import dobject
+from ..domobj.metaclass import _row_loader
+from .identity import DIdentityMap
 
 from ..pillar   import P
 
@@ -61,52 +64,69 @@ def set_dsn(**kwargs):
     else:
         raise ValueError('unkown DBMS: ' + dbsys)
 
-def sqlblock(dsn='DEFAULT', autocommit=False, record_type=None):
+def sqlblock(dsn='DEFAULT', autocommit=False, record_type=None,
+             identity_limit=4096):
 
     sqlblock_class = _dsn_class[dsn]
 
     blkobj = sqlblock_class(
         dsn=dsn,
         autocommit=autocommit,
-        record_type=record_type)
+        record_type=record_type,
+        identity_limit=identity_limit)
 
     return blkobj
 
 def record_dict(cursor):
-    fields = (d[0] for d in cursor.description)
+    fields = tuple(d[0] for d in cursor.description or ())
     for row in cursor:
         yield OrderedDict(zip(fields, row))
 
 def record_namedtuple(cursor):
-    dt = _namedtuple("Row", [d[0] for d in cursor.description or ()])
+    dt = _row_class(_namedtuple, _description_names(cursor))
     for row in cursor:
         yield dt(*row)
 
 def record_plainobj(cursor):
-    dt = _nameddict("Row", [d[0] for d in cursor.description or ()])
+    dt = _row_class(_nameddict, _description_names(cursor))
     for row in cursor:
         yield dt(*row)
 
-def make_record_dtable(dobj_cls):
+def record_tuple(cursor):
+    """
+    The rows are tuples whose fields can be accessed by names, they share
+    the field name map with the other rows in the same shape.
+    """
+    dt = _row_class(_record_tuple_class, _description_names(cursor))
+    for row in cursor:
+        yield dt(row)
 
-    attrnames = set(dobj_cls._dobj_attrs.keys())
+def _description_names(cursor):
+    return tuple(d[0] for d in cursor.description or ())
 
-    def record_dtable(cursor):
-        nonlocal attrnames
+@functools.lru_cache(maxsize=128)
+def _row_class(class_factory, field_names):
+    """
+    The row classes are cached by the column names of query result, instead
+    of making a new class for each query.
+    """
+    return class_factory("Row", field_names)
 
-        fields = [d[0] for d in cursor.description or ()]
+def make_record_dtable(dobj_cls, trusted=False):
+    """
+    Make the record type that turns the rows into the objects of dobj_cls.
 
-        colnames, colidxs = [], []
-        for i, f in enumerate(fields):
-            if f not in attrnames:
-                continue
-            colnames.append(f)
-            colidxs.append(i)
+    The columns are mapped into the attributes once for each shape of query
+    result, and the mapping is cached in the class.
+    """
 
+    def record_dtable(cursor):
+        colnames = tuple(d[0] for d in cursor.description or ())
+        load_row = _row_loader(dobj_cls, colnames, trusted=trusted)
+        for row in cursor:
+            yield load_row(row, None)
 
-        dt = _nameddict("Row", [d[0] for d in cursor.description or ()])
-        # for row in cursor:
-        #     yield dobj_cls(**zip(colnames, (row[i] for i in colidxs))
+    return record_dtable
 
 class SQLSegmentList(list):
     pass
@@ -210,7 +230,8 @@ def sqltext(*sql_texts, sep=''):
     return sqltext
 
 class BaseSQLBlock:
-    def __init__(self, dbms, dsn='DEFAULT', autocommit=False, record_type=None):
+    def __init__(self, dbms, dsn='DEFAULT', autocommit=False, record_type=None,
+                 identity_limit=4096):
 
         self._record_type = record_type or _default_record_type
 
@@ -218,6 +239,9 @@ class BaseSQLBlock:
         self.dsn = dsn
         self.autocommit = autocommit
 
+        # the objects recalled in this transaction, not kept in autocommit
+        self.identity_map = DIdentityMap(0 if autocommit else identity_limit)
+
         # self._cur_record_type = None
         self._iter = None
         self._sql_builder = SQLText()
@@ -305,40 +329,14 @@ class BaseSQLBlock:
         raise NotImplemented()
 
     def __dset__(self, item_type):
+        """Make the objects of item_type from the records of query result"""
 
-        dobj_attrs = OrderedDict((attr_name, attr) for attr_name, attr in
-                            iter_chain(item_type.__dobject_key__.items(),
-                                       item_type.__dobject_att__.items()))
-
-        colnames = []
-        selected = []
-        for i, d in enumerate(self._cursor.description):
-            colname = d[0]
-            if colname in dobj_attrs:
-                selected.append(i)
-                colnames.append(colname)
-
-        for record in self._cursor:
-
-            obj = dict((k, v) for k, v in
-                                zip(colnames, (record[i] for i in selected)))
-            yield item_type(**obj)
-
-
-
-def _new_dobject(dobj_cls, attr_pairs):
-    """new dobject with attribute (name, value) pairs"""
-
-    instance = dobj_cls()
+        self._push()
 
-    attrs  = dobj_cls._dobj_attrs
-    values = getattr(instance, '__dobject_attrs')
+        colnames = [d[0] for d in self._cursor.description or ()]
+        return item_type._from_rows(colnames, self._cursor)
 
-    for attr_name, attr_val in attr_pairs:
-        if attr_name in attrs:
-            values[attr_name] = attr_val
 
-    return instance
 
 _default_record_type = record_plainobj
 
@@ -40,6 +40,10 @@ Rehape dobject type:
 
         A._re(..., _name="new_type_name", ...)
 
+    The same reshaping in the same module returns the identical class, and
+    so does dset(...) with the same arguments. The class is shared by all
+    callers, do not assign attributes to it, subclass it instead.
+
 Reshape dobject object:
 
     Shape or reshape a object in a new type:
@@ -50,6 +54,10 @@ Reshape dobject object:
 
         obj._re(A, ...)  # TBD: this form is still disputable.
 
+    View a object in a reshaped type without copying:
+        A._re('a', 'b')._view(obj)
+        A._re('a', 'b')._view(ds)  # the view of each item
+
     Set value of attribute
         obj._re(attr1 = val1, attr2 = val2, ...)
 
@@ -62,6 +70,17 @@ Attribute assigment:
     obj.attr1 = val1
 
 
+Frozen dobject - The value object that cannot be changed.
+
+    class Money(dobject, frozen=True):
+        ...
+
+    The attributes of frozen dobject are read-only, and the frozen class is
+    inherited by its subclasses and reshaped classes. Its attributes should
+    not be dset or unfrozen dobject. Being immutable, it is shared instead of
+    being copied by A(obj) and dset, and hashable even without primary key.
+
+
 Truth value of dobject - Whether it is not empty.
 
     Importantly, the python None value does not have semantic meaning in
@@ -165,8 +184,9 @@ by forbidding external objects from holding references to its members.
 """
 
 #
-from .typing import DSet, DObject
+from .typing import DSet, DObject, register_converter
 from .dattr import datt
 from .dobject import dobject
-from .dset import dset, DSetBase
+from .dset import dset, DSetBase, DSetSnapshot
 from .pagination import DPage
+from .dquery import dcol
@@ -11,37 +11,42 @@ from decimal import Decimal
 # from dateutil.parser import parse as datetime_parse
 
 from .typing import DSet, cast_attr_value, DAttribute, DAggregate
+from .typing import make_attr_caster
 from .typing import DObject, AnyDObject, DSetBase
-from .dset import dset
+from .dset import dset, ColumnarDSetImpl
+from .dobject import _SharedVector, _unshare_vector
 
 class datt(DAttribute):
     """Attribute of dobject"""
 
-    __slots__ = ('name', 'type', 'default_expr', 'default', 'len', 'doc')
+    __slots__ = ('name', 'type', 'default_expr', 'default', 'len', 'doc',
+                 'index', 'cast')
 
     def __init__(self, type=object, default=None, len=None, doc=None, **kwargs):
         self.name = None
+        self.index = None # the position in value vector of dobject
         self.type = type
         self.len = len
         self.default = default
         self.doc = doc
         self.owner_class = None
         self._kwargs = kwargs
+        self.cast = self._make_caster()
 
     def __get__(self, instance, owner):
         if instance is None: # get domain field
             return self
 
-        attr_value = instance.__value_dict__.get(self.name, None)
+        attr_value = instance.__value_vector__[self.index]
 
         if attr_value is None:
             if hasattr(self.type, '__default_value__'):
                 attr_value = self.type.__default_value__()
-                instance.__value_dict__[self.name] = attr_value
+                instance.__value_vector__[self.index] = attr_value
 
             elif self.default is not None:
                 attr_value = self.initialize(instance)
-                instance.__value_dict__[self.name] = attr_value
+                instance.__value_vector__[self.index] = attr_value
 
         return attr_value
 
@@ -51,6 +56,16 @@ class datt(DAttribute):
             errmsg %= self.name
             raise ValueError(errmsg)
 
+        changes = getattr(instance, '__dobject_changes__', None)
+        if changes is not None and changes.__class__ is _SharedVector:
+            changes = _unshare_vector(instance, changes)
+
+        if changes is not None and self.name not in changes:
+            # the dset attribute records its added and removed items itself
+            original = self.__get__(instance, None)
+            if not isinstance(original, DSetBase):
+                changes[self.name] = original
+
         self.set_value_unguardedly(instance, value)
 
     def setup(self, owner_class, attr_name):
@@ -66,15 +81,34 @@ class datt(DAttribute):
             dset_cls = self.type
             key_names = list(dset_cls.__dobject_key__.keys())
 
+            columnar = issubclass(dset_cls, ColumnarDSetImpl)
+            links = dict((master_attr, slave_attr) for slave_attr, master_attr
+                            in dset_cls.__dset_links__.items())
             self.type = dset(dset_cls.__dset_item_class__,
                              _dominion = owner_class,
-                             _key = key_names
+                             _key = key_names,
+                             _columnar = columnar,
+                             _index = dset_cls.__dset_index_names__,
+                             _sortable = dset_cls.__dset_sortable__,
+                             _module = owner_class.__module__,
+                             **links
                              )
 
-            self.type.__dset_links__ = dset_cls.__dset_links__
-
             self.default = self.type # the inializer of dset
 
+        self.cast = self._make_caster()
+
+    def _make_caster(self):
+        """
+        The caster of value is resolved by the type of attribute. A dset
+        attribute has no caster, its items are added into the dset.
+        """
+
+        if issubclass(self.type, DSetBase):
+            return None
+
+        return make_attr_caster(self.name, self.type)
+
     def initialize(self, instance):
         """  """
 
@@ -95,36 +129,32 @@ class datt(DAttribute):
 
     def set_value_unguardedly(self, instance, value):
 
-        attr_values  = instance.__value_dict__
-        if issubclass(self.type, DSetBase) and isinstance(value, Iterable):
-
-            if self.name not in attr_values:
-                attr_value = self.initialize(instance)
-                attr_value += value
-                attr_values[self.name] = attr_value
-            else:
-                attr_value = attr_values[self.name]
-                if value is not attr_value : # important!
-                    attr_value._clear()
-                    attr_value += value
-
+        attr_values  = instance.__value_vector__
+        if self.cast is not None:
+            attr_values[self.index] = self.cast(value)
             return
 
-        elif hasattr(self.type, '__setter_filter__'):
-            value = self.type.__setter_filter__(value)
-
-        elif hasattr(value.__class__, '__dobject_cast__'):
-            value = value.__dobject_cast__(self.type)
+        if not isinstance(value, Iterable):
+            attr_values[self.index] = cast_attr_value(self.name, value,
+                                                      self.type)
+            return
 
+        attr_value = attr_values[self.index]
+        if attr_value is None:
+            attr_value = self.initialize(instance)
+            attr_value += value
+            attr_values[self.index] = attr_value
         else:
-            value = cast_attr_value(self.name, value, self.type)
-
-        attr_values[self.name] = value
+            if value is not attr_value : # important!
+                attr_value._clear()
+                attr_value += value
 
     def copy(self):
 
         obj = datt(type=self.type, default=self.default, doc=self.doc,
                                 **self._kwargs)
         obj.name = self.name
+        obj.index = self.index
+        obj.cast = self.cast
         obj.owner_class  = self.owner_class
         return obj
@@ -7,119 +7,160 @@ from decimal import Decimal
 from itertools import chain as iter_chain
 
 from .typing import DSet, DObject, DSetBase
-from .metaclass import DObjectMetaClass
+from .metaclass import DObjectMetaClass, _row_loader
+from .reshape import _make_view
 # from ._reshape import ReshapeOperator
 
 
-class dobject(DObject, metaclass=DObjectMetaClass):
+class _SharedVector:
+    """
+    The mark in the dobject whose value vector is shared with snapshots. The
+    vector is copied before the first write to its attribute. The changes
+    tracked in the dobject are kept in the mark.
+    """
 
-    def __new__(cls, *args, **kwargs):
+    __slots__ = ('changes', )
+
+    def __init__(self, changes=None):
+        self.changes = changes
+
+_shared_vector = _SharedVector()
+
+
+def _share_vector(obj):
+    """Mark the value vector of the dobject as shared with a snapshot"""
+
+    changes = getattr(obj, '__dobject_changes__', None)
+    if changes is None:
+        object.__setattr__(obj, '__dobject_changes__', _shared_vector)
+    elif changes.__class__ is not _SharedVector:
+        object.__setattr__(obj, '__dobject_changes__', _SharedVector(changes))
+
+
+def _shared_copy(obj, vector):
+    """
+    Make a dobject of the class and key of obj on the value vector, which is
+    kept by a snapshot. The vector is shared, and copied on write.
+    """
+
+    if obj.__class__.__dobject_frozen__: # never changed
+        return obj
 
-        instance = super(dobject, cls).__new__(cls)  # new instance of dobject
+    copy = object.__new__(obj.__class__)
+    object.__setattr__(copy, '__value_vector__', vector)
+    object.__setattr__(copy, '__key_tuple__', obj.__key_tuple__)
+    object.__setattr__(copy, '__dobject_changes__', _shared_vector)
+    return copy
 
 
-        # store values of attributes
-        super(dobject, instance).__setattr__('__value_dict__', OrderedDict())
+def _unshare_vector(obj, mark):
+    """
+    Copy the shared value vector of the dobject before it is written, and
+    return the tracked changes kept in the mark.
+    """
 
-        attributes = OrderedDict(iter_chain(cls.__dobject_key__.items(),
-                                            cls.__dobject_att__.items()))
+    object.__setattr__(obj, '__value_vector__', list(obj.__value_vector__))
+    object.__setattr__(obj, '__dobject_changes__', mark.changes)
+    return mark.changes
 
-        aggregates = []
-        seen = set()
-        if args:
-            if len(args) > 1:
-                errmsg = "Do not exceed one positional argument: "
-                errmsg += "(obj, attr1='', ...) or (attr1='', ...) "
-                raise ValueError(errmsg)
 
-            source_obj = args[0] # reshape the given object or dict
-            if isinstance(source_obj, Mapping): # like {}
-                for attr_name, attr in attributes.items():
-                    if attr_name in kwargs:
-                        continue # this value will be set laterly
+def _tracked_changes(obj):
+    """
+    Return the original values of attributes changed in the dobject since
+    its changes were tracked, or None if they are not tracked.
+    """
 
-                    if attr_name not in source_obj:
-                        continue
+    changes = getattr(obj, '__dobject_changes__', None)
+    if changes is not None and changes.__class__ is _SharedVector:
+        return changes.changes
 
-                    attr_val = source_obj[attr_name]
-                    attr.set_value_unguardedly(instance, attr_val)
-                    seen.add(attr_name)
+    return changes
 
-            elif isinstance(source_obj, DObject):
-                if (cls.__dobject_origin_class__ and
-                        isinstance(source_obj, cls.__dobject_origin_class__)):
-                    subst_mapping = {}
-                    for o_name, n_name in cls.__dobject_mapping__.items():
-                        subst_mapping[n_name] = o_name
-                        if n_name not in cls.__dobject_mapping__:
-                            # _subst=dict(a=b*, b=a) if o_name in mapping
-                            subst_mapping[o_name] = None # mark it not to clone
 
-                else:
-                    subst_mapping = {}
+class dobject(DObject, metaclass=DObjectMetaClass):
 
-                for attr_name, attr in attributes.items():
-                    if attr_name in kwargs:
-                        continue # this value will be set laterly
+    # the cached hash of frozen dobject is kept in a slot declared here once,
+    # so that a class may inherit from several frozen classes.
+    __slots__ = ('__value_vector__', '__key_tuple__', '__dobject_changes__',
+                 '__dobject_hash__')
 
-                    if attr_name in subst_mapping:
-                        src_attr_name = subst_mapping[attr_name]
-                        if src_attr_name is None:
-                            continue
-                    else:
-                        src_attr_name = attr_name
+    def __new__(cls, *args, **kwargs):
+        """
+        dobject(obj, attr1=val1, ...) or dobject(attr1=val1, ...)
 
-                    if not hasattr(source_obj, src_attr_name):
-                        continue
+        The constructor is generated for each dobject class by the metaclass.
+        """
+        return cls.__dobject_new__(cls, *args, **kwargs)
 
-                    attr_val = getattr(source_obj, src_attr_name)
-                    # if isinstance(attr_val, DSetBase):
-                    #     # NOTED: the dominion object is required to replace
-                    #     aggregates.append((attr_name, attr, attr_val))
-                    #     continue
+    @classmethod
+    def _from_rows(cls, column_names, rows, trusted=False):
+        """
+        Create dobjects from rows, like the records of query result, in a list.
 
+        The columns named in column_names are mapped into the attributes once.
+        The values are casted as the constructor does. If trusted is true, the
+        values returned by database driver are stored without casting, which
+        is faster if they are known in the right types.
+        """
 
-                    attr.set_value_unguardedly(instance, attr_val)
-                    seen.add(attr_name)
-            else:
-                for attr_name, attr in attributes.items():
-                    if attr_name in kwargs:
-                        continue # this value will be set laterly
+        load_row = _row_loader(cls, column_names, trusted=trusted)
+        return [load_row(row, None) for row in rows]
 
-                    if not hasattr(source_obj, attr_name):
-                        continue
+    @classmethod
+    def _view(cls, source):
+        """
+        Make a read-only view of the source dobject in the shape of this
+        class, or a view of the items if the source is a dset, like
+        A._re('a', 'b')._view(obj). The attributes are read through the
+        source without copying, and the substituted attributes of reshaped
+        class are read from their original names.
+        """
 
-                    attr_val = getattr(source_obj, attr_name)
-                    attr.set_value_unguardedly(instance, attr_val)
-                    seen.add(attr_name)
+        return _make_view(cls, source)
 
-        for arg_name, arg_value in kwargs.items():
+    def _track_changes(self):
+        """
+        Track the changes of value attributes from now on, as this dobject is
+        the same as the saved one. The original values of the attributes set
+        later are recorded, and the changes are saved by dmerge(obj) without
+        recalling the origin. Calling it again restarts the tracking, as
+        dmerge does after saving.
+        """
 
-            attr = attributes.get(arg_name, None)
-            if attr is None:
-                errmsg = "No attribue '%s' defined in %s"
-                errmsg %= (arg_name, cls.__name__)
-                raise ValueError(errmsg)
+        changes = getattr(self, '__dobject_changes__', None)
+        if changes is not None and changes.__class__ is _SharedVector:
+            # the vector is still shared with snapshots
+            object.__setattr__(self, '__dobject_changes__', _SharedVector({}))
+        else:
+            object.__setattr__(self, '__dobject_changes__', {})
 
-            attr.set_value_unguardedly(instance, arg_value)
-            seen.add(arg_name)
+        return self
 
-        # for attr_name, attr, attr_val in aggregates:
-        #     attr_val = attr.type(attr_val, _dominion = instance)
+    def _changes(self):
+        """
+        Return the changed attributes in an OrderedDict {attr: (new, old)},
+        or None if the changes are not tracked. The attribute set back to its
+        original value is not changed.
+        """
 
-        # # set default values for these left parameters
-        # for attr_name, attr in parameters.items():
-        #     getattr(instance, attr_name)
-        #     # force it to get chance to check default value
+        changes = _tracked_changes(self)
+        if changes is None:
+            return None
 
-        pkey_att_vals = tuple(getattr(instance, attr_name)
-                                for attr_name in cls.__dobject_key__)
+        modified = OrderedDict()
+        if not changes:
+            return modified
 
-        setattr(instance, '__dobject_key__',
-                                        cls.__dobject_key_class__(instance))
+        for attr_name in self.__class__.__dobject_att__:
+            if attr_name not in changes:
+                continue
 
-        return instance
+            newval = getattr(self, attr_name)
+            oldval = changes[attr_name]
+            if newval != oldval:
+                modified[attr_name] = (newval, oldval)
 
+        return modified
 
     # def __getattr__(self, name):
     #     errmsg ='The domain object %s has no field: %s '
@@ -127,17 +168,31 @@ class dobject(DObject, metaclass=DObjectMetaClass):
     #     raise AttributeError(errmsg)
 
     def __setattr__(self, name, value):
-        if hasattr(self, name):
+        if self.__class__.__dobject_frozen__:
+            errmsg = "The attribute '%s' of frozen dobject %s is read-only"
+            errmsg %= (name, self.__class__.__name__)
+            raise AttributeError(errmsg)
+
+        if hasattr(self.__class__, name):
             super(dobject, self).__setattr__(name, value)
         else:
             errmsg ='The domain object %s has no field: %s '
             errmsg %= (self.__class__.__name__, name)
             raise AttributeError(errmsg)
 
+    def __setstate__(self, state):
+        """
+        Restore the slots of object copied or unpickled. They are set directly,
+        since the attributes of frozen dobject are read-only.
+        """
+
+        state, slots = state if isinstance(state, tuple) else (state, None)
+        for name, value in iter_chain((state or {}).items(),
+                                      (slots or {}).items()):
+            object.__setattr__(self, name, value)
+
     def __repr__(self):
         """ """
-        values =  self.__value_dict__
-
         segs = [repr(self.__dobject_key__)] if self.__dobject_key__ else []
         segs += ['%s=%r' % (attr_name, getattr(self, attr_name))
                     for attr_name in self.__class__.__dobject_att__]
@@ -149,21 +204,21 @@ class dobject(DObject, metaclass=DObjectMetaClass):
         When the primary key attribute is specified, this dobject is equal to
         the other if the attribues of primary key are equaled. Otherwise, all
         attributes are needed to be equaled if the two dobject are equaled.
+
+        The other object is not equal. It is not compared by raising error,
+        since the keyed dobject is hashed as its key tuple and is compared
+        with the tuple of the same hash in a dict or set.
         """
 
         if other is None :
             return False
 
-        # if not isinstance(other, dobject):  # it's weird:   A() == 9999
-        #
-        if not isinstance(other, dobject):  #
-            errmsg = "The value should be a dobject, not '%s' type"
-            errmsg %= other.__class__.__name__
-            raise ValueError(errmsg)
-            # other = self.__class__(other) # it's weird:   A() == 9999
+        if not isinstance(other, dobject): # A() == 9999 is False
+            return NotImplemented
 
-        if self.__class__.__dobject_key__:
-            return self.__dobject_key__ == other.__dobject_key__
+        key = self.__key_tuple__
+        if key: # the class has primary key
+            return key == other.__key_tuple__
 
         for attr_name in self.__class__.__dobject_att__.keys():
             if getattr(self, attr_name) != getattr(other, attr_name, None):
@@ -171,6 +226,37 @@ class dobject(DObject, metaclass=DObjectMetaClass):
 
         return True
 
+    def __hash__(self):
+        """
+        The dobject with primary key is hashed by its key tuple, as it is
+        equal to others by the key. The key attributes are read-only, so the
+        hash is not changed.
+
+        The frozen dobject without primary key is hashed by the values of all
+        attributes, the hash is cached in it. The other dobject without
+        primary key is unhashable, since its attributes can be changed.
+        """
+
+        key = self.__key_tuple__
+        if key:
+            return hash(key)
+
+        cls = self.__class__
+        if cls.__dobject_frozen__:
+            try:
+                return self.__dobject_hash__
+            except AttributeError:
+                pass
+
+            value = hash(tuple(getattr(self, attr_name)
+                                for attr_name in cls.__dobject_att__))
+            object.__setattr__(self, '__dobject_hash__', value)
+            return value
+
+        errmsg = "The dobject '%s' without primary key is unhashable"
+        errmsg %= cls.__name__
+        raise TypeError(errmsg)
+
     def __bool__(self):
         """
         """
@@ -179,10 +265,11 @@ class dobject(DObject, metaclass=DObjectMetaClass):
         if not cls.__dobject_att__ and not cls.__dobject_key__:
             return False  # no attribues defined in this dobject
 
+        values = self.__value_vector__
         for attr_name, attr in iter_chain(cls.__dobject_key__.items(),
                                           cls.__dobject_att__.items()):
 
-            if attr_name not in self.__value_dict__:
+            if values[attr.index] is None:
                 continue # The truth value of attribute is false
 
             attr_val = getattr(self, attr_name)
@@ -199,7 +286,6 @@ class dobject(DObject, metaclass=DObjectMetaClass):
 
         cls = self.__class__
 
-        self_attrs = getattr(self,   '__value_dict__')
         data = OrderedDict()
         for attr_name in iter_chain(cls.__dobject_key__, cls.__dobject_att__):
             attr_value = getattr(self, attr_name)
@@ -0,0 +1,630 @@
+# -*- coding: utf-8 -*-
+
+"""
+Query the items of dset in batch.
+
+    ds._where(dcol('qty') > 10, sku='a')
+    ds._where((dcol('qty') > 10) | dcol('sku').isin(['a', 'b']))
+    ds._where(lambda item: item.qty > item.min_qty)
+
+    ds._order_by('-qty', '+sn')
+
+    ds._group_by('sku').agg(total=('sum', 'qty'), max='qty', n=('count',))
+
+    ds._track(total=('sum', 'qty'), by='sku')
+    ds._tracked('total', 'a')
+
+    ds._column('qty')
+
+    lines._join(products, on='product_id', how='left')
+
+The values of each attribute are extracted into a column once. The
+comparisons and aggregations run on the columns, by numpy if it is
+installed and the column is a number column without None.
+"""
+
+import operator
+from collections import OrderedDict
+from decimal import Decimal
+from itertools import chain as iter_chain
+from operator import itemgetter
+
+from .typing import DAttribute
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_compare_ops = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class dcol:
+    """The column of an attribute in the condition of dset query"""
+
+    __slots__ = ('name', )
+
+    def __init__(self, attr):
+        if isinstance(attr, DAttribute):
+            attr = attr.name
+
+        if not isinstance(attr, str):
+            err = "The column should be given by attribute or its name: %r"
+            raise TypeError(err % (attr, ))
+
+        self.name = attr
+
+    def __eq__(self, value):
+        return DCondition('==', self.name, value)
+
+    def __ne__(self, value):
+        return DCondition('!=', self.name, value)
+
+    def __lt__(self, value):
+        return DCondition('<', self.name, value)
+
+    def __le__(self, value):
+        return DCondition('<=', self.name, value)
+
+    def __gt__(self, value):
+        return DCondition('>', self.name, value)
+
+    def __ge__(self, value):
+        return DCondition('>=', self.name, value)
+
+    def isin(self, values):
+        return DCondition('in', self.name, list(values))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'dcol(%r)' % self.name
+
+
+class DCondition:
+    """
+    The condition on columns. The comparison with None follows SQL, that
+    the ordering comparison of None is false, but the equality is kept as
+    'IS NULL' does.
+    """
+
+    __slots__ = ('op', 'operands')
+
+    def __init__(self, op, *operands):
+        self.op = op
+        self.operands = operands
+
+    def __and__(self, other):
+        return DCondition('and', self, other)
+
+    def __or__(self, other):
+        return DCondition('or', self, other)
+
+    def __invert__(self):
+        return DCondition('not', self)
+
+    def __repr__(self):
+        if self.op in ('and', 'or'):
+            return '(%r %s %r)' % (self.operands[0], self.op,
+                                   self.operands[1])
+
+        if self.op == 'not':
+            return '~%r' % (self.operands[0], )
+
+        return 'dcol(%r) %s %r' % (self.operands[0], self.op,
+                                   self.operands[1])
+
+    def _mask(self, column, item_cls):
+        """
+        Return the mask of items satisfying this condition, a bool array of
+        numpy or a list of bool. The column(name) gets values of attribute.
+        """
+
+        op = self.op
+        if op in ('and', 'or', 'not'):
+            masks = [c._mask(column, item_cls) for c in self.operands]
+
+            if numpy is not None:
+                if op == 'and':
+                    return masks[0] & masks[1]
+                if op == 'or':
+                    return masks[0] | masks[1]
+                return ~masks[0]
+
+            if op == 'and':
+                return [a and b for a, b in zip(*masks)]
+            if op == 'or':
+                return [a or b for a, b in zip(*masks)]
+            return [not a for a in masks[0]]
+
+        attr_name, value = self.operands
+        attr = getattr(item_cls, attr_name, None)
+        if not isinstance(attr, DAttribute):
+            err = "No attribute '%s' defined in %s"
+            err %= (attr_name, item_cls.__name__)
+            raise ValueError(err)
+
+        if attr.cast is not None:
+            if op == 'in':
+                value = [attr.cast(v) for v in value]
+            else:
+                value = attr.cast(value)
+
+        values = column(attr_name)
+
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            if op == 'in':
+                return numpy.isin(values, [v for v in value if v is not None])
+
+            if value is not None:
+                return _compare_ops[op](values, value)
+
+        if op == 'in':
+            value = set(value)
+            mask = [v in value for v in values]
+
+        elif op in ('==', '!='):
+            compare = _compare_ops[op]
+            mask = [compare(v, value) for v in values]
+
+        else:
+            compare = _compare_ops[op]
+            mask = [v is not None and value is not None and compare(v, value)
+                        for v in values]
+
+        if numpy is not None:
+            return numpy.array(mask, dtype=bool)
+
+        return mask
+
+
+def _column_array(values, attr_type):
+    """
+    Make a numpy array of the values if they are numbers without None,
+    otherwise the values are returned.
+    """
+
+    if numpy is None or attr_type not in (int, float):
+        return values
+
+    if None in values:
+        return values
+
+    try:
+        return numpy.array(values, dtype=(int if attr_type is int else float))
+    except (OverflowError, TypeError, ValueError):
+        return values
+
+
+_agg_funcs = ('count', 'sum', 'min', 'max', 'avg')
+
+
+class DGroupBy:
+    """
+    The items of dset grouped by the values of attributes, made by
+    ds._group_by('attr', ...).
+    """
+
+    def __init__(self, ds, attr_names):
+        self._dset = ds
+        self._attr_names = tuple(attr_names)
+
+    def agg(self, **aggs):
+        """
+        Aggregate the groups into a new dset, whose items are keyed by the
+        grouped attributes. Each keyword names an attribute of result item:
+
+            total=('sum', 'amount'), n=('count', ), max='amount'
+
+        The value is a pair of function and attribute, or an attribute when
+        the keyword is the name of function. The functions are count, sum,
+        min, max and avg. As in SQL, None values are ignored, and count()
+        without attribute counts the items.
+        """
+
+        from .dattr import datt # avoid cyclical importing
+        from .dset import dset
+
+        ds = self._dset
+        item_cls = ds.__dset_item_class__
+        group_names = self._attr_names
+
+        specs = _parse_aggs(item_cls, aggs)
+
+        # the group number of each item
+        group_cols = [_tolist(ds._column(n)) for n in group_names]
+        groups = OrderedDict()
+        group_index = [groups.setdefault(k, len(groups))
+                            for k in zip(*group_cols)]
+
+        results = []
+        for out_name, func, attr in specs:
+            values = None if attr is None else ds._column(attr.name)
+            results.append(_aggregate(func, group_index, values, len(groups)))
+
+        declared = OrderedDict()
+        for out_name, func, attr in specs:
+            declared[out_name] = datt(_agg_type(func, attr))
+
+        result_cls = item_cls._re(*(group_names + tuple(declared)),
+                                  _key=list(group_names),
+                                  _name=item_cls.__name__ + '_agg',
+                                  **declared)
+
+        rows = [key + tuple(r[i] for r in results)
+                    for i, key in enumerate(groups)]
+
+        return dset(result_cls)._from_rows(group_names + tuple(declared),
+                                           rows)
+
+
+def _parse_aggs(item_cls, aggs):
+    """
+    Parse the aggregations given as keywords into [(name, func, attr)], the
+    attr is None when count() counts the items.
+    """
+
+    specs = []
+    for out_name, spec in aggs.items():
+        if isinstance(spec, str):
+            func, attr_name = out_name, spec
+        elif isinstance(spec, tuple) and 1 <= len(spec) <= 2:
+            func, attr_name = (spec + (None, ))[:2]
+        else:
+            err = "The aggregation '%s' should be (func, attr): %r"
+            raise ValueError(err % (out_name, spec))
+
+        if func not in _agg_funcs:
+            err = "Unknown aggregate function '%s', not in %s"
+            raise ValueError(err % (func, ', '.join(_agg_funcs)))
+
+        attr = None
+        if attr_name is not None:
+            attr = getattr(item_cls, attr_name, None)
+            if not isinstance(attr, DAttribute):
+                err = "No attribute '%s' defined in %s"
+                raise ValueError(err % (attr_name, item_cls.__name__))
+        elif func != 'count':
+            err = "The aggregate function '%s' requires an attribute"
+            raise ValueError(err % func)
+
+        specs.append((out_name, func, attr))
+
+    return specs
+
+
+def _tolist(values):
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.tolist()
+
+    return list(values)
+
+
+def _agg_type(func, attr):
+    if func == 'count':
+        return int
+
+    if func == 'avg' and not issubclass(attr.type, Decimal):
+        return float
+
+    return attr.type
+
+
+def _aggregate(func, group_index, values, n_groups):
+    """Aggregate the values by their group numbers into a list"""
+
+    if n_groups == 0:
+        return []
+
+    if values is None: # count(*)
+        counts = [0] * n_groups
+        for i in group_index:
+            counts[i] += 1
+        return counts
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        index = numpy.array(group_index)
+        order = numpy.argsort(index, kind='stable')
+        starts = numpy.searchsorted(index[order], numpy.arange(n_groups))
+        sorted_values = values[order]
+
+        counts = numpy.bincount(index, minlength=n_groups)
+        if func == 'count':
+            return counts.tolist()
+
+        if func == 'min':
+            return numpy.minimum.reduceat(sorted_values, starts).tolist()
+
+        if func == 'max':
+            return numpy.maximum.reduceat(sorted_values, starts).tolist()
+
+        sums = numpy.add.reduceat(sorted_values, starts)
+        if func == 'sum':
+            return sums.tolist()
+
+        return (sums / counts).tolist()
+
+    buckets = [[] for i in range(n_groups)]
+    for i, value in zip(group_index, values):
+        if value is not None:
+            buckets[i].append(value)
+
+    if func == 'count':
+        return [len(b) for b in buckets]
+
+    if func == 'min':
+        return [min(b) if b else None for b in buckets]
+
+    if func == 'max':
+        return [max(b) if b else None for b in buckets]
+
+    if func == 'sum':
+        return [sum(b) if b else None for b in buckets]
+
+    return [sum(b) / len(b) if b else None for b in buckets]
+
+
+def _hash_join(left, right, on_names, how):
+    """
+    Join the dsets by a hash table of the values on the smaller side, which
+    is probed with the values of the other side. The result keeps the order
+    of left dset, and the order of right dset among the matched items.
+    """
+
+    from .dset import dset # avoid cyclical importing
+
+    left_cls = left.__dset_item_class__
+    right_cls = right.__dset_item_class__
+
+    left_names = list(left_cls.__dobject_key__) + list(left_cls.__dobject_att__)
+
+    # the key of right side named as an attribute of left side is renamed
+    # with the prefix of its class, otherwise the items matching the same
+    # left item would be taken as the same key.
+    renamed = OrderedDict()
+    for attr_name in right_cls.__dobject_key__:
+        if attr_name in left_names and attr_name not in on_names:
+            new_name = right_cls.__name__.lower() + '_' + attr_name
+            if (new_name in left_names or new_name in right_cls.__dobject_key__
+                    or new_name in right_cls.__dobject_att__):
+                err = ("The key '%s' of %s cannot be renamed as '%s' in the "
+                       "joined items, which has been defined")
+                raise ValueError(err % (attr_name, right_cls.__name__,
+                                        new_name))
+
+            renamed[attr_name] = new_name
+
+    right_attrs = [] # [(name in result, name in right)]
+    for attr_name in iter_chain(right_cls.__dobject_key__,
+                                right_cls.__dobject_att__):
+        if attr_name in renamed:
+            right_attrs.append((renamed[attr_name], attr_name))
+        elif attr_name not in left_names:
+            right_attrs.append((attr_name, attr_name))
+
+    right_names = [n for n, _ in right_attrs]
+
+    key_names = list(left_cls.__dobject_key__)
+    key_names += [renamed.get(n, n) for n in right_cls.__dobject_key__
+                    if renamed.get(n, n) in right_names]
+
+    combined_cls = right_cls._re(_subst=renamed) if renamed else right_cls
+    result_cls = left_cls._re(_combine=combined_cls, _key=key_names,
+                              _name=left_cls.__name__ + '_' + right_cls.__name__)
+
+    left_on = list(zip(*[_tolist(left._column(n)) for n in on_names]))
+    right_on = list(zip(*[_tolist(right._column(n)) for n in on_names]))
+
+    build_left = len(left_on) < len(right_on)
+    build, probe = (left_on, right_on) if build_left else (right_on, left_on)
+
+    table = {}
+    for i, values in enumerate(build):
+        if None not in values: # NULL matches nothing
+            table.setdefault(values, []).append(i)
+
+    pairs = [] # [(left position, right position)]
+    if build_left:
+        for j, values in enumerate(probe):
+            matched = table.get(values)
+            if matched:
+                pairs.extend((i, j) for i in matched)
+
+        if how == 'left':
+            matched = set(i for i, _ in pairs)
+            pairs.extend((i, None) for i in range(len(left_on))
+                            if i not in matched)
+
+        pairs.sort(key=itemgetter(0)) # stable, the right order is kept
+
+    else:
+        for i, values in enumerate(probe):
+            matched = table.get(values)
+            if matched is None:
+                if how == 'left':
+                    pairs.append((i, None))
+            elif len(matched) == 1:
+                pairs.append((i, matched[0]))
+            else:
+                pairs.extend((i, j) for j in matched)
+
+    no_match = len(right_on) # the position of None appended to right columns
+    left_pos = [i for i, _ in pairs]
+    right_pos = [no_match if j is None else j for _, j in pairs]
+
+    columns = []
+    for attr_name in left_names:
+        column = _tolist(left._column(attr_name))
+        columns.append(list(map(column.__getitem__, left_pos)))
+
+    for _, attr_name in right_attrs:
+        column = _tolist(right._column(attr_name))
+        column.append(None)
+        columns.append(list(map(column.__getitem__, right_pos)))
+
+    # the values are taken from the items, which have been casted
+    return dset(result_cls)._from_rows(left_names + right_names,
+                                       zip(*columns), trusted=True)
+
+
+class _TrackedGroup:
+    """The state of a tracked aggregate in a group of items"""
+
+    __slots__ = ('rows', 'n', 'total', 'counts', 'extreme')
+
+    def __init__(self):
+        self.rows = 0 # the number of items
+        self.n = 0 # the number of values not None
+        self.total = None
+        self.counts = None # {value: number}, for min and max
+        self.extreme = None # the min or max value, None if to be found
+
+
+class DTracker:
+    """
+    An aggregate of the items of dset, optionally by groups, made by
+    ds._track(...). It is updated as each item is put into or popped from
+    the dset, so reading it does not scan the items.
+
+    The group and value of each item are recorded by its key when it is put,
+    and taken away by the key when it is popped. The change of an item in
+    place is not seen until the item is put again.
+
+    The min or max removed is found again from the counts of values when it
+    is read. The sum of float values may keep the rounding error of the
+    values removed.
+    """
+
+    __slots__ = ('func', 'attr_name', 'by_names', 'groups', 'entries')
+
+    def __init__(self, func, attr_name, by_names):
+        self.func = func
+        self.attr_name = attr_name
+        self.by_names = tuple(by_names)
+        self.groups = {} # {group values: _TrackedGroup}
+        self.entries = {} # {item key: (group values, value)}
+
+    def _clear(self):
+        self.groups.clear()
+        self.entries.clear()
+
+    def _update(self, key, old_obj, new_obj):
+        """
+        Remove the old item and add the new item of the key, either may be
+        None.
+        """
+
+        if old_obj is not None:
+            self._remove(key)
+
+        if new_obj is not None:
+            self._insert(key, new_obj)
+
+    def _insert(self, key, obj):
+        group_values = tuple(getattr(obj, n) for n in self.by_names)
+        group = self.groups.get(group_values, None)
+        if group is None:
+            group = self.groups[group_values] = _TrackedGroup()
+
+        group.rows += 1
+
+        value = None
+        if self.attr_name is not None:
+            value = getattr(obj, self.attr_name)
+
+        self.entries[key] = (group_values, value)
+
+        if value is None:
+            return
+
+        group.n += 1
+
+        func = self.func
+        if func in ('sum', 'avg'):
+            group.total = value if group.total is None else group.total + value
+
+        elif func in ('min', 'max'):
+            counts = group.counts
+            if counts is None:
+                counts = group.counts = {}
+            counts[value] = counts.get(value, 0) + 1
+
+            extreme = group.extreme
+            if group.n == 1:
+                group.extreme = value
+            elif extreme is not None:
+                if (value < extreme) if func == 'min' else (value > extreme):
+                    group.extreme = value
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        group_values, value = entry
+        group = self.groups[group_values]
+
+        group.rows -= 1
+        if group.rows == 0:
+            del self.groups[group_values]
+            return
+
+        if value is None:
+            return
+
+        group.n -= 1
+
+        func = self.func
+        if func in ('sum', 'avg'):
+            group.total = None if group.n == 0 else group.total - value
+
+        elif func in ('min', 'max'):
+            counts = group.counts
+            counts[value] -= 1
+            if counts[value] == 0:
+                del counts[value]
+                if value == group.extreme:
+                    group.extreme = None
+
+    def _value(self, group_values=()):
+        """The aggregated value of the group, or of all items if no group"""
+
+        group = self.groups.get(group_values, None)
+
+        func = self.func
+        if func == 'count':
+            if group is None:
+                return 0
+            return group.rows if self.attr_name is None else group.n
+
+        if group is None or group.n == 0:
+            return None
+
+        if func == 'sum':
+            return group.total
+
+        if func == 'avg':
+            return group.total / group.n
+
+        if group.extreme is None:
+            group.extreme = (min if func == 'min' else max)(group.counts)
+
+        return group.extreme
+
+    def _values(self):
+        """The aggregated values of all groups in a dict"""
+
+        if len(self.by_names) == 1:
+            return dict((group_values[0], self._value(group_values))
+                            for group_values in self.groups)
+
+        return dict((group_values, self._value(group_values))
+                        for group_values in self.groups)
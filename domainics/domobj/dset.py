@@ -3,21 +3,33 @@
 from collections import OrderedDict
 from collections import namedtuple
 from collections.abc import Iterable, Mapping
-from itertools import islice
+from itertools import islice, count
+from operator import attrgetter, itemgetter
+from bisect import bisect_left, bisect_right
+from array import array
 
 import sys
+from decimal import Decimal
 
 # from .metaclass import datt
 # from ._reshape import reshape
 
-from .dobject import dobject
+from .dobject import dobject, _share_vector, _shared_copy, _tracked_changes
 from .typing import DObject, DSet, DSetBase, DAttribute, AnyDObject
 from .typing import parse_attr_value_many, consume_kwargs
-from .pagination import DPage
-from .metaclass import _make_pkey_class, DObjectMetaClass
+from .pagination import DPage, _sortable_field
+from .metaclass import _make_pkey_class, DObjectMetaClass, _row_loader
+from .metaclass import _cached_class, _attr_cache_key
+from .dquery import dcol, DCondition, DGroupBy, DTracker, _column_array
+from .dquery import _hash_join, _parse_aggs
 
 from itertools import chain as iter_chain
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 _dset_class_tmpl = """\
 class {typename}(DSetBase):
@@ -42,6 +54,18 @@ def dset(*args, **kwargs):
 
     dominion_class = consume_kwargs(kwargs, '_dominion', (DObject, DSetBase))
     type_name = consume_kwargs(kwargs, '_name', (str,))
+    module = kwargs.pop('_module', None) # of the dominion class declaring it
+
+    columnar = bool(kwargs.pop('_columnar', False))
+    index_names = _parse_index_names(item_type, kwargs.pop('_index', ()))
+    sortable = _parse_sortable(item_type, kwargs.pop('_sortable', ()))
+    if columnar and sortable:
+        err = "A dset can not be both columnar and sortable"
+        raise ValueError(err)
+    if columnar and issubclass(item_type, DSetBase):
+        err = "The item of a columnar dset must be a dobject, not dset '%s'"
+        err %= item_type.__name__
+        raise TypeError(err)
 
     undefined_attrs = set()
     key_attrs = OrderedDict()
@@ -116,36 +140,401 @@ def dset(*args, **kwargs):
         if not type_name.endswith('_dset'):
             type_name += '_dset'
 
-    class_code = "class {name}(DSetBaseImpl):\n".format(name = type_name)
+    if module is None: # the module of caller
+        try:
+            frame = sys._getframe(1)
+            module = frame.f_globals.get('__name__', '__main__')
+        except (AttributeError, ValueError):
+            module = None
+
+    def make_class(base_name):
+        class_code = "class {name}({base}):\n".format(name = type_name,
+                                                       base = base_name)
+
+        for attr_name in key_attrs:
+            class_code += ' ' * 4
+            class_code += "{name} = key_attrs['{name}']\n".format(
+                                                            name=attr_name)
+
+        class_code += "    __dobject_key__ = list(key_attrs.keys())"
+
+        namespace = dict(DSetBaseImpl = DSetBaseImpl,
+                         ColumnarDSetImpl = ColumnarDSetImpl,
+                         SortedDSetImpl = SortedDSetImpl,
+                         key_attrs = key_attrs)
+
+        exec(class_code, namespace)
+        dset_cls = namespace[type_name]
 
-    for attr_name in key_attrs:
-        class_code += ' ' * 4
-        class_code += "{name} = key_attrs['{name}']\n".format(name=attr_name)
+        for attr_name, attr in key_attrs.items():
+            setattr(dset_cls, attr_name, attr)
 
-    class_code += "    __dobject_key__ = list(key_attrs.keys())"
+        dset_cls.__dset_item_class__ = item_type
+        dset_cls.__dset_links__ = links
+        dset_cls.__dominion_class__ = dominion_class
+        dset_cls.__dset_index_names__ = index_names
+        dset_cls.__dset_sortable__ = ()
 
-    #------------------------------------------------------------------------
+        if module is not None:
+            dset_cls.__module__ = module
 
-    namespace = dict(DSetBaseImpl = DSetBaseImpl, key_attrs = key_attrs)
+        return dset_cls
 
-    exec(class_code, namespace)
-    dset_cls = namespace[type_name]
+    def make_dset_class():
+        if columnar:
+            dset_cls = make_class('ColumnarDSetImpl')
 
-    for attr_name, attr in key_attrs.items():
-        setattr(dset_cls, attr_name, attr)
+            item_attrs = iter_chain(item_type.__dobject_key__.values(),
+                                    item_type.__dobject_att__.values())
+            item_attrs = sorted(item_attrs, key=attrgetter('index'))
+            dset_cls.__dset_item_names__ = tuple(a.name for a in item_attrs)
 
-    dset_cls.__dset_item_class__ = item_type
-    dset_cls.__dset_links__ = links
-    dset_cls.__dominion_class__ = dominion_class
+        elif sortable:
+            dset_cls = make_class('SortedDSetImpl')
+            dset_cls.__dset_sortable__ = sortable
+            dset_cls.__dset_sort_key__ = staticmethod(
+                                        _make_sort_key(item_type, sortable))
 
-    try:
-        frame = sys._getframe(1)
-        dset_cls.__module__ = frame.f_globals.get('__name__', '__main__')
-    except (AttributeError, ValueError):
-        pass
+            # the dset in other order, like a page of other sortable
+            dset_cls.__dset_unsorted_class__ = make_class('DSetBaseImpl')
+
+        else:
+            dset_cls = make_class('DSetBaseImpl')
+
+        return dset_cls
+
+    # the dset of the same arguments in a module is the identical class
+    cache_key = ('dset', module, type_name, dominion_class, columnar,
+                 index_names, tuple(sortable),
+                 tuple((n, _attr_cache_key(a)) for n, a in key_attrs.items()),
+                 tuple(links.items()))
+
+    dset_cls = _cached_class(item_type, cache_key, make_dset_class)
 
     return dset_cls
 
+def _parse_index_names(item_type, index_spec):
+    """
+    Parse the declaration of secondary indexes, each of them is an attribute
+    or a tuple of attributes, given by name or attribute object.
+    """
+
+    if isinstance(index_spec, (str, DAttribute)):
+        index_spec = [index_spec]
+
+    index_names = []
+    for attrs in index_spec:
+        if isinstance(attrs, (str, DAttribute)):
+            attrs = [attrs]
+
+        names = []
+        for attr in attrs:
+            attr_name = attr.name if isinstance(attr, DAttribute) else attr
+            if (attr_name not in item_type.__dobject_key__ and
+                    attr_name not in item_type.__dobject_att__):
+                err = "The index attribute '%s' is not defined in '%s'"
+                err %= (attr_name, item_type.__name__)
+                raise ValueError(err)
+
+            names.append(attr_name)
+
+        index_names.append(tuple(names))
+
+    return tuple(index_names)
+
+
+class _SecondaryIndex(dict):
+    """
+    The secondary index in {values: {key: None}}. The values of each key are
+    recorded when it is put, so it is taken away from the same bucket even
+    if the item has been changed in place.
+    """
+
+    __slots__ = ('entries', )
+
+    def __init__(self):
+        super(_SecondaryIndex, self).__init__()
+        self.entries = {} # {key: values}
+
+    def _insert(self, key, value):
+        bucket = self.get(value, None)
+        if bucket is None:
+            bucket = self[value] = {}
+        bucket[key] = None
+        self.entries[key] = value
+
+    def _remove(self, key):
+        value = self.entries.pop(key, None)
+        bucket = self.get(value, None)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self[value]
+
+    def clear(self):
+        super(_SecondaryIndex, self).clear()
+        self.entries.clear()
+
+
+def _parse_sortable(item_type, sortable):
+    """
+    Parse the sortable spec, given as '+a,-b', a DPage object or pairs of
+    attribute name and ascending flag.
+    """
+
+    if isinstance(sortable, str):
+        sortable = DPage(sortable=sortable).sortable
+    elif isinstance(sortable, DPage):
+        sortable = sortable.sortable
+
+    fields = []
+    for attr_name, ascending in sortable:
+        if (attr_name not in item_type.__dobject_key__ and
+                attr_name not in item_type.__dobject_att__):
+            err = "The sortable attribute '%s' is not defined in '%s'"
+            err %= (attr_name, item_type.__name__)
+            raise ValueError(err)
+
+        fields.append(_sortable_field(attr_name, bool(ascending)))
+
+    return tuple(fields)
+
+
+class _Descending:
+    """The sort value in reversed order"""
+
+    __slots__ = ('value', )
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        if not isinstance(other, _Descending):
+            return NotImplemented
+
+        return self.value == other.value
+
+    def __lt__(self, other):
+        if not isinstance(other, _Descending):
+            return NotImplemented
+
+        return other.value < self.value
+
+
+class _Greatest:
+    """The sort value greater than any other"""
+
+    def __eq__(self, other):
+        return other is self
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return other is not self
+
+_greatest = _Greatest()
+
+
+def _sort_value(value, ascending, negatable=False):
+    """
+    None is taken as the greatest value, which is the same as the default
+    NULLS LAST of ASC and NULLS FIRST of DESC in SQL. A descending number is
+    negated, so that it is compared by the builtin order.
+    """
+
+    if ascending:
+        return (value is None, value)
+
+    if negatable:
+        return (value is not None, 0 if value is None else -value)
+
+    return _Descending((value is None, value))
+
+
+def _descending_column(column):
+    """
+    Return the numpy column in the reversed order to be sorted ascendingly.
+    The float is negated. The others, like the unsigned or bool column and
+    the least int64 value, cannot be negated, their ranks are negated.
+    """
+
+    if column.dtype.kind == 'f':
+        return -column
+
+    return -numpy.unique(column, return_inverse=True)[1].reshape(column.shape)
+
+
+def _negatable(attr):
+    return issubclass(attr.type, (int, float, Decimal))
+
+
+def _make_sort_key(item_type, sortable):
+    """Make the function that gets the sort key of an item"""
+
+    fields = [(attr_name, ascending,
+                    _negatable(getattr(item_type, attr_name)))
+                for attr_name, ascending
+                    in _parse_sortable(item_type, sortable)]
+
+    def sort_key(obj):
+        return tuple(_sort_value(getattr(obj, attr_name), ascending, negatable)
+                        for attr_name, ascending, negatable in fields)
+
+    return sort_key
+
+
+_get_value_vector = attrgetter('__value_vector__')
+
+
+def _original_values(obj):
+    """
+    Return the values of value attributes of the item as they were when its
+    changes were tracked from, in a dict.
+    """
+
+    values = dict((attr_name, getattr(obj, attr_name))
+                    for attr_name in obj.__class__.__dobject_att__)
+
+    changes = _tracked_changes(obj)
+    if changes:
+        values.update(changes)
+
+    return values
+
+
+class DSetChanges:
+    """
+    The keys of items added into and removed from a dset since it started
+    tracking the changes. The original values of the removed items, and of
+    the items replaced by other objects, are kept to find their changes.
+    """
+
+    __slots__ = ('added', 'removed', 'replaced')
+
+    def __init__(self):
+        self.added = {}    # {key: None}, in the order of adding
+        self.removed = {}  # {key: original values}
+        self.replaced = {} # {key: original values}
+
+    def _update(self, key, old_obj, new_obj):
+        """Record that the item of key is changed from old_obj to new_obj"""
+
+        if old_obj is None:
+            original = self.removed.pop(key, None)
+            if original is None:
+                self.added[key] = None
+            else: # removed and added again
+                self.replaced[key] = original
+
+        elif new_obj is None:
+            if key in self.added:
+                del self.added[key] # it has not been saved
+                return
+
+            original = self.replaced.pop(key, None)
+            if original is None:
+                original = _original_values(old_obj)
+            self.removed[key] = original
+
+        elif key not in self.added and key not in self.replaced:
+            self.replaced[key] = _original_values(old_obj)
+
+
+class DSetSnapshot:
+    """
+    The immutable snapshot of the items of a dset, made by ds._snapshot().
+
+    The snapshot shares the items and their value vectors with the dset
+    instead of copying them. The shared vector is copied before the item is
+    changed through its attributes, so that the snapshot keeps the vector of
+    old values, and the item still sharing its vector is unchanged since
+    then. The dset attributes of items are shared, not copied.
+
+    The items got from the snapshot are read through the kept vectors.
+    """
+
+    __slots__ = ('_dset_class', '_entries')
+
+    def __init__(self, dset_class, entries):
+        self._dset_class = dset_class
+        self._entries = entries # {key: (item, vector)}
+
+    def _diff(self, current):
+        """
+        Return the changes from this snapshot to the current dset in a tuple
+        (inserted, changed, deleted), as ds._changes() does. The item which
+        is still the same object sharing its vector with the snapshot is not
+        changed, its attributes are not compared.
+        """
+
+        entries = self._entries
+        item_dict = current.__dset_item_dict__
+
+        if isinstance(current, ColumnarDSetImpl):
+            pairs = ((key, current._get_item(key))
+                        for key in current._item_keys())
+        else:
+            pairs = item_dict.items()
+
+        value_attrs = current.__dset_item_class__.__dobject_att__
+
+        inserted, changed = [], []
+        for key, item in pairs:
+            entry = entries.get(key, None)
+            if entry is None:
+                inserted.append(item)
+                continue
+
+            past_item, vector = entry
+            if item is past_item and item.__value_vector__ is vector:
+                continue
+
+            past_obj = _shared_copy(past_item, vector)
+
+            modified = OrderedDict()
+            for attr_name in value_attrs:
+                if not hasattr(past_obj, attr_name):
+                    continue
+
+                newval = getattr(item, attr_name)
+                oldval = getattr(past_obj, attr_name)
+                if newval != oldval:
+                    modified[attr_name] = (newval, oldval)
+
+            if modified:
+                changed.append((key, modified))
+
+        deleted = [key for key in entries if key not in item_dict]
+
+        return inserted, changed, deleted
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        for item, vector in self._entries.values():
+            yield _shared_copy(item, vector)
+
+    def __contains__(self, obj):
+        if isinstance(obj, DObject):
+            obj = obj.__dobject_key__
+
+        return obj in self._entries
+
+    def __getitem__(self, index):
+        if isinstance(index, DObject):
+            index = index.__dobject_key__
+
+        item, vector = self._entries[index]
+        return _shared_copy(item, vector)
+
+    def __repr__(self):
+        return '%s(%s, %d items)' % (self.__class__.__name__,
+                                     self._dset_class.__name__,
+                                     len(self._entries))
+
+
 class DSetBaseImpl(DSetBase, dobject):
     """The set of dobjects.
     """
@@ -240,7 +629,6 @@ class DSetBaseImpl(DSetBase, dobject):
         instance = super(DSetBase, cls).__new__(cls, **kwargs)
 
         instance_setter = super(dobject, instance).__setattr__
-        instance_setter('__dset_item_dict__',  OrderedDict())
         instance_setter('__dominion_object__',  dominion_obj)
 
         if pagination is None:
@@ -248,9 +636,46 @@ class DSetBaseImpl(DSetBase, dobject):
 
         instance_setter('_page',  pagination)
 
+        instance._clear() # initialize the storage of items
+
         if item_iterable is not None:
-            for item in item_iterable:
-                instance._add(item)
+            dset_items = getattr(item_iterable, '__dset__', None)
+            if dset_items is not None:
+                # the iterable, like a sqlblock, makes the items by itself,
+                # which are owned by nothing else.
+                item_iterable = dset_items(cls.__dset_item_class__)
+                instance._extend(item_iterable, adopt=True)
+            else:
+                instance._extend(item_iterable)
+
+        return instance
+
+    @classmethod
+    def _from_rows(cls, column_names, rows, trusted=False, **kwargs):
+        """
+        Create a dset whose items are made from rows in one pass.
+
+        The keyword arguments are passed to the dset constructor. The values of
+        items linked to the dset attributes are substituted as _add does.
+        """
+
+        instance = cls(**kwargs)
+
+        item_cls = cls.__dset_item_class__
+        subst_values = instance._item_value_subst()
+
+        fixed_names = tuple(subst_values.keys())
+        fixed_values = []
+        for attr_name in fixed_names:
+            attr = getattr(item_cls, attr_name)
+            value = subst_values[attr_name]
+            fixed_values.append(value if attr.cast is None else attr.cast(value))
+
+        load_row = _row_loader(item_cls, column_names, fixed_names,
+                                    trusted=trusted)
+
+        objs = (load_row(row, fixed_values) for row in rows)
+        instance._put_items((obj.__dobject_key__, obj) for obj in objs)
 
         return instance
 
@@ -294,14 +719,10 @@ class DSetBaseImpl(DSetBase, dobject):
         """get key of a object or mapping"""
 
         if isinstance(obj, int):
-            indice = self.__dset_item_dict__.keys()
-            index = next(islice(indice, obj, obj + 1), None)
-
-            if index is None:
+            try:
+                return self._item_keys()[obj]
+            except IndexError:
                 raise IndexError('no found index: ' + str(obj))
-                return self.__dset_item_class__()
-
-            return index
 
         key_cls = self.__dset_item_class__.__dobject_key_class__
         value_subst = self._item_value_subst()
@@ -314,7 +735,7 @@ class DSetBaseImpl(DSetBase, dobject):
                 else:
                     values.append(getattr(obj, attr_name))
 
-            return key_cls(tuple(values))
+            return tuple.__new__(key_cls, values)
 
         elif isinstance(obj, Mapping):
             values = []
@@ -324,130 +745,1232 @@ class DSetBaseImpl(DSetBase, dobject):
                 else:
                     values.append(obj[attr_name])
 
-            return key_cls(tuple(values))
+            return tuple.__new__(key_cls, values)
 
         else:
             raise ValueError()
 
-    def _add(self, obj):
+    def _add(self, obj, adopt=False):
         """
         If the identity of obj has been added, replace the old one with it.
+
+        The obj is cloned into this dset with the values substituted by the
+        links of dset. If it is an object of item class whose values need not
+        be substituted, it is adopted without cloning when the item class is
+        frozen or adopt is true. The adopted obj should not be changed by its
+        former owner.
+        """
+
+        item_cls = self.__dset_item_class__
+
+        subst_values = self._item_value_subst()
+
+        adopted = ((adopt or item_cls.__dobject_frozen__)
+                    and obj.__class__ is item_cls
+                    and all(getattr(obj, attr_name) == value
+                                for attr_name, value in subst_values.items()))
+        if not adopted:
+            obj = item_cls(obj, **subst_values) # clone it and replace values
+
+        self._put_item(obj.__dobject_key__, obj)
+
+        return self
+
+    def _extend(self, items, adopt=False):
+        """
+        Add the items as _add does one by one, in a batch. The values
+        substituted by the links of dset are resolved once.
         """
 
         item_cls = self.__dset_item_class__
-        dset_cls = self.__class__
 
         subst_values = self._item_value_subst()
+        subst_items = tuple(subst_values.items())
+        adopt = adopt or item_cls.__dobject_frozen__
+
+        def add_item(obj):
+            if (adopt and obj.__class__ is item_cls and
+                    all(getattr(obj, attr_name) == value
+                            for attr_name, value in subst_items)):
+                return obj.__dobject_key__, obj
 
-        obj = item_cls(obj, **subst_values) # clone it and replace its values
-        self.__dset_item_dict__[obj.__dobject_key__] = obj
+            obj = item_cls(obj, **subst_values) # clone it and replace values
+            return obj.__dobject_key__, obj
+
+        self._put_items(map(add_item, items))
 
         return self
 
     def _clear(self):
         """clear all objects in aggregate"""
 
-        self.__dset_item_dict__.clear()
+        instance_setter = super(dobject, self).__setattr__
+
+        changes = self.__dict__.get('__dset_changes__', None)
+        if changes is None:
+            instance_setter('__dset_changes__', None)
+        else:
+            for key in list(self._item_keys()):
+                changes._update(key, self._get_item(key), None)
+
+        # a plain dict keeps the order of insertion, and its values are
+        # iterated without hashing the keys again as OrderedDict does
+        instance_setter('__dset_item_dict__',  {})
+        instance_setter('__dset_key_list__',  [])
+
+        indexes = self.__dict__.get('__dset_indexes__', None)
+        if indexes is None:
+            indexes = OrderedDict((names, _SecondaryIndex())
+                            for names in self.__class__.__dset_index_names__)
+            instance_setter('__dset_indexes__', indexes)
+        else:
+            for index in indexes.values():
+                index.clear()
+
+        trackers = self.__dict__.get('__dset_trackers__', None)
+        if trackers is None:
+            instance_setter('__dset_trackers__', OrderedDict())
+        else:
+            for tracker in trackers.values():
+                tracker._clear()
 
         return self
 
+    def _item_keys(self):
+        """
+        Return the list of item keys in order, which indexes the items by
+        position. It is dropped when an item is removed from the middle, and
+        rebuilt here at the next positional access.
+        """
 
-    def __json_object__(self):
-        """export dset object in list"""
+        keys = self.__dset_key_list__
+        if keys is None:
+            keys = list(self.__dset_item_dict__.keys())
+            instance_setter = super(dobject, self).__setattr__
+            instance_setter('__dset_key_list__', keys)
 
-        return [item.__json_object__()
-                    for item in self.__dset_item_dict__.values()]
+        return keys
 
-    def __bool__(self):
-        return bool(self.__dset_item_dict__)
+    def _get_item(self, key):
+        """Return the item of the key, or None if it is absent."""
 
-    def __len__(self):
-        return len(self.__dset_item_dict__)
+        return self.__dset_item_dict__.get(key, None)
 
-    def __iter__(self):
-        for item in self.__dset_item_dict__.values():
-            yield item
+    def _put_item(self, key, obj):
+        """
+        Put the item with the key. If the key has been in this dset, the old
+        item is replaced in its place, otherwise the item is appended.
+        """
 
-    def __repr__(self):
+        item_dict = self.__dset_item_dict__
 
-        opts = []
+        if (self.__dset_indexes__ or self.__dset_trackers__ or
+                self.__dset_changes__ is not None):
+            self._reindex_item(key, item_dict.get(key, None), obj)
 
-        if self.__class__.__dobject_key__:
-            opts.append(repr(self.__dobject_key__))
+        count = len(item_dict)
+        item_dict[key] = obj
+        if len(item_dict) != count:
+            keys = self.__dset_key_list__
+            if keys is not None:
+                keys.append(key)
 
-        opts.append(repr([item for item in self.__dset_item_dict__.values()]))
+    def _put_items(self, pairs):
+        """
+        Put the items of (key, item) pairs as _put_item does one by one. The
+        dict of items is updated in a batch if there is no index or tracked
+        aggregate to keep.
+        """
 
-        opts.append("_item_type={0!s}".format(
-                            self.__dset_item_class__.__name__))
+        if (self.__dset_indexes__ or self.__dset_trackers__ or
+                self.__dset_changes__ is not None):
+            put_item = self._put_item
+            for key, obj in pairs:
+                put_item(key, obj)
+            return
+
+        item_dict = self.__dset_item_dict__
+        count = len(item_dict)
+        try:
+            item_dict.update(pairs)
+        finally: # the pairs may fail in the middle
+            if len(item_dict) != count:
+                instance_setter = super(dobject, self).__setattr__
+                instance_setter('__dset_key_list__', None) # rebuilt if needed
+
+    def _pop_item(self, key):
+        """Remove the item of the key and return it, KeyError if absent."""
+
+        item_dict = self.__dset_item_dict__
+        obj = item_dict[key]
+
+        if (self.__dset_indexes__ or self.__dset_trackers__ or
+                self.__dset_changes__ is not None):
+            self._reindex_item(key, obj, None)
+
+        del item_dict[key]
+
+        keys = self.__dset_key_list__
+        if keys is not None:
+            if keys[-1] == key:
+                keys.pop()
+            else:
+                instance_setter = super(dobject, self).__setattr__
+                instance_setter('__dset_key_list__', None)
 
-        if self.__dominion_class__:
-            opts.append("_dominion={0!s}".format(
-                            self.__dominion_class__.__name__))
+        return obj
 
-        if self.__dobject_key__:
-            opts.append("_key={0!r}".format(self.__dobject_key__))
+    def _sibling(self, dset_cls=None, page=None):
+        """
+        Make an empty dset with the key values and dominion of this dset. Its
+        type is this type unless dset_cls is given.
+        """
 
-        if self._page:
-            opts.append("_page={0!r}".format(self._page))
+        kwargs = dict((attr_name, getattr(self, attr_name))
+                        for attr_name in self.__class__.__dobject_key__)
+        if self.__dominion_object__ is not None:
+            kwargs['_dominion'] = self.__dominion_object__
 
-        opts = ', '.join(opts)
+        if dset_cls is None:
+            dset_cls = self.__class__
 
-        s = ("{typename}({opts})").format(
-                        typename = self.__class__.__name__, opts = opts)
+        return dset_cls(_page=page, **kwargs)
 
-        return s
+    def _subset(self, keys, page=None):
+        """
+        Make a dset of this type and key values, which has the items of the
+        given keys in order. The items are shared, not cloned.
+        """
 
-    def __getitem__(self, index):
+        instance = self._sibling(page=page)
+        instance._put_items(zip(keys, map(self._get_item, keys)))
 
-        index = self._index_key(index)
+        return instance
 
-        obj = self.__dset_item_dict__.get(index, None)
-        if obj is not None:
-            return obj
+    def _take(self, positions, page=None):
+        """Make a dset like _subset, with the items at the positions."""
 
-        return self.__dset_item_class__()
+        keys = self._item_keys()
+        items = list(self)
 
-    def __delitem__(self, index):
+        instance = self._sibling(page=page)
+        instance._put_items((keys[i], items[i]) for i in positions)
 
-        index = self._index_key(index)
-        del self.__dset_item_dict__[index]
+        return instance
 
+    def _paginate(self, page):
+        """
+        Return the items in the range of page as a new dset. The page is
+        copied into the new dset, and its total is the size of this dset.
+        """
 
-    def __setitem__(self, index, value):
+        if not isinstance(page, DPage):
+            err = "The pagination should be a DPage object, not '%s'"
+            err %= page.__class__.__name__
+            raise TypeError(err)
 
-        item_class = self.__dset_item_class__
+        sortable = tuple(page.sortable)
+        if sortable and sortable != self.__dset_sortable__[:len(sortable)]:
+            keys = self._sorted_keys(sortable)
+            make_dset = self._reorder
+        else:
+            keys = self._item_keys()
+            make_dset = self._subset
 
-        index = self._index_key(index)
-        self.__dset_item_dict__[index] = item_class(value)
+        start = page.start or 0
+        stop = None if page.limit is None else start + page.limit
 
+        page = page.copy()
+        page.total = len(self)
 
-    def __hash__(self):
-        return hash(self)
+        return make_dset(keys[start:stop], page)
 
-    def __eq__(self, other):
-        if isinstance(other, dset):
-            other_iter = other.__list
+    def _reorder(self, keys, page=None):
+        """
+        Make a dset like _subset, but the items are kept in the order of the
+        given keys, not in the order of this dset.
+        """
 
-        elif isinstance(other, list) or isinstance(other, tuple):
-            other_iter = other
+        return self._subset(keys, page)
+
+    def _column(self, attr_name):
+        """
+        Return the values of the attribute of items in order. The column of
+        int or float without None is returned as a numpy array if numpy is
+        installed, otherwise in a list.
+        """
 
+        attr = getattr(self.__dset_item_class__, attr_name, None)
+        if not isinstance(attr, DAttribute):
+            err = "No attribute '%s' in the item of dset '%s'"
+            err %= (attr_name, self.__class__.__name__)
+            raise AttributeError(err)
+
+        if attr.default is None and not hasattr(attr.type, '__default_value__'):
+            # no value to be initialized, read the value vectors directly
+            vectors = map(_get_value_vector, self)
+            values = list(map(itemgetter(attr.index), vectors))
         else:
-            return False
+            values = list(map(attrgetter(attr_name), self))
 
-        if len(self.__list) != len(other_iter):
-            return False
+        return _column_array(values, attr.type)
+
+    def _sorted_keys(self, sortable):
+        """
+        Return the keys of items sorted by the sortable stably, which is the
+        order of 'ORDER BY' with the same sortable in SQL.
+        """
 
-        return all(a == b for a, b in zip(self.__list, other_iter))
+        item_cls = self.__dset_item_class__
+        fields = _parse_sortable(item_cls, sortable)
 
+        keys = self._item_keys()
+        if not fields:
+            return list(keys)
 
-    def __iadd__(self, value) :
+        columns = [self._column(attr_name) for attr_name, _ in fields]
 
-        if isinstance(value, (DSet, Iterable)):
-            for obj in value:
-                self._add(obj)
-        elif isinstance(value, DObject):
-            self._add(value)
-        else:
-            raise TypeError('should be a dobject, dset or iterable object')
+        if (numpy is not None and
+                all(isinstance(c, numpy.ndarray) for c in columns)):
+            # the last key of lexsort is the primary one
+            order = numpy.lexsort([c if ascending else _descending_column(c)
+                                    for c, (_, ascending)
+                                        in reversed(list(zip(columns, fields)))])
+            return [keys[i] for i in order.tolist()]
 
-        return self  # operator 'o.x += a', o.x = o.x.__iadd__(a)
+        sort_columns = []
+        for column, (attr_name, ascending) in zip(columns, fields):
+            if numpy is not None and isinstance(column, numpy.ndarray):
+                column = column.tolist() # not negated in the fixed width
+
+            negatable = _negatable(getattr(item_cls, attr_name))
+            sort_columns.append([_sort_value(v, ascending, negatable)
+                                    for v in column])
+
+        rows = list(zip(*sort_columns))
+        order = sorted(range(len(keys)), key=rows.__getitem__)
+
+        return [keys[i] for i in order]
+
+    def _where(self, *conditions, **equals):
+        """
+        Return a new dset with the items satisfying all the conditions. A
+        condition is made on columns, like dcol('qty') > 10, or a function
+        called with each item. The keyword arguments are the values that
+        the attributes equal.
+        """
+
+        item_cls = self.__dset_item_class__
+
+        conditions = list(conditions)
+        for attr_name, value in equals.items():
+            conditions.append(dcol(attr_name) == value)
+
+        columns = {}
+        def column(attr_name): # each column is extracted once
+            if attr_name not in columns:
+                columns[attr_name] = self._column(attr_name)
+            return columns[attr_name]
+
+        mask = None
+        for cond in conditions:
+            if isinstance(cond, DCondition):
+                cond_mask = cond._mask(column, item_cls)
+            elif callable(cond):
+                cond_mask = [bool(cond(item)) for item in self]
+                if numpy is not None:
+                    cond_mask = numpy.array(cond_mask, dtype=bool)
+            else:
+                err = "The condition should be a dcol condition or callable"
+                raise TypeError(err + ", not %r" % (cond, ))
+
+            if mask is None:
+                mask = cond_mask
+            elif numpy is not None:
+                mask = mask & cond_mask
+            else:
+                mask = [a and b for a, b in zip(mask, cond_mask)]
+
+        if mask is None:
+            return self._subset(self._item_keys())
+
+        if numpy is not None:
+            return self._take(numpy.flatnonzero(mask).tolist())
+
+        return self._take([i for i, m in enumerate(mask) if m])
+
+    def _order_by(self, *sortable):
+        """
+        Return a new dset with the items in the order of sortable, like
+        ds._order_by('+a', '-b'), ds._order_by('+a,-b') or ds._order_by(A.a).
+        """
+
+        fields = []
+        for spec in sortable:
+            if isinstance(spec, DAttribute):
+                fields.append((spec.name, True))
+            elif isinstance(spec, str):
+                fields.extend(DPage(sortable=spec).sortable)
+            else:
+                err = "The sortable should be a str or attribute, not %r"
+                raise TypeError(err % (spec, ))
+
+        return self._reorder(self._sorted_keys(fields))
+
+    def _group_by(self, *attrs):
+        """
+        Group the items by the attributes, the groups are aggregated by
+        ds._group_by('a').agg(total=('sum', 'amount')).
+        """
+
+        item_cls = self.__dset_item_class__
+
+        attr_names = []
+        for attr in attrs:
+            attr_name = attr.name if isinstance(attr, DAttribute) else attr
+            if (attr_name not in item_cls.__dobject_key__ and
+                    attr_name not in item_cls.__dobject_att__):
+                err = "No attribute '%s' defined in %s"
+                err %= (attr_name, item_cls.__name__)
+                raise ValueError(err)
+
+            attr_names.append(attr_name)
+
+        if not attr_names:
+            raise ValueError("At least one attribute is required to group by")
+
+        return DGroupBy(self, attr_names)
+
+    def _join(self, other, on, how='inner'):
+        """
+        Join the items of this dset with the items of other dset whose
+        attributes named in 'on' are equal, as 'JOIN ... USING (...)' in SQL.
+        The 'how' is 'inner' or 'left', the latter keeps the items matching
+        nothing with None as the values of other dset.
+
+        The items of result are of the type combined by _re(_combine=...),
+        keyed by the keys of both sides. The attribute with the same name in
+        both takes the value of this dset, except the key of other dset which
+        is renamed with the prefix of its class name in lower case, like
+        'product_id' for the key 'id' of Product.
+        """
+
+        if not isinstance(other, DSetBase):
+            err = "The dset to be joined should be a dset, not %r"
+            raise TypeError(err % (other, ))
+
+        if how not in ('inner', 'left'):
+            err = "The join should be 'inner' or 'left', not %r"
+            raise ValueError(err % (how, ))
+
+        if isinstance(on, (str, DAttribute)):
+            on = [on]
+
+        on_names = []
+        for attr in on:
+            attr_name = attr.name if isinstance(attr, DAttribute) else attr
+            for item_cls in (self.__dset_item_class__,
+                             other.__dset_item_class__):
+                if (attr_name not in item_cls.__dobject_key__ and
+                        attr_name not in item_cls.__dobject_att__):
+                    err = "No attribute '%s' defined in %s"
+                    err %= (attr_name, item_cls.__name__)
+                    raise ValueError(err)
+
+            on_names.append(attr_name)
+
+        if not on_names:
+            raise ValueError("At least one attribute is required to join on")
+
+        return _hash_join(self, other, on_names, how)
+
+    def _reindex_item(self, key, old_obj, new_obj):
+        """
+        Move the key of item in the secondary indexes, from the values of the
+        old item to the values of the new one, and update the tracked
+        aggregates and changes. Either of them may be None.
+        """
+
+        changes = self.__dset_changes__
+        if changes is not None:
+            changes._update(key, old_obj, new_obj)
+
+        for tracker in self.__dset_trackers__.values():
+            tracker._update(key, old_obj, new_obj)
+
+        for names, index in self.__dset_indexes__.items():
+            if old_obj is not None:
+                index._remove(key)
+
+            if new_obj is not None:
+                index._insert(key, tuple(getattr(new_obj, n) for n in names))
+
+    def _create_index(self, *attrs):
+        """
+        Create a secondary index on the attributes of item, which is kept by
+        adding, setting and removing items. The change of an item in place is
+        not indexed until the item is set or added again, but the item is
+        always removed from where it was indexed.
+        """
+
+        names, = _parse_index_names(self.__dset_item_class__, [attrs])
+
+        indexes = self.__dset_indexes__
+        if names in indexes:
+            return self
+
+        index = indexes[names] = _SecondaryIndex()
+        for key in self._item_keys():
+            item = self._get_item(key)
+            index._insert(key, tuple(getattr(item, n) for n in names))
+
+        return self
+
+    def _track(self, by=None, **aggs):
+        """
+        Track the aggregates of items, optionally grouped by the attributes
+        in 'by', like ds._track(total=('sum', 'amount'), by='category'). The
+        aggregations are given as _group_by(...).agg does. They are kept by
+        adding, setting and removing items, and read by ds._tracked(...).
+        As the indexes, the change of an item in place is not tracked until
+        the item is set or added again, and the values it was tracked with
+        are taken away when it is removed.
+        """
+
+        item_cls = self.__dset_item_class__
+
+        if by is None:
+            by = []
+        elif isinstance(by, (str, DAttribute)):
+            by = [by]
+
+        by_names = []
+        for attr in by:
+            attr_name = attr.name if isinstance(attr, DAttribute) else attr
+            if (attr_name not in item_cls.__dobject_key__ and
+                    attr_name not in item_cls.__dobject_att__):
+                err = "No attribute '%s' defined in %s"
+                err %= (attr_name, item_cls.__name__)
+                raise ValueError(err)
+
+            by_names.append(attr_name)
+
+        trackers = self.__dset_trackers__
+        for out_name, func, attr in _parse_aggs(item_cls, aggs):
+            tracker = DTracker(func, None if attr is None else attr.name,
+                               by_names)
+            for key in self._item_keys():
+                tracker._update(key, None, self._get_item(key))
+
+            trackers[out_name] = tracker
+
+        return self
+
+    def _tracked(self, name, *group_values):
+        """
+        Return the value of the tracked aggregate. If it is tracked by groups,
+        the values of all groups are returned in a dict, or the value of the
+        group if the values of its 'by' attributes are given.
+        """
+
+        tracker = self.__dset_trackers__.get(name, None)
+        if tracker is None:
+            err = "No aggregate '%s' tracked in dset '%s'"
+            raise KeyError(err % (name, self.__class__.__name__))
+
+        if tracker.by_names and not group_values:
+            return tracker._values()
+
+        if len(group_values) != len(tracker.by_names):
+            err = "The aggregate '%s' is tracked by %d attributes, not %d"
+            err %= (name, len(tracker.by_names), len(group_values))
+            raise ValueError(err)
+
+        return tracker._value(group_values)
+
+    def _untrack(self, *names):
+        """Stop tracking the aggregates of names, or all if no name given"""
+
+        trackers = self.__dset_trackers__
+        if not names:
+            trackers.clear()
+
+        for name in names:
+            trackers.pop(name, None)
+
+        return self
+
+    def _track_changes(self):
+        """
+        Track the changes of this dset from now on, as it is the same as the
+        saved one. The keys of items added and removed later are recorded,
+        and so are the changes of items in place unless the dset is stored by
+        columns. The changes are saved by dmerge(ds) without recalling the
+        origin. Calling it again restarts the tracking, as dmerge does after
+        saving.
+        """
+
+        instance_setter = super(dobject, self).__setattr__
+        instance_setter('__dset_changes__', DSetChanges())
+
+        item_cls = self.__dset_item_class__
+        if not isinstance(self, ColumnarDSetImpl) and \
+                not item_cls.__dobject_frozen__:
+            for item in self.__dset_item_dict__.values():
+                item._track_changes()
+
+        return self
+
+    def _changes(self):
+        """
+        Return the tracked changes in a tuple (inserted, changed, deleted), or
+        None if the changes are not tracked. The inserted are the new items,
+        the changed are [(key, {attr: (new, old)})] and the deleted are the
+        keys of removed items.
+        """
+
+        changes = self.__dset_changes__
+        if changes is None:
+            return None
+
+        inserted = [self._get_item(key) for key in changes.added]
+        deleted = list(changes.removed)
+
+        value_attrs = self.__dset_item_class__.__dobject_att__
+        changed = []
+        for key, original in changes.replaced.items():
+            item = self._get_item(key)
+
+            modified = OrderedDict()
+            for attr_name in value_attrs:
+                newval = getattr(item, attr_name)
+                oldval = original[attr_name]
+                if newval != oldval:
+                    modified[attr_name] = (newval, oldval)
+
+            if modified:
+                changed.append((key, modified))
+
+        if not isinstance(self, ColumnarDSetImpl):
+            # the columnar items are copies, they are not changed in place
+            for key, item in self.__dset_item_dict__.items():
+                if key in changes.added or key in changes.replaced:
+                    continue
+
+                modified = item._changes()
+                if modified:
+                    changed.append((key, modified))
+
+        return inserted, changed, deleted
+
+    def _snapshot(self):
+        """
+        Return an immutable snapshot of the items, which can be the origin
+        of dmerge(ds, snapshot) later. The items are shared with this dset
+        and copied on write, see DSetSnapshot. The items of a dset stored by
+        columns are materialized into the snapshot.
+        """
+
+        entries = {}
+        if isinstance(self, ColumnarDSetImpl):
+            for key in self._item_keys():
+                item = self._get_item(key)
+                entries[key] = (item, item.__value_vector__)
+        else:
+            frozen = self.__dset_item_class__.__dobject_frozen__
+            for key, item in self.__dset_item_dict__.items():
+                if not frozen:
+                    _share_vector(item)
+                entries[key] = (item, item.__value_vector__)
+
+        return DSetSnapshot(self.__class__, entries)
+
+    def _lookup(self, **kwargs):
+        """
+        Return a new dset with the items whose attributes equal the given
+        values. An index on exactly these attributes is used if there is,
+        otherwise all items are scanned.
+        """
+
+        item_cls = self.__dset_item_class__
+
+        values = {}
+        for attr_name, value in kwargs.items():
+            attr = getattr(item_cls, attr_name, None)
+            if not isinstance(attr, DAttribute):
+                err = "No attribute '%s' defined in %s"
+                err %= (attr_name, item_cls.__name__)
+                raise ValueError(err)
+
+            values[attr_name] = value if attr.cast is None else attr.cast(value)
+
+        for names, index in self.__dset_indexes__.items():
+            if len(names) == len(values) and all(n in values for n in names):
+                keys = index.get(tuple(values[n] for n in names), ())
+                return self._subset(list(keys))
+
+        keys = [self._index_key(item) for item in self
+                    if all(getattr(item, n) == v for n, v in values.items())]
+
+        return self._subset(keys)
+
+
+    def __json_object__(self):
+        """export dset object in list"""
+
+        return [item.__json_object__() for item in self]
+
+    def __bool__(self):
+        return bool(self.__dset_item_dict__)
+
+    def __len__(self):
+        return len(self.__dset_item_dict__)
+
+    def __iter__(self):
+        return iter(self.__dset_item_dict__.values())
+
+    def __repr__(self):
+
+        opts = []
+
+        if self.__class__.__dobject_key__:
+            opts.append(repr(self.__dobject_key__))
+
+        opts.append(repr([item for item in self]))
+
+        opts.append("_item_type={0!s}".format(
+                            self.__dset_item_class__.__name__))
+
+        if self.__dominion_class__:
+            opts.append("_dominion={0!s}".format(
+                            self.__dominion_class__.__name__))
+
+        if self.__dobject_key__:
+            opts.append("_key={0!r}".format(self.__dobject_key__))
+
+        if self._page:
+            opts.append("_page={0!r}".format(self._page))
+
+        opts = ', '.join(opts)
+
+        s = ("{typename}({opts})").format(
+                        typename = self.__class__.__name__, opts = opts)
+
+        return s
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return self._subset(self._item_keys()[index])
+
+        index = self._index_key(index)
+
+        obj = self._get_item(index)
+        if obj is not None:
+            return obj
+
+        return self.__dset_item_class__()
+
+    def __delitem__(self, index):
+
+        index = self._index_key(index)
+        self._pop_item(index)
+
+
+    def __setitem__(self, index, value):
+
+        item_class = self.__dset_item_class__
+
+        index = self._index_key(index)
+        self._put_item(index, item_class(value))
+
+
+    def __contains__(self, obj):
+        if not isinstance(obj, (DObject, Mapping)):
+            return False
+
+        try:
+            key = self._index_key(obj)
+        except (KeyError, AttributeError): # the object lacks a key attribute
+            return False
+
+        return key in self.__dset_item_dict__
+
+    def _item_key_set(self, items):
+        """
+        Return the keys of the given items in this dset, which are tested by
+        'in'. The keys of a dset with the same item class and substituted
+        values are used as they are.
+        """
+
+        if (isinstance(items, DSetBaseImpl) and
+                items.__dset_item_class__ is self.__dset_item_class__ and
+                items._item_value_subst() == self._item_value_subst()):
+            return items.__dset_item_dict__
+
+        index_key = self._index_key
+        return set(index_key(item) for item in items)
+
+    def _union(self, items):
+        """
+        Return a new dset with the items of this dset and the given items
+        whose keys are absent in this dset.
+        """
+
+        instance = self._subset(self._item_keys())
+
+        item_dict = instance.__dset_item_dict__
+        index_key = instance._index_key
+        for item in items:
+            if index_key(item) not in item_dict:
+                instance._add(item)
+
+        return instance
+
+    def _intersection(self, items):
+        """Return a new dset with the items whose keys are in the given."""
+
+        keys = self._item_key_set(items)
+        return self._subset([k for k in self._item_keys() if k in keys])
+
+    def _difference(self, items):
+        """Return a new dset with the items whose keys are not in the given."""
+
+        keys = self._item_key_set(items)
+        return self._subset([k for k in self._item_keys() if k not in keys])
+
+    def _symmetric_difference(self, items):
+        """
+        Return a new dset with the items whose keys are either in this dset
+        or in the given, but not both.
+        """
+
+        items = list(items)
+        instance = self._difference(items)
+
+        item_dict = self.__dset_item_dict__
+        index_key = self._index_key
+        for item in items:
+            if index_key(item) not in item_dict:
+                instance._add(item)
+
+        return instance
+
+    def __or__(self, other):
+        if not isinstance(other, DSetBase):
+            return NotImplemented
+
+        return self._union(other)
+
+    def __and__(self, other):
+        if not isinstance(other, DSetBase):
+            return NotImplemented
+
+        return self._intersection(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, DSetBase):
+            return NotImplemented
+
+        return self._difference(other)
+
+    def __xor__(self, other):
+        if not isinstance(other, DSetBase):
+            return NotImplemented
+
+        return self._symmetric_difference(other)
+
+    __hash__ = None # a dset is mutable
+
+    def __eq__(self, other):
+        """
+        A dset is equal to the other dset if they have the same keys of
+        items, or to a list or tuple of the items equal in order.
+        """
+
+        if isinstance(other, DSetBase):
+            if len(self) != len(other):
+                return False
+
+            keys = self._item_key_set(other)
+            return all(key in keys for key in self.__dset_item_dict__)
+
+        elif isinstance(other, list) or isinstance(other, tuple):
+            if len(self) != len(other):
+                return False
+
+            return all(a == b for a, b in zip(self, other))
+
+        else:
+            return False
+
+
+    def __iadd__(self, value) :
+
+        if isinstance(value, (DSet, Iterable)):
+            self._extend(value)
+        elif isinstance(value, DObject):
+            self._add(value)
+        else:
+            raise TypeError('should be a dobject, dset or iterable object')
+
+        return self  # operator 'o.x += a', o.x = o.x.__iadd__(a)
+
+
+_column_typecodes = {int: 'q', float: 'd'}
+
+def _new_column(attr):
+    """The column of int or float attribute is a typed array."""
+
+    typecode = _column_typecodes.get(attr.type)
+    if typecode is None:
+        return []
+
+    return array(typecode)
+
+
+class ColumnarDSetImpl(DSetBaseImpl):
+    """
+    The set of dobjects stored by columns, one column for each attribute of
+    the item class in the order of its value vector. The column of an int or
+    float attribute is a typed array. It turns into a list once it is given
+    a value that the array cannot hold, like None.
+
+    The key of each item is mapped to its position in columns. The items are
+    materialized into dobjects when they are iterated or got. They are
+    copies, the changes on them are not written back to this dset until they
+    are set or added again.
+
+    It is made by dset(item_type, _columnar=True, ...).
+    """
+
+    def _clear(self):
+        """clear all objects in aggregate"""
+
+        super(ColumnarDSetImpl, self)._clear()
+
+        item_cls = self.__dset_item_class__
+        columns = [_new_column(getattr(item_cls, attr_name))
+                    for attr_name in self.__dset_item_names__]
+
+        instance_setter = super(dobject, self).__setattr__
+        instance_setter('__dset_columns__', columns)
+
+        return self
+
+    def _get_item(self, key):
+        """Return the item of the key, or None if it is absent."""
+
+        position = self.__dset_item_dict__.get(key, None)
+        if position is None:
+            return None
+
+        load_row = _row_loader(self.__dset_item_class__,
+                               self.__dset_item_names__, trusted=True)
+
+        return load_row([column[position]
+                            for column in self.__dset_columns__], None)
+
+    def _put_item(self, key, obj):
+        """
+        Put the item with the key. If the key has been in this dset, the old
+        item is replaced in its place, otherwise the item is appended.
+        """
+
+        item_dict = self.__dset_item_dict__
+        columns = self.__dset_columns__
+
+        position = item_dict.get(key, None)
+        if position is not None:
+            key = self.__dset_key_list__[position]
+
+        if (self.__dset_indexes__ or self.__dset_trackers__ or
+                self.__dset_changes__ is not None):
+            old_obj = None if position is None else self._get_item(key)
+            self._reindex_item(key, old_obj, obj)
+
+        if position is None:
+            item_dict[key] = len(item_dict)
+            self.__dset_key_list__.append(key)
+
+        for i, attr_name in enumerate(self.__dset_item_names__):
+            value = getattr(obj, attr_name)
+            column = columns[i]
+            try:
+                if position is None:
+                    column.append(value)
+                else:
+                    column[position] = value
+
+            except (TypeError, OverflowError):
+                column = columns[i] = list(column)
+                if position is None:
+                    column.append(value)
+                else:
+                    column[position] = value
+
+    def _put_items(self, pairs):
+        """Put the items of (key, item) pairs one by one."""
+
+        put_item = self._put_item
+        for key, obj in pairs:
+            put_item(key, obj)
+
+    def _pop_item(self, key):
+        """Remove the item of the key and return it, KeyError if absent."""
+
+        item_dict = self.__dset_item_dict__
+        position = item_dict[key]
+        obj = self._get_item(key)
+
+        if (self.__dset_indexes__ or self.__dset_trackers__ or
+                self.__dset_changes__ is not None):
+            self._reindex_item(key, obj, None)
+
+        del item_dict[key]
+
+        keys = self.__dset_key_list__
+        del keys[position]
+        for column in self.__dset_columns__:
+            del column[position]
+
+        # the items behind it move forward
+        for i in range(position, len(keys)):
+            item_dict[keys[i]] = i
+
+        return obj
+
+    def _subset(self, keys, page=None):
+        """
+        Make a dset of this type and key values, which has the items of the
+        given keys in order. The columns are gathered by positions of items.
+        """
+
+        item_dict = self.__dset_item_dict__
+        return self._take([item_dict[k] for k in keys], page)
+
+    def _take(self, positions, page=None):
+        """
+        Make a dset like _subset, with the items at the positions. The columns
+        are gathered by the positions.
+        """
+
+        instance = self._sibling(page=page)
+        if instance.__dset_indexes__:
+            keys = self.__dset_key_list__
+            return super(ColumnarDSetImpl, self)._subset(
+                                        [keys[p] for p in positions], page)
+
+        key_list = self.__dset_key_list__
+        keys = instance.__dset_key_list__
+        keys.extend(key_list[p] for p in positions)
+
+        new_dict = instance.__dset_item_dict__
+        for i, key in enumerate(keys):
+            new_dict[key] = i
+
+        columns = instance.__dset_columns__
+        for i, column in enumerate(self.__dset_columns__):
+            values = map(column.__getitem__, positions)
+            if isinstance(column, array):
+                columns[i] = array(column.typecode, values)
+            else:
+                columns[i] = list(values)
+
+        return instance
+
+    def _column(self, attr_name):
+        """
+        Return the values of the attribute of items in order. A typed column
+        is returned as a numpy array if numpy is installed, or a copy of the
+        array. The other column is returned in a list.
+        """
+
+        if attr_name not in self.__dset_item_names__:
+            err = "No attribute '%s' in the item of dset '%s'"
+            err %= (attr_name, self.__class__.__name__)
+            raise AttributeError(err)
+
+        item_cls = self.__dset_item_class__
+        column = self.__dset_columns__[getattr(item_cls, attr_name).index]
+
+        if isinstance(column, array):
+            if numpy is not None:
+                return numpy.frombuffer(column, dtype=column.typecode).copy()
+
+            return array(column.typecode, column)
+
+        return _column_array(list(column), getattr(item_cls, attr_name).type)
+
+    def __iter__(self):
+        load_row = _row_loader(self.__dset_item_class__,
+                               self.__dset_item_names__, trusted=True)
+
+        for row in zip(*self.__dset_columns__):
+            yield load_row(row, None)
+
+
+class SortedDSetImpl(DSetBaseImpl):
+    """
+    The set of dobjects kept in the order of a sortable spec, like '+a,-b'
+    of DPage. The items of the same sort values are kept in the order they
+    were added. The sort entries of items are kept in a sorted list with the
+    keys of items in the same order.
+
+    The new entries are pending until the items are read in order, then
+    they are put by bisect, or merged by sorting if there are many of them.
+
+    It is made by dset(item_type, _sortable='+a,-b', ...). A page with the
+    same sortable, or a prefix of it, is sliced without sorting.
+    """
+
+    def _clear(self):
+        """clear all objects in aggregate"""
+
+        super(SortedDSetImpl, self)._clear()
+
+        instance_setter = super(dobject, self).__setattr__
+        instance_setter('__dset_key_list__', None) # use the sorted keys
+        instance_setter('__dset_sorted_keys__', [])
+        instance_setter('__dset_sort_list__', [])
+        instance_setter('__dset_sort_pending__', [])
+        instance_setter('__dset_sort_entries__', {})
+        instance_setter('__dset_sort_seq__', count())
+
+        return self
+
+    def _sort_pending(self):
+        """Put the pending entries into the sorted list."""
+
+        pending = self.__dset_sort_pending__
+        if not pending:
+            return
+
+        pending.sort()
+
+        sort_list = self.__dset_sort_list__
+        sorted_keys = self.__dset_sorted_keys__
+
+        if not sort_list or sort_list[-1] < pending[0][0]:
+            sort_list.extend(entry for entry, key in pending)
+            sorted_keys.extend(key for entry, key in pending)
+
+        elif len(pending) < 32:
+            for entry, key in pending:
+                position = bisect_right(sort_list, entry)
+                sort_list.insert(position, entry)
+                sorted_keys.insert(position, key)
+
+        else:
+            merged = list(zip(sort_list, sorted_keys))
+            merged.extend(pending)
+            merged.sort()
+            sort_list[:] = [entry for entry, key in merged]
+            sorted_keys[:] = [key for entry, key in merged]
+
+        pending.clear()
+
+    def _item_keys(self):
+        """Return the list of item keys in the sorted order."""
+
+        self._sort_pending()
+        return self.__dset_sorted_keys__
+
+    def _put_item(self, key, obj):
+        """
+        Put the item with the key at the place of its sort values. The item
+        replacing the old one of the same sort values stays in its place.
+        """
+
+        entries = self.__dset_sort_entries__
+
+        old_entry = entries.get(key, None)
+        if old_entry is None:
+            seq = next(self.__dset_sort_seq__)
+        else:
+            seq = old_entry[-1]
+            self._sort_pending()
+            position = bisect_left(self.__dset_sort_list__, old_entry)
+            del self.__dset_sort_list__[position]
+            del self.__dset_sorted_keys__[position]
+
+        super(SortedDSetImpl, self)._put_item(key, obj)
+
+        sort_key = self.__class__.__dset_sort_key__
+        entry = entries[key] = sort_key(obj) + (seq, )
+        self.__dset_sort_pending__.append((entry, key))
+
+    def _put_items(self, pairs):
+        """Put the items of (key, item) pairs one by one."""
+
+        put_item = self._put_item
+        for key, obj in pairs:
+            put_item(key, obj)
+
+    def _pop_item(self, key):
+        """Remove the item of the key and return it, KeyError if absent."""
+
+        obj = super(SortedDSetImpl, self)._pop_item(key)
+
+        self._sort_pending()
+        entry = self.__dset_sort_entries__.pop(key)
+        position = bisect_left(self.__dset_sort_list__, entry)
+        del self.__dset_sort_list__[position]
+        del self.__dset_sorted_keys__[position]
+
+        return obj
+
+    def _reorder(self, keys, page=None):
+        """
+        Make a dset with the items of the given keys in order. It is not a
+        sorted dset, since the order is not the sortable of this one.
+        """
+
+        instance = self._sibling(self.__class__.__dset_unsorted_class__, page)
+        instance._put_items(zip(keys, map(self._get_item, keys)))
+
+        return instance
+
+    def _range(self, start=None, stop=None):
+        """
+        Return a new dset with the items from start to stop, both included.
+        The bounds are the values of the leading sortable attributes, a tuple
+        or a value of the first one. They are compared in the order of this
+        dset, so the bounds of a descending attribute go from high to low.
+        """
+
+        self._sort_pending()
+        sort_list = self.__dset_sort_list__
+
+        lower = 0
+        if start is not None:
+            lower = bisect_left(sort_list, self._sort_bound(start))
+
+        upper = len(sort_list)
+        if stop is not None:
+            bound = self._sort_bound(stop) + (_greatest, )
+            upper = bisect_left(sort_list, bound)
+
+        return self._subset(self.__dset_sorted_keys__[lower:upper])
+
+    def _sort_bound(self, values):
+        if not isinstance(values, tuple):
+            values = (values, )
+
+        item_cls = self.__dset_item_class__
+        fields = self.__dset_sortable__
+        if len(values) > len(fields):
+            err = "Too many bound values of sortable: %r" % (values, )
+            raise ValueError(err)
+
+        bound = []
+        for (attr_name, ascending), value in zip(fields, values):
+            attr = getattr(item_cls, attr_name)
+            if attr.cast is not None:
+                value = attr.cast(value)
+            bound.append(_sort_value(value, ascending, _negatable(attr)))
+
+        return tuple(bound)
+
+    def __iter__(self):
+        return map(self.__dset_item_dict__.__getitem__, self._item_keys())
@@ -5,25 +5,41 @@ from collections import OrderedDict
 from collections import namedtuple
 from collections.abc import Iterable, Mapping
 from typing import Mapping, Generic
+from itertools import chain as iter_chain
+from operator import itemgetter
 
 from datetime import datetime, date
 # from dateutil.parser import parse as datetime_parse
 
 from .typing import DSet, DObject, PrimaryKeyTuple, AnyDObject
-from .typing import DAttribute, DAggregate
+from .typing import DAttribute, DAggregate, DSetBase
 from .typing import cast_attr_value, parse_attr_value_many
 # from .dattr import AggregateAttr
 from .reshape import ReshapeDescriptor
 
 
 _keywords = set(["__module__", "__qualname__", "__new__", "__setattr__",
+                 "__setstate__",
                  "__repr__", "__eq__", "__bool__", "__doc__", "__iter__",
+                 "__slots__",
                  "__getitem__", "__delitem__", "__setitem__", "__hash__",
                  "__classcell__", 
                  "__iadd__", "__table_name__",
-                 '_item_value_subst', '_index_key',
+                 '_item_value_subst', '_index_key', '_from_rows',
+                 '_get_item', '_put_item', '_pop_item', '_column',
+                 '_item_keys', '_subset', '_paginate',
+                 '__contains__', '__or__', '__and__', '__sub__', '__xor__',
+                 '_item_key_set', '_union', '_intersection', '_difference',
+                 '_symmetric_difference',
+                 '_reindex_item', '_create_index', '_lookup',
+                 '_range', '_sort_bound', '_sort_pending',
+                 '_reorder', '_sorted_keys', '_where', '_order_by',
+                 '_group_by', '_sibling', '_put_items', '_take', '_join',
+                 '_track', '_tracked', '_untrack', '_extend', '_view',
+                 '_track_changes', '_changes', '_snapshot',
                  "_export", "_add", "_clear", "__json_object__", "__len__",
-                 "__dobject_key__", "__dobject_att__", "__dobject_origin_class__", "__dobject_mapping__", "_re"])
+                 "__dobject_key__", "__dobject_att__", "__dobject_origin_class__", "__dobject_mapping__", "_re",
+                 "__dobject_frozen__"])
 
 class DObjectMetaClass(type):
     """A Metacalss of dobject.
@@ -34,13 +50,18 @@ class DObjectMetaClass(type):
     :__dobject_key__: It is a attribute dictionary of primary key of domain object
     :__dobject_att__: It is a attribute dictionary of non primary key of domain object
 
+    The values of attributes are stored in a fixed-size vector of instance,
+    the primary key attributes come first, and the others follow them. The
+    position of each attribute is kept in its index. The dobject classes
+    have no instance dictionary, unless it is declared in their bases.
+
     """
 
     @classmethod
     def __prepare__(metacls, name, bases, **kwargs):
         return OrderedDict()
 
-    def __new__(metacls, classname, bases, class_dict, **kargs):
+    def __new__(metacls, classname, bases, class_dict, frozen=None, **kargs):
 
         pkey_attrs = OrderedDict()
         value_attrs = OrderedDict()
@@ -95,11 +116,42 @@ class DObjectMetaClass(type):
                 value_attrs[attr_name] = attr
 
 
-        class_dict['__dobject_key__'] = pkey_attrs
+        # Each class owns its attribute descriptors, because the positions
+        # of inherited attributes may differ from their base classes.
+        for attr_name, attr in iter_chain(pkey_attrs.items(),
+                                          value_attrs.items()):
+            if attr_name not in attributes:
+                class_dict[attr_name] = attr
+
+        # The frozen dobject is declared by 'frozen=True' or
+        # '__dobject_frozen__ = True', and it is inherited.
+        frozen_bases = [getattr(base_cls, '__dobject_frozen__', False)
+                            for base_cls in bases]
+        if frozen is None:
+            frozen = class_dict.pop('__dobject_frozen__', None)
+        else:
+            class_dict.pop('__dobject_frozen__', None)
+
+        if frozen is None:
+            frozen = any(frozen_bases)
+        elif not frozen and any(frozen_bases):
+            err = "The dobject %s cannot be unfrozen from its frozen bases"
+            raise TypeError(err % classname)
+
+        frozen = bool(frozen)
+
+        class_dict.setdefault('__slots__', ())
+
+        class_dict['__dobject_frozen__'] = frozen
+
+        class_dict['__dobject_key__'] = DObjectKeyDescriptor(pkey_attrs)
         class_dict['__dobject_att__'] = value_attrs
         class_dict['__dobject_origin_class__'] = None
         class_dict['__dobject_mapping__'] = OrderedDict()
         class_dict['_re'] =  ReshapeDescriptor()
+        class_dict['__dobject_row_loaders__'] = OrderedDict()
+        class_dict['__dobject_class_cache__'] = OrderedDict()
+        class_dict['__dobject_json_encoder__'] = None
 
         cls = type.__new__(metacls, classname, bases, class_dict)
 
@@ -108,78 +160,111 @@ class DObjectMetaClass(type):
         for attr_name, attr in attributes.items():
             attr.setup(cls, attr_name) # set owner and other something...
 
+        for i, attr in enumerate(iter_chain(pkey_attrs.values(),
+                                            value_attrs.values())):
+            attr.index = i
+
+            if frozen and (issubclass(attr.type, DSetBase) or
+                           (isinstance(attr.type, DObjectMetaClass) and
+                                not attr.type.__dobject_frozen__)):
+                err = ("The attribute '%s' of frozen dobject %s should not "
+                       "be a dset or unfrozen dobject")
+                raise TypeError(err % (attr.name, classname))
+
         setattr(cls, '__dobject_key_class__', _make_pkey_class(cls))
+        setattr(cls, '__dobject_new__', _make_dobject_new(cls))
 
         return cls
 
     def __init__(cls, name, bases, namespace, **kargs):
         super().__init__(name, bases, namespace)
 
+
+class DObjectKeyDescriptor:
+    """
+    The '__dobject_key__' of dobject.
+
+    Accessed by the class, it is the attribute dictionary of primary key.
+    Accessed by the instance, it is the primary key tuple of this instance.
+    """
+
+    __slots__ = ('attrs', )
+
+    def __init__(self, attrs):
+        self.attrs = attrs
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.attrs
+
+        return instance.__key_tuple__
+
+    def __set__(self, instance, value):
+        errmsg = "The primary key of dobject '%s' is read-only"
+        errmsg %= instance.__class__.__name__
+        raise AttributeError(errmsg)
+
 _pkey_class_tmpl = """\
-class {typename}(PrimaryKeyTuple[DObjectType]):
+class {typename}(tuple, PrimaryKeyTuple):
     "Primary key value tuple"
 
+    __slots__ = ()
+
     _attr_names = tuple([{attr_names}])
 
-    def __init__(self, instance):
+    def __new__(cls, instance):
         if isinstance(instance, DObject):
-            self._instance = instance
-            self._attr_values = tuple(getattr(instance, n)
-                                        for n in self._attr_names)
+            values = ({attr_values})
         elif isinstance(instance, tuple):
-            self._attr_values = instance
+            values = instance
         elif isinstance(instance, Mapping):
-            self._attr_values = tuple(instance.get(n, None)
-                                        for n in self._attr_names)
+            values = ({mapping_values})
         else:
             errmsg = "The input value should be a dobject, tuple or dict object"
             errmsg += ": %s" % instance.__class__.__name__
             raise TypeError(errmsg)
 
+        return tuple_new(cls, values)
+
     def __repr__(self):
         expr = ', '.join(['%s=%r' % (k, v)
-                        for k, v in zip(self._attr_names, self._attr_values)])
+                        for k, v in zip(self._attr_names, self)])
         return 'K(' + expr + ')'
 
-    def __eq__(self, other):
-        return self._attr_values == other._attr_values
-
-    def __hash__(self):
-        return hash(self._attr_values)
-
-    def __len__(self):
-        return len(self._attr_names)
-
-    def __iter__(self):
-        return iter(self._attr_values)
-
     def as_dict(self):
-        return dict((name, value)
-                        for name, value
-                            in zip(self._attr_names, self._attr_values))
+        return dict(zip(self._attr_names, self))
 """
 _pkey_attr_tmpl="""\
-    {name} = property(lambda self: self._attr_values[{idx}])
+    {name} = property(itemgetter({idx}))
 """
 
 def _make_pkey_class(dobj_cls, attr_names = None):
-    """ """
+    """
+    Make the key class of dobject class, a tuple of the values of the key
+    attributes. It refers to nothing but the values, and its hash and
+    comparison are those of tuple.
+    """
 
     typename = dobj_cls.__name__ + '_key_tuple'
 
     if attr_names is None:
         attr_names = dobj_cls.__dobject_key__
 
-    attr_names = [repr(name) for name in attr_names]
+    attr_names = list(attr_names)
 
-    class_code = _pkey_class_tmpl.format(typename = typename,
-                                         attr_names = ', '.join(attr_names))
+    class_code = _pkey_class_tmpl.format(
+                typename = typename,
+                attr_names = ', '.join(repr(n) for n in attr_names),
+                attr_values = ''.join('instance.%s, ' % n for n in attr_names),
+                mapping_values = ''.join('instance.get(%r, None), ' % n
+                                            for n in attr_names))
 
-    for i, attr_name in enumerate(dobj_cls.__dobject_key__):
+    for i, attr_name in enumerate(attr_names):
         class_code += _pkey_attr_tmpl.format(name=attr_name, idx=i)
 
     namespace = dict(PrimaryKeyTuple = PrimaryKeyTuple,
-                     DObjectType = dobj_cls,
+                     tuple_new = tuple.__new__,
+                     itemgetter = itemgetter,
                      DObject=DObject,
                      Mapping=Mapping)
     exec(class_code, namespace)
@@ -187,3 +272,330 @@ def _make_pkey_class(dobj_cls, attr_names = None):
     pkey_cls.__module__ = dobj_cls.__module__
 
     return pkey_cls
+
+
+_dobject_new_tmpl = """\
+def __dobject_new__(cls, *args, **kwargs):
+    instance = object_new(cls)
+    values = [{none_list}]
+    set_values(instance, values)
+
+    if args:
+        if len(args) > 1:
+            errmsg = "Do not exceed one positional argument: "
+            errmsg += "(obj, attr1='', ...) or (attr1='', ...) "
+            raise ValueError(errmsg)
+
+        source = args[0] # reshape the given object or dict
+        if source.__class__ is cls and not kwargs:
+{share_stmt}            src_values = source.__value_vector__
+{copy_stmts}
+            set_key(instance, {key_expr})
+            return instance
+
+        if not isinstance(source, Mapping):
+            source = source_values(cls, source)
+
+        if kwargs:
+            source = dict(source)
+            source.update(kwargs)
+
+    elif kwargs:
+        source = kwargs
+
+    else:
+        set_key(instance, {key_expr})
+        return instance
+
+    if kwargs:
+        for arg_name in kwargs:
+            if arg_name not in attr_names:
+                errmsg = "No attribue '%s' defined in %s"
+                errmsg %= (arg_name, cls.__name__)
+                raise ValueError(errmsg)
+
+{set_stmts}
+    set_key(instance, {key_expr})
+    return instance
+"""
+
+_attr_copy_tmpl = """\
+            values[{idx}] = src_values[{idx}]
+"""
+
+_attr_lazy_copy_tmpl = """\
+            attr_{idx}.set_value_unguardedly(instance, getattr(source, {name!r}))
+"""
+
+_attr_set_tmpl = """\
+    value = source.get({name!r}, missing)
+    if value is not missing:
+        values[{idx}] = cast_{idx}(value)
+"""
+
+_attr_generic_tmpl = """\
+    value = source.get({name!r}, missing)
+    if value is not missing:
+        attr_{idx}.set_value_unguardedly(instance, value)
+"""
+
+def _key_tuple_expr(dobj_cls):
+    """
+    The expression of the generated code that makes the key tuple of the
+    instance from its value vector 'values'. The key attribute initialized
+    lazily is read through the attribute.
+    """
+
+    values = []
+    for attr in dobj_cls.__dobject_key__.values():
+        if hasattr(attr.type, '__default_value__') or attr.default is not None:
+            values.append('getattr(instance, %r)' % attr.name)
+        else:
+            values.append('values[%d]' % attr.index)
+
+    return 'tuple_new(key_class, (%s))' % ''.join(v + ', ' for v in values)
+
+def _make_dobject_new(dobj_cls):
+    """
+    Make the constructor of the dobject class, which is specialized for its
+    attributes.
+
+    The attributes are unrolled in the order of value vector. If the source
+    object is a instance of the same class, its values are copied directly,
+    or it is returned itself if the class is frozen.
+    """
+
+    attributes = list(iter_chain(dobj_cls.__dobject_key__.values(),
+                                 dobj_cls.__dobject_att__.values()))
+
+    namespace = dict(object_new = object.__new__,
+                     set_values = _value_vector_setter,
+                     set_key = _key_tuple_setter,
+                     key_class = dobj_cls.__dobject_key_class__,
+                     tuple_new = tuple.__new__,
+                     source_values = _source_values,
+                     attr_names = frozenset(attr.name for attr in attributes),
+                     missing = object(),
+                     Mapping = Mapping)
+
+    copy_stmts, set_stmts = [], []
+    for attr in attributes:
+        namespace['attr_%d' % attr.index] = attr
+        namespace['cast_%d' % attr.index] = attr.cast
+
+        if (issubclass(attr.type, DSetBase)
+                or hasattr(attr.type, '__default_value__')
+                or attr.default is not None):
+            # the value is initialized lazily or is a dset that has to be
+            # cloned, so it is read through the attribute.
+            copy_tmpl = _attr_lazy_copy_tmpl
+        else:
+            copy_tmpl = _attr_copy_tmpl
+
+        if attr.cast is None:
+            set_tmpl = _attr_generic_tmpl
+        else:
+            set_tmpl = _attr_set_tmpl
+
+        copy_stmts.append(copy_tmpl.format(idx=attr.index, name=attr.name))
+        set_stmts.append(set_tmpl.format(idx=attr.index, name=attr.name))
+
+    func_code = _dobject_new_tmpl.format(
+                        key_expr = _key_tuple_expr(dobj_cls),
+                        share_stmt = ('            return source\n'
+                                      if dobj_cls.__dobject_frozen__ else ''),
+                        none_list = ', '.join(['None'] * len(attributes)),
+                        copy_stmts = ''.join(copy_stmts) or '            pass\n',
+                        set_stmts = ''.join(set_stmts))
+
+    exec(func_code, namespace)
+    new_func = namespace['__dobject_new__']
+    new_func.__qualname__ = dobj_cls.__qualname__ + '.__dobject_new__'
+
+    return new_func
+
+
+_row_loader_tmpl = """\
+def load_row(row, fixed):
+    instance = object_new(cls)
+    values = [{value_list}]
+    set_values(instance, values)
+{set_stmts}
+    set_key(instance, {key_expr})
+    return instance
+"""
+
+_row_loader_cache_size = 32
+
+def _row_loader(dobj_cls, column_names, fixed_names=(), trusted=False):
+    """
+    Get the row loader of dobject class. The loaders are cached in the class
+    by the column names, the least recently used one is dropped when the
+    cache is full.
+    """
+
+    loaders = dobj_cls.__dobject_row_loaders__
+
+    cache_key = (tuple(column_names), tuple(fixed_names), trusted)
+    load_row = loaders.get(cache_key)
+    if load_row is not None:
+        loaders.move_to_end(cache_key)
+        return load_row
+
+    load_row = _make_row_loader(dobj_cls, column_names, fixed_names, trusted)
+    loaders[cache_key] = load_row
+    if len(loaders) > _row_loader_cache_size:
+        loaders.popitem(last=False)
+
+    return load_row
+
+_class_cache_size = 64
+
+def _cached_class(owner_cls, cache_key, make_class):
+    """
+    Get the class made from owner_cls by the normalized arguments in
+    cache_key, like the dset of owner_cls or its reshaped class. Otherwise,
+    the class is made by make_class() and cached.
+
+    The classes are cached in owner_cls like the row loaders, so that they
+    are dropped together with it. The least recently used one is dropped
+    when the cache is full. The arguments that can not be hashed are not
+    cached. The module of caller is a part of cache_key, since it is the
+    __module__ of class made.
+
+    The cached class is shared by the callers of the same arguments, so it
+    should not be changed by assigning its attributes.
+    """
+
+    cache = owner_cls.__dict__.get('__dobject_class_cache__', None)
+    if cache is None:
+        return make_class()
+
+    try:
+        cls = cache.get(cache_key)
+    except TypeError: # unhashable
+        return make_class()
+
+    if cls is not None:
+        cache.move_to_end(cache_key)
+        return cls
+
+    cls = cache[cache_key] = make_class()
+    if len(cache) > _class_cache_size:
+        cache.popitem(last=False)
+
+    return cls
+
+def _attr_cache_key(attr):
+    """The normalized declaration of attribute in the key of class cache"""
+
+    extra = getattr(attr, '_kwargs', None)
+    extra = tuple(sorted(extra.items())) if extra else ()
+
+    return (attr.name, attr.type, attr.default, attr.len, attr.doc,
+            attr.owner_class, extra)
+
+def _make_row_loader(dobj_cls, column_names, fixed_names=(), trusted=False):
+    """
+    Make the function load_row(row, fixed) that creates a dobject from a row
+    whose columns are named in column_names. The columns that are not the
+    attributes of dobject are skipped.
+
+    The attributes named in fixed_names take their values from the sequence
+    fixed instead of the row, these values should have been casted.
+
+    If trusted is true, the row values are stored without casting, as the
+    database driver has returned them in the right types. The attributes of
+    dset or the types with '__default_value__', like dsequence, are always
+    casted.
+    """
+
+    column_idxs = {}
+    for i, colname in enumerate(column_names):
+        column_idxs.setdefault(colname, i)
+
+    fixed_idxs = dict((name, i) for i, name in enumerate(fixed_names))
+
+    namespace = dict(cls = dobj_cls,
+                     object_new = object.__new__,
+                     set_values = _value_vector_setter,
+                     set_key = _key_tuple_setter,
+                     key_class = dobj_cls.__dobject_key_class__,
+                     tuple_new = tuple.__new__)
+
+    value_list, set_stmts = [], []
+    for attr in iter_chain(dobj_cls.__dobject_key__.values(),
+                           dobj_cls.__dobject_att__.values()):
+
+        if attr.name in fixed_idxs:
+            value_expr = 'fixed[%d]' % fixed_idxs[attr.name]
+
+        elif attr.name in column_idxs:
+            value_expr = 'row[%d]' % column_idxs[attr.name]
+
+        else:
+            value_list.append('None')
+            continue
+
+        if attr.cast is None:
+            namespace['attr_%d' % attr.index] = attr
+            set_stmts.append('    attr_%d.set_value_unguardedly(instance, %s)\n'
+                             % (attr.index, value_expr))
+            value_list.append('None')
+
+        elif ((trusted and not hasattr(attr.type, '__default_value__'))
+                or attr.name in fixed_idxs):
+            value_list.append(value_expr)
+
+        else:
+            namespace['cast_%d' % attr.index] = attr.cast
+            value_list.append('cast_%d(%s)' % (attr.index, value_expr))
+
+    func_code = _row_loader_tmpl.format(value_list = ', '.join(value_list),
+                                        set_stmts = ''.join(set_stmts),
+                                        key_expr = _key_tuple_expr(dobj_cls))
+
+    exec(func_code, namespace)
+    return namespace['load_row']
+
+
+def _value_vector_setter(instance, values):
+    object.__setattr__(instance, '__value_vector__', values)
+
+def _key_tuple_setter(instance, key):
+    object.__setattr__(instance, '__key_tuple__', key)
+
+def _source_values(dobj_cls, source_obj):
+    """
+    Read the values of attributes from a dobject or other object, which are
+    returned in a dict. The substituted attributes of the reshaped class are
+    read from the original names.
+    """
+
+    if (isinstance(source_obj, DObject) and dobj_cls.__dobject_origin_class__
+            and isinstance(source_obj, dobj_cls.__dobject_origin_class__)):
+        subst_mapping = {}
+        for o_name, n_name in dobj_cls.__dobject_mapping__.items():
+            subst_mapping[n_name] = o_name
+            if n_name not in dobj_cls.__dobject_mapping__:
+                # _subst=dict(a=b*, b=a) if o_name in mapping
+                subst_mapping[o_name] = None # mark it not to clone
+    else:
+        subst_mapping = {}
+
+    values = {}
+    for attr_name in iter_chain(dobj_cls.__dobject_key__,
+                                dobj_cls.__dobject_att__):
+        if attr_name in subst_mapping:
+            src_attr_name = subst_mapping[attr_name]
+            if src_attr_name is None:
+                continue
+        else:
+            src_attr_name = attr_name
+
+        if not hasattr(source_obj, src_attr_name):
+            continue
+
+        values[attr_name] = getattr(source_obj, src_attr_name)
+
+    return values
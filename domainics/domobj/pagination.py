@@ -115,23 +115,33 @@ class DPage:
             self.sortable.append(_sortable_field(attr_name, ascending))
 
     def format_content_range(self):
+        """
+        Format the range of items in this page, like 'items=0-9/25'. The end
+        is not beyond the total if it is known. The page without any item is
+        formatted as 'items=*/25'.
+        """
 
         if self.start is None:
             start = 0
         else:
             start = self.start
 
+        end = None
         if self.limit is not None:
-            end = str(start + self.limit - 1)
-        else:
-            end = ''
+            end = start + self.limit
 
-        start = str(start)
-
-        if not self.total:
+        if self.total is None:
             total = '*'
+        else:
+            total = str(self.total)
+            end = self.total if end is None else min(end, self.total)
 
-        range_string = "items=%s-%s/%s" % (start, end, total)
+        if end is not None and end <= start: # an empty page
+            range_string = "items=*/%s" % total
+        else:
+            range_string = "items=%s-%s/%s" % (start,
+                                               '' if end is None else end - 1,
+                                               total)
 
         if self.sortable :
             range_string += ', sortable=' + self.format_sortable()
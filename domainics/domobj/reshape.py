@@ -4,9 +4,10 @@ from collections import OrderedDict
 from collections.abc import Iterable, Mapping
 from decimal import Decimal
 from itertools import chain as iter_chain
+from operator import attrgetter
 import sys
 from ..util import NamedDict
-from .typing import DAttribute
+from .typing import DAttribute, DObject, DSetBase
 
 
 class ReshapeDescriptor:
@@ -192,6 +193,33 @@ def _reshape_class(orig_cls, *args, **kwargs):
 
     # -------------------------------------------------------------------
 
+    try:
+        module = sys._getframe(2).f_globals.get('__name__', '__main__')
+    except (AttributeError, ValueError):
+        module = '__main__'
+
+    # avoid cyclical importing
+    from .metaclass import _cached_class, _attr_cache_key
+
+    # the same reshaping of orig_cls in a module gets the identical class
+    cache_key = ('_re', module, new_type_name,
+                 frozenset(selected), frozenset(ignored), tuple(new_pkeys),
+                 tuple((n, _attr_cache_key(a)) for n, a in declared.items()),
+                 tuple(new_bases), tuple(combined),
+                 tuple(sorted(substituted.items())))
+
+    return _cached_class(orig_cls, cache_key,
+                         lambda: _make_reshaped_class(
+                                        orig_cls, new_type_name, selected,
+                                        ignored, new_pkeys, declared,
+                                        new_bases, combined, substituted,
+                                        module))
+
+
+def _make_reshaped_class(orig_cls, new_type_name, selected, ignored,
+                         new_pkeys, declared, new_bases, combined,
+                         substituted, module):
+    """Make the class reshaped from orig_cls by the parsed arguments"""
 
     attributes = OrderedDict()
     for attr_name, attr in iter_chain(orig_cls.__dobject_key__.items(),
@@ -227,6 +255,8 @@ def _reshape_class(orig_cls, *args, **kwargs):
                                           cls.__dobject_att__.items()):
 
             if attr_name not in attributes:
+                attr = attr.copy()
+                attr.owner_class = None
                 attributes[attr_name] = attr
 
     for attr_name, attr in declared.items():
@@ -273,6 +303,8 @@ def _reshape_class(orig_cls, *args, **kwargs):
 
     attributes['__dobject_key__'] = new_pkeys
     attributes['__dobject_origin_class__'] = orig_cls
+    if orig_cls.__dobject_frozen__:
+        attributes['__dobject_frozen__'] = True
 
     subst_map = OrderedDict()
     for old_name, new_name in substituted.items():
@@ -290,7 +322,7 @@ def _reshape_class(orig_cls, *args, **kwargs):
 
     new_cls = type(new_type_name, new_bases, attributes)
 
-    new_cls.__module__ = sys._getframe(2).f_globals.get('__name__', '__main__')
+    new_cls.__module__ = module
 
     setattr(new_cls, '__dobject_origin_class__', tuple([orig_cls] + combined))
     if substituted:
@@ -298,6 +330,147 @@ def _reshape_class(orig_cls, *args, **kwargs):
 
     return new_cls
 
+def _make_view(dobj_cls, source):
+    """
+    Make the read-only view of source dobject, or the view of each item of
+    source dset, in the shape of dobj_cls.
+    """
+
+    from .metaclass import _cached_class # avoid cyclical importing
+
+    if isinstance(source, DSetBase):
+        source_cls = source.__dset_item_class__
+    elif isinstance(source, DObject):
+        source_cls = source.__class__
+    else:
+        errmsg = "The source of view should be a dobject or dset, not %r"
+        raise TypeError(errmsg % source.__class__.__name__)
+
+    view_cls = _cached_class(dobj_cls, ('_view', source_cls),
+                             lambda: _make_view_class(dobj_cls, source_cls))
+
+    if isinstance(source, DSetBase):
+        return DSetView(view_cls, source)
+
+    return view_cls(source)
+
+
+def _make_view_class(dobj_cls, source_cls):
+    """
+    Make the view class of dobj_cls for the objects of source_cls. Each
+    attribute of view reads the attribute of source. If the source is an
+    object of the origin class, the attribute substituted by _subst is read
+    from the original name. The attribute absent in the source is None.
+    """
+
+    subst_mapping = {}
+    origin_classes = dobj_cls.__dobject_origin_class__
+    if origin_classes and issubclass(source_cls, origin_classes):
+        mapping = dobj_cls.__dobject_mapping__
+        for o_name, n_name in mapping.items():
+            subst_mapping[n_name] = o_name
+            if n_name not in mapping:
+                subst_mapping[o_name] = None
+
+    props = OrderedDict()
+    for attr_name in iter_chain(dobj_cls.__dobject_key__,
+                                dobj_cls.__dobject_att__):
+        src_attr_name = subst_mapping.get(attr_name, attr_name)
+        if (src_attr_name is None or
+                (src_attr_name not in source_cls.__dobject_key__ and
+                    src_attr_name not in source_cls.__dobject_att__)):
+            props[attr_name] = property(_none_getter)
+        else:
+            props[attr_name] = property(
+                                attrgetter('__view_source__.' + src_attr_name))
+
+    props['__view_class__'] = dobj_cls
+    props['__slots__'] = ()
+
+    return type(dobj_cls.__name__ + '_view', (DObjectView, ), props)
+
+
+def _none_getter(view):
+    return None
+
+
+class DObjectView:
+    """
+    The read-only view of a dobject in the shape of other dobject class, made
+    by A._re('a', 'b')._view(obj). It reads the attributes through the source
+    object without copying them. A(view) makes a copy of it.
+    """
+
+    __slots__ = ('__view_source__', )
+
+    __view_class__ = None # the dobject class in whose shape
+
+    def __init__(self, source):
+        object.__setattr__(self, '__view_source__', source)
+
+    def __setattr__(self, name, value):
+        errmsg = "The view %s of dobject is read-only"
+        raise AttributeError(errmsg % self.__class__.__name__)
+
+    @property
+    def __dobject_key__(self):
+        cls = self.__view_class__
+        values = tuple(getattr(self, n) for n in cls.__dobject_key__)
+        return tuple.__new__(cls.__dobject_key_class__, values)
+
+    def __json_object__(self):
+        cls = self.__view_class__
+
+        data = OrderedDict()
+        for attr_name in iter_chain(cls.__dobject_key__, cls.__dobject_att__):
+            attr_value = getattr(self, attr_name)
+            if hasattr(attr_value, '__json_object__'):
+                attr_value = attr_value.__json_object__()
+
+            data[attr_name] = attr_value
+
+        return data
+
+    def __repr__(self):
+        cls = self.__view_class__
+        segs = ['%s=%r' % (attr_name, getattr(self, attr_name))
+                    for attr_name in iter_chain(cls.__dobject_key__,
+                                                cls.__dobject_att__)]
+
+        return self.__class__.__name__ + '(' + ', '.join(segs) + ')'
+
+
+class DSetView:
+    """
+    The read-only view of the items of dset, each of which is viewed in the
+    shape of other dobject class, made by A._re('a', 'b')._view(ds).
+    """
+
+    __slots__ = ('_view_class', '_source')
+
+    def __init__(self, view_class, source):
+        self._view_class = view_class
+        self._source = source
+
+    def __len__(self):
+        return len(self._source)
+
+    def __iter__(self):
+        return map(self._view_class, self._source)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DSetView(self._view_class, self._source[index])
+
+        return self._view_class(self._source[index])
+
+    def __json_object__(self):
+        return [view.__json_object__() for view in self]
+
+    def __repr__(self):
+        return 'DSetView(' + ', '.join(repr(view) for view in self) + ')'
+
+
 class ReshapeOperator:
     __slot__ = ('source', 'requred', 'ignored')
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from typing import TypeVar, Generic
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 import arrow
 from collections import OrderedDict
 from collections.abc import Iterable, Mapping
@@ -9,7 +9,7 @@ from numbers import Number
 
 
 class DObject:
-    pass
+    __slots__ = ()
 
 AnyDObject = TypeVar('AnyDObject', bound=DObject, covariant=True)
 
@@ -27,7 +27,7 @@ class DAggregate(DAttribute):
     pass
 
 class PrimaryKeyTuple(Generic[AnyDObject]):
-    pass
+    __slots__ = ()
 
 def cast_attr_value(attrname, val, attr_type):
     if val is None:
@@ -37,22 +37,7 @@ def cast_attr_value(attrname, val, attr_type):
         return val
 
     try:
-        if isinstance(val, str) and issubclass(attr_type, (datetime, date)):
-
-            val = arrow.get(val).datetime
-            if issubclass(attr_type, datetime):
-                return val
-            else:
-                return val.date()
-
-        elif isinstance(val, str) and issubclass(attr_type, (Number,)):
-            val = val.strip()
-            if len(val) == 0:
-                return None
-            else:
-                return attr_type(val)
-        else:
-            return attr_type(val)
+        return _resolve_converter(attr_type)(val)
 
     except (ValueError, TypeError) as ex:
         err = "The attribute '%s' should be \'%s\' type, not '%s'"
@@ -60,6 +45,113 @@ def cast_attr_value(attrname, val, attr_type):
         raise TypeError(err).with_traceback(ex.__traceback__)
 
 
+def make_attr_caster(attrname, attr_type):
+    """
+    Make the function that casts a value into the type of attribute.
+
+    The converter of the type is resolved once here, instead of probing the
+    type on every assignment. If the type has a '__setter_filter__', it is
+    used as the caster.
+    """
+
+    if hasattr(attr_type, '__setter_filter__'):
+        return attr_type.__setter_filter__
+
+    convert = _resolve_converter(attr_type)
+
+    def cast(val):
+        if val is None or val.__class__ is attr_type:
+            return val
+
+        if hasattr(val.__class__, '__dobject_cast__'):
+            return val.__dobject_cast__(attr_type)
+
+        if isinstance(val, attr_type):
+            return val
+
+        try:
+            return convert(val)
+
+        except (ValueError, TypeError) as ex:
+            err = "The attribute '%s' should be \'%s\' type, not '%s'"
+            err %= (attrname, attr_type.__name__, type(val).__name__)
+            raise TypeError(err).with_traceback(ex.__traceback__)
+
+    return cast
+
+
+_attr_converters = {} # {attr_type: converter}
+
+def register_converter(attr_type, converter):
+    """
+    Register the converter of attribute type. The converter is called with
+    the value to be casted, which is not None and not an instance of the
+    type, and it returns the casted value or raises ValueError or TypeError.
+
+    The converter is applied to the subclasses of attr_type too. It takes
+    effect in the dobject classes declared after registering.
+    """
+
+    if not isinstance(attr_type, type):
+        errmsg = "The attribute type should be a type object, not %r"
+        errmsg %= attr_type
+        raise TypeError(errmsg)
+
+    if not callable(converter):
+        errmsg = "The converter of '%s' should be callable"
+        errmsg %= attr_type.__name__
+        raise TypeError(errmsg)
+
+    _attr_converters[attr_type] = converter
+
+
+def _resolve_converter(attr_type):
+
+    for cls in attr_type.__mro__:
+        converter = _attr_converters.get(cls)
+        if converter is not None:
+            return converter
+
+    if issubclass(attr_type, datetime):
+        return _convert_datetime
+
+    if issubclass(attr_type, date):
+        return _convert_date
+
+    if issubclass(attr_type, Number):
+        def _convert_number(val):
+            if isinstance(val, str):
+                val = val.strip()
+                if len(val) == 0:
+                    return None
+
+            return attr_type(val)
+
+        return _convert_number
+
+    return attr_type
+
+def _convert_datetime(val):
+    if not isinstance(val, str):
+        return datetime(val)
+
+    try:
+        val = datetime.fromisoformat(val)
+    except ValueError:
+        return arrow.get(val).datetime # the other formats parsed by arrow
+
+    if val.tzinfo is None:
+        val = val.replace(tzinfo=timezone.utc) # the same as arrow does
+
+    return val
+
+def _convert_date(val):
+    if not isinstance(val, str):
+        return date(val)
+
+    return _convert_datetime(val).date()
+
+
 # def pop_kwargs_attrs(arg_name, kwargs):
 #     """
 #     Parse keyword argument, get a attribues in OrderedDict,
@@ -26,3 +26,124 @@ class DefaultJSONEncoder(json.JSONEncoder):
             return obj.__json_object__()
         else:
             return super(DefaultJSONEncoder, self).default(obj)
+
+
+def dumps_fast(obj):
+    """
+    Serialize obj to JSON text like dumps(obj). The dobject and dset are
+    written by the encoder generated for their class, without building the
+    intermediate dicts of __json_object__. The other objects are given to
+    dumps.
+    """
+
+    if isinstance(obj, DSetBase):
+        return _dset_encoder(obj.__dset_item_class__)(obj)
+
+    if isinstance(obj, DObject) and hasattr(obj, '__value_vector__'):
+        return _dobject_encoder(obj.__class__)(obj)
+
+    return dumps(obj)
+
+
+_encode_str = json.encoder.encode_basestring_ascii
+_INFINITY = float('inf')
+
+# the expression writing the value {v} of the attribute type, the other
+# values, like those of a subclass, are written by dumps
+_value_exprs = {
+    str: "encode_str({v}) if {v}.__class__ is str else dumps({v})",
+    int: "int_repr({v}) if {v}.__class__ is int else dumps({v})",
+    bool: ("('true' if {v} else 'false') if {v}.__class__ is bool "
+           "else dumps({v})"),
+    float: ("float_repr({v}) if {v}.__class__ is float and -INF < {v} < INF "
+            "else dumps({v})"),
+    Decimal: ("float_repr(float({v})) if {v}.__class__ is Decimal and "
+              "{v}.is_finite() else dumps({v})"),
+    datetime.date: ("'\"' + {v}.isoformat() + '\"' if {v}.__class__ is date "
+                    "else dumps({v})"),
+    datetime.datetime: ("'\"' + {v}.isoformat() + '\"' "
+                        "if {v}.__class__ is datetime_ else dumps({v})"),
+    dsequence: ("('null' if {v}.value is None else int_repr({v}.value)) "
+                "if {v}.__class__ is dsequence else dumps({v})"),
+}
+
+_encoder_tmpl = """\
+def encode(obj):
+    values = obj.__value_vector__
+{read_stmts}\
+    return ({json_expr})
+"""
+
+def _dobject_encoder(dobj_cls):
+    """
+    Get the encoder of dobject class, which returns the JSON text of its
+    object as dumps does. It is generated once and kept in the class.
+
+    The attributes are written in the order of __json_object__, and their
+    values are formatted by the specialized expressions of their types.
+    """
+
+    encoder = dobj_cls.__dict__.get('__dobject_json_encoder__', None)
+    if encoder is not None:
+        return encoder
+
+    namespace = dict(encode_str=_encode_str, int_repr=int.__repr__,
+                     float_repr=float.__repr__, INF=_INFINITY,
+                     Decimal=Decimal, date=datetime.date,
+                     datetime_=datetime.datetime, dsequence=dsequence,
+                     dumps=dumps)
+
+    attrs = list(dobj_cls.__dobject_key__.values())
+    attrs += dobj_cls.__dobject_att__.values()
+
+    read_stmts, segments = [], []
+    for i, attr in enumerate(attrs):
+        if issubclass(attr.type, DSetBase):
+            item_cls = attr.type.__dset_item_class__
+            namespace['encode_%d' % i] = _dset_encoder(item_cls)
+            expr = "encode_%d({v})" % i
+
+        elif issubclass(attr.type, DObject):
+            namespace['encode_%d' % i] = _dobject_encoder(attr.type)
+            namespace['type_%d' % i] = attr.type
+            expr = "encode_%d({v}) if {v}.__class__ is type_%d else dumps({v})"
+            expr %= (i, i)
+
+        else:
+            expr = _value_exprs.get(attr.type, "dumps({v})")
+
+        if hasattr(attr.type, '__default_value__') or attr.default is not None:
+            read = 'getattr(obj, %r)' % attr.name # initialized lazily
+        else:
+            read = 'values[%d]' % attr.index
+
+        var = 'v%d' % i
+        read_stmts.append('    %s = %s\n' % (var, read))
+
+        prefix = ('{' if i == 0 else ', ') + _encode_str(attr.name) + ': '
+        segments.append(repr(prefix))
+        segments.append("('null' if %s is None else %s)"
+                            % (var, expr.format(v=var)))
+
+    segments.append(repr('}') if attrs else repr('{}'))
+
+    func_code = _encoder_tmpl.format(
+                        read_stmts=''.join(read_stmts),
+                        json_expr='\n            + '.join(segments))
+
+    exec(func_code, namespace)
+    encoder = namespace['encode']
+    encoder.__qualname__ = dobj_cls.__qualname__ + '.__dobject_json_encoder__'
+
+    type.__setattr__(dobj_cls, '__dobject_json_encoder__', encoder)
+    return encoder
+
+def _dset_encoder(item_cls):
+    """Get the encoder of the dset of item class, which writes a list"""
+
+    encode_item = _dobject_encoder(item_cls)
+
+    def encode(dset_obj):
+        return '[' + ', '.join(map(encode_item, dset_obj)) + ']'
+
+    return encode
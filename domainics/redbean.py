@@ -1,8 +1,10 @@
 import inspect
+from collections.abc import Mapping, Sequence
 
 from domainics.domobj.pagination import DPage
 from domainics.domobj.pagination import parse_query_range, parse_header_range
-from domainics.domobj import dset, dobject, DObject, DSet
+from domainics.domobj import dset, dobject, DObject, DSet, DSetBase
+from domainics.json import _dobject_encoder
 
 
 from domainics.pillar import _pillar_history, pillar_class
@@ -10,7 +12,7 @@ from domainics.pillar import _pillar_history, pillar_class
 from redbean.handler_argument import register_argument_getter, read_json
 from redbean.handler_response import register_response_writer
 
-from aiohttp.web import json_response
+from aiohttp.web import json_response, Response
 from redbean.json import json_dumps
 
 
@@ -74,10 +76,60 @@ def _rest_dobject_response_factory(proto, method, handler):
         return
 
     def _response(request, return_value):
+        if isinstance(return_value, DSetBase):
+            return dset_response(request, return_value)
+
         return json_response(return_value, dumps=json_dumps)
 
     return _response
 
+
+def dset_response(request, dset_obj, chunk_size=65536):
+    """
+    Make the response of a dset, whose items are encoded into the JSON list
+    one by one and written in chunks of about chunk_size bytes, instead of
+    serializing the whole dset before sending. The text is the same as
+    dumps_fast(dset_obj) writes.
+
+    The status is 200 as json_response. Only if the request asks a range of
+    items in the Range header, the status is 206 with the Content-Range of
+    the page of dset.
+    """
+
+    status, headers = 200, {}
+
+    page = getattr(dset_obj, '_page', None)
+    if (page is not None and 'Range' in request.headers and
+            (page.start or page.limit is not None)):
+        status = 206
+        headers['Content-Range'] = page.format_content_range()
+
+    # the async iterable body is written in chunked encoding, each chunk
+    # waits until the transport drains its buffer.
+    return Response(status=status, headers=headers,
+                    body=_iter_chunks(dset_obj, chunk_size),
+                    content_type='application/json', charset='utf-8')
+
+
+async def _iter_chunks(dset_obj, chunk_size):
+    encode_item = _dobject_encoder(dset_obj.__dset_item_class__)
+
+    chunk, size, sep = ['['], 1, ''
+    for item in dset_obj:
+        text = encode_item(item)
+        chunk.append(sep)
+        chunk.append(text)
+        sep = ', '
+
+        size += len(text) + 2
+        if size >= chunk_size:
+            yield ''.join(chunk).encode('utf-8')
+            chunk.clear()
+            size = 0
+
+    chunk.append(']')
+    yield ''.join(chunk).encode('utf-8')
+
 #
 #
 # def service_func_handler(proto, service_func, service_name, path_sig) :
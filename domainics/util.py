@@ -157,6 +157,55 @@ def nameddict(typename, field_names):
 
     return result
 
+class RecordTuple(tuple):
+    """
+    A tuple whose items can be accessed by field names, like sqlite3.Row.
+    The field name map is shared by the class, so that the record does not
+    carry its own dictionary.
+    """
+
+    __slots__ = ()
+
+    _fields = ()
+    _field_index = {}
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._field_index[name])
+        except KeyError:
+            errmsg = "'%s' has no field '%s'" % (self.__class__.__name__, name)
+            raise AttributeError(errmsg) from None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._field_index[key])
+
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return self._fields
+
+    def _asdict(self):
+        'Return a new OrderedDict which maps field names to their values.'
+        return _OrderedDict(zip(self._fields, self))
+
+    def __repr__(self):
+        expr = ','.join(['%s=%r' % (k, v) for k, v in zip(self._fields, self)])
+        return self.__class__.__name__ + '(' + expr + ')'
+
+def record_tuple_class(typename, field_names):
+    """Make a subclass of RecordTuple with the given field names"""
+
+    field_names = tuple(map(str, field_names))
+
+    field_index = {}
+    for i, name in enumerate(field_names):
+        field_index.setdefault(name, i) # the first one if duplicated
+
+    return type(typename, (RecordTuple,), dict(__slots__ = (),
+                                               _fields = field_names,
+                                               _field_index = field_index))
+
 from bisect import insort_left
 from bisect import bisect_left
 
@@ -92,3 +92,20 @@ async def test_recall_without_dset_key(db, module_dtables):
     ds2 = await drecall(ASet())
     assert len(ds2) == 4
     print(ds2)
+
+@pytest.mark.asyncio
+@transaction.db
+async def test_recall_identity_map(db, module_dtables):
+
+    ds1 = dset(t_b)([t_b(a=5, b=1, c=2, d=3)])
+    await dmerge(ds1)
+
+    # each call of drecall makes a block of the transaction, the identity
+    # map is bound to the transaction, and serves the second recall.
+    r1 = await drecall(t_b(a=5, b=1))
+    r2 = await drecall(t_b(a=5, b=1))
+    assert r1.c == 2 and r2 is r1
+
+    r1.c = 20 # changed, the recalled values are served in another object
+    r3 = await drecall(t_b(a=5, b=1))
+    assert r3 is not r1 and r3.c == 2
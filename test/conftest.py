@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+try:
+    import sqlblock.asyncpg
+except ImportError:
+    # The asyncdb tests require the sqlblock of asyncpg and a postgres server
+    collect_ignore = ['asyncdb']
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from importlib import import_module
+from types import SimpleNamespace
+
+from domainics.db import dtable, datt
+from domainics.domobj import dset
+from domainics.db.dmerge import _dtable_diff, _dtable_changes, dmerge
+
+dmerge_module = import_module('domainics.db.dmerge')
+
+
+def setup_module(module):
+    print()
+
+
+class t_item(dtable):
+    sn = datt(int)
+    name = datt(str)
+    qty = datt(int)
+
+    __dobject_key__ = [sn]
+
+
+def test_dtable_diff():
+
+    past = dset(t_item)(t_item(sn=i, name='n%d' % i, qty=i) for i in range(5))
+
+    current = dset(t_item)(past)
+    del current[t_item(sn=0)]
+    current._add(t_item(sn=2, name='n2', qty=20))
+    current._add(t_item(sn=7, name='n7', qty=7))
+
+    dins, dchg, ddel = _dtable_diff(current, past)
+
+    assert dins.pkey_values == [(7,)]
+    assert dins.values == [('n7', 7)]
+    assert ddel.pkey_values == [(0,)]
+    assert dchg.pkey_values == [(2,)]
+    assert dchg.values == [dict(qty=(20, 2))]
+
+
+def test_dtable_changes():
+
+    current = dset(t_item)(t_item(sn=i, name='n%d' % i, qty=i)
+                            for i in range(5))
+    current._track_changes()
+
+    del current[t_item(sn=0)]
+    current._add(t_item(sn=2, name='n2', qty=20))
+    current._add(t_item(sn=7, name='n7', qty=7))
+    current[t_item(sn=3)].name = 'x'
+
+    dins, dchg, ddel = _dtable_changes(current)
+
+    assert dins.pkey_values == [(7,)]
+    assert dins.values == [('n7', 7)]
+    assert ddel.pkey_values == [(0,)]
+    assert dchg.pkey_values == [(2,), (3,)]
+    assert dchg.values == [dict(qty=(20, 2)), dict(name=('x', 'n3'))]
+
+    # the same delta as diffing with the saved one
+    past = dset(t_item)(t_item(sn=i, name='n%d' % i, qty=i) for i in range(5))
+    assert _dtable_diff(current, past) == (dins, dchg, ddel)
+
+    item = t_item(sn=1, name='a', qty=1)._track_changes()
+    item.qty = 2
+    dins, dchg, ddel = _dtable_changes(item)
+    assert not dins.values and not ddel.pkey_values
+    assert dchg.pkey_values == [(1,)] and dchg.values == [dict(qty=(2, 1))]
+
+
+def test_dtable_diff_snapshot():
+
+    current = dset(t_item)(t_item(sn=i, name='n%d' % i, qty=i)
+                            for i in range(5))
+    past = current._snapshot()
+
+    del current[t_item(sn=0)]
+    current[t_item(sn=2)].qty = 20
+    current._add(t_item(sn=7, name='n7', qty=7))
+
+    dins, dchg, ddel = _dtable_diff(current, past)
+
+    assert dins.pkey_values == [(7,)]
+    assert dins.values == [('n7', 7)]
+    assert ddel.pkey_values == [(0,)]
+    assert dchg.pkey_values == [(2,)]
+    assert dchg.values == [dict(qty=(20, 2))]
+
+
+def test_dmerge_tracked_unsupported_dbms(monkeypatch):
+
+    monkeypatch.setattr(dmerge_module, 'dbc', SimpleNamespace(dbms='sqlite'))
+
+    current = dset(t_item)(t_item(sn=i, name='n%d' % i, qty=i)
+                            for i in range(3))
+    current._track_changes()
+    current._add(t_item(sn=7, name='n7', qty=7))
+
+    with pytest.raises(NotImplementedError):
+        dmerge(current)
+
+    # the changes are kept to be merged later
+    dins, dchg, ddel = _dtable_changes(current)
+    assert dins.pkey_values == [(7,)]
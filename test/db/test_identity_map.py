@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+from domainics.db import dtable, datt, dsequence
+from domainics.db import identity
+from domainics.db.identity import DIdentityMap, _bound_identity_map
+
+
+def setup_module(module):
+    print()
+
+
+class t_item(dtable):
+    sn = datt(int)
+    name = datt(str)
+
+    __dobject_key__ = [sn]
+
+
+class t_seq(dtable):
+    sn = datt(dsequence)
+    name = datt(str)
+
+    __dobject_key__ = [sn]
+
+
+def test_identity_map():
+
+    identity_map = DIdentityMap()
+    assert identity_map.get(t_item, (1, )) is None
+
+    obj = t_item(sn=1, name='a')
+    identity_map.put(obj)
+    assert identity_map.get(t_item, (1, )) is obj
+    assert identity_map.get(t_item, t_item(sn=1).__dobject_key__) is obj
+
+    # the changed object is not served, but the recalled values
+    obj.name = 'b'
+    origin = identity_map.get(t_item, (1, ))
+    assert origin is not obj and origin.name == 'a'
+    assert identity_map.get(t_item, (1, )) is origin
+
+    identity_map.discard(t_item, [(1, )])
+    assert identity_map.get(t_item, (1, )) is None
+
+
+def test_identity_map_discard_table():
+
+    # named as the table, the cached class is not changed
+    t_name = t_item._re('sn', 'name', _name='t_item')
+    assert t_name is not t_item
+
+    identity_map = DIdentityMap()
+    identity_map.put(t_item(sn=1, name='a'))
+    identity_map.put(t_name(sn=1, name='a'))
+    identity_map.put(t_item(sn=2, name='b'))
+    assert len(identity_map) == 3
+
+    identity_map.discard(t_item, [(1, )])
+    assert len(identity_map) == 1
+    assert identity_map.get(t_item, (2, )).name == 'b'
+
+
+def test_identity_map_limit():
+
+    identity_map = DIdentityMap(limit=2)
+    for i in range(3):
+        identity_map.put(t_item(sn=i))
+        identity_map.get(t_item, (0, )) # the recently used
+
+    assert identity_map.get(t_item, (0, )) is not None
+    assert identity_map.get(t_item, (1, )) is None
+    assert identity_map.get(t_item, (2, )) is not None
+
+    identity_map = DIdentityMap(limit=0)
+    identity_map.put(t_item(sn=1))
+    assert len(identity_map) == 0
+
+
+def test_identity_map_sequence():
+
+    identity_map = DIdentityMap()
+    obj = t_seq(sn=dsequence(5), name='a')
+    identity_map.put(obj)
+    assert identity_map.get(t_seq, (5, )) is obj
+    assert identity_map.get(t_seq, (dsequence(5), )) is obj
+
+    identity_map.put(t_seq(sn=dsequence(), name='b')) # unallocated
+    assert len(identity_map) == 1
+
+
+def test_identity_map_bound_to_outermost_block():
+
+    class Block: # a block of each call, sharing its parent's connection
+        def __init__(self, parent=None):
+            self._parent_sqlblk = parent
+
+    top = Block()
+    inner1, inner2 = Block(top), Block(Block(top))
+
+    identity_map = _bound_identity_map(inner1)
+    assert identity_map is not None
+    assert _bound_identity_map(inner2) is identity_map
+    assert _bound_identity_map(top) is identity_map
+    assert _bound_identity_map(Block()) is not identity_map
+    assert identity_map.limit == 4096
+
+
+def test_identity_map_bound_options(monkeypatch):
+
+    class Block: # the names of other version of sqlblock
+        def __init__(self, parent=None, autocommit=False):
+            self._parent = parent
+            self._autocommit = autocommit
+
+    top = Block()
+    assert _bound_identity_map(Block(Block(top))) is _bound_identity_map(top)
+
+    # no map in autocommit mode, even for the inner blocks
+    assert _bound_identity_map(Block(Block(autocommit=True))) is None
+
+    class Plain: # without any attribute of parent
+        pass
+
+    assert _bound_identity_map(Plain()) is not None
+
+    # the blocks referring to each other
+    a, b = Block(), Block()
+    a._parent, b._parent = b, a
+    assert _bound_identity_map(a) is not None
+
+    monkeypatch.setattr(identity, '_bound_limit', identity._bound_limit)
+    identity.set_identity_limit(2)
+    assert _bound_identity_map(Block()).limit == 2
+
+    identity.set_identity_limit(0)
+    assert _bound_identity_map(Block()) is None
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from domainics.db import dtable, datt
+from domainics.db.sqlblock import make_record_dtable
+
+
+def setup_module(module):
+    print()
+
+
+class FakeCursor(list):
+    """A cursor holding the rows of query result"""
+
+    def __init__(self, colnames, rows):
+        super().__init__(rows)
+        self.description = tuple((n, None, None, None, None, None, None)
+                                    for n in colnames)
+
+
+class t_item(dtable):
+    sn = datt(int)
+    name = datt(str)
+    qty = datt(int)
+
+    __dobject_key__ = [sn]
+
+
+def test_record_dtable():
+
+    record_type = make_record_dtable(t_item)
+
+    cursor = FakeCursor(['name', 'sn', 'memo'], [('a', 1, 'x'), ('b', 2, 'y')])
+    objs = list(record_type(cursor))
+    assert all(isinstance(obj, t_item) for obj in objs)
+    assert objs[0].sn == 1 and objs[0].name == 'a' and objs[0].qty is None
+    assert objs[1].sn == 2 and objs[1].name == 'b'
+
+    cursor = FakeCursor(['name', 'sn', 'memo'], [('c', 3, 'z')])
+    objs = list(record_type(cursor))
+    assert objs[0].sn == 3 and objs[0].name == 'c'
+    assert len(t_item.__dobject_row_loaders__) == 1 # the same shape
+
+    cursor = FakeCursor(['sn', 'qty'], [(4, 10)])
+    objs = list(record_type(cursor))
+    assert objs[0].sn == 4 and objs[0].qty == 10
+    assert len(t_item.__dobject_row_loaders__) == 2
+
+
+def test_record_class_cache():
+    from domainics.db.sqlblock import record_namedtuple, record_plainobj
+    from domainics.db.sqlblock import record_dict
+
+    cursor = FakeCursor(['sn', 'name'], [(1, 'a'), (2, 'b')])
+    rows1 = list(record_namedtuple(cursor))
+    rows2 = list(record_namedtuple(FakeCursor(['sn', 'name'], [(3, 'c')])))
+    assert rows1[1].name == 'b' and rows2[0].sn == 3
+    assert rows1[0].__class__ is rows2[0].__class__
+
+    rows1 = list(record_plainobj(cursor))
+    rows2 = list(record_plainobj(FakeCursor(['sn', 'name'], [(3, 'c')])))
+    assert rows1[1].name == 'b' and rows2[0].sn == 3
+    assert rows1[0].__class__ is rows2[0].__class__
+
+    rows = list(record_dict(cursor))
+    assert rows[1] == dict(sn=2, name='b')
+
+
+def test_record_tuple():
+    from domainics.db.sqlblock import record_tuple
+
+    cursor = FakeCursor(['sn', 'name'], [(1, 'a'), (2, 'b')])
+    rows = list(record_tuple(cursor))
+    assert rows[0] == (1, 'a') and rows[1].name == 'b' and rows[1]['sn'] == 2
+    assert rows[0][-1] == 'a' and tuple(rows[1].keys()) == ('sn', 'name')
+    assert rows[0]._asdict() == dict(sn=1, name='a')
+    assert not hasattr(rows[0], '__dict__')
+    assert rows[0].__class__ is rows[1].__class__
+
+    row = t_item(rows[1]) # read the values by names
+    assert row.sn == 2 and row.name == 'b'
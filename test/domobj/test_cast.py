@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, register_converter
+
+from decimal import Decimal
+from datetime import datetime, date, timezone
+
+def setup_module(module):
+    print()
+
+
+def test_cast_value():
+
+    class A(dobject):
+        a = datt(int)
+        b = datt(Decimal)
+        c = datt(datetime)
+        d = datt(date)
+
+    a = A(a=' 12 ', b='1.5', c='2015-07-29T10:11:12+08:00', d='2015-07-29')
+    assert a.a == 12 and a.b == Decimal('1.5')
+    assert a.c.isoformat() == '2015-07-29T10:11:12+08:00'
+    assert a.d == date(2015, 7, 29)
+
+    a.a = ''
+    assert a.a is None
+
+    a.c = '2015-07-29 10:11' # the naive time is in UTC, like arrow
+    assert a.c == datetime(2015, 7, 29, 10, 11, tzinfo=timezone.utc)
+
+    a.c = '2015-07-29T10:11:12.123+0800' # parsed by arrow
+    assert a.c.isoformat() == '2015-07-29T10:11:12.123000+08:00'
+
+    with pytest.raises(TypeError):
+        a.a = 'abc'
+
+    with pytest.raises(TypeError):
+        a.d = 'abc'
+
+
+def test_register_converter():
+
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    def parse_point(val):
+        x, y = val.split(',')
+        return Point(int(x), int(y))
+
+    register_converter(Point, parse_point)
+
+    class A(dobject):
+        p = datt(Point)
+
+    a = A(p='1,2')
+    assert isinstance(a.p, Point) and a.p.x == 1 and a.p.y == 2
+
+    p = Point(3, 4)
+    a.p = p
+    assert a.p is p
+
+    with pytest.raises(TypeError):
+        a.p = 'abc'
+
+    with pytest.raises(TypeError):
+        register_converter('Point', parse_point)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class A(dobject):
+    a = datt(int)
+    b = datt(str)
+    c = datt(int, default=5)
+    __dobject_key__ = [a]
+
+
+def test_dobject_changes():
+
+    obj = A(a=1, b='x')
+    assert obj._changes() is None
+
+    obj.b = 'y' # not tracked yet
+    obj._track_changes()
+    assert obj._changes() == {}
+
+    obj.b = 'z'
+    obj.c = 6
+    obj.b = 'w'
+    assert list(obj._changes().items()) == [('b', ('w', 'y')), ('c', (6, 5))]
+
+    obj.c = 5 # set back to the original
+    assert list(obj._changes().items()) == [('b', ('w', 'y'))]
+
+    obj._track_changes() # restarted
+    assert obj._changes() == {}
+
+    # the clone is not tracked
+    assert A(obj)._changes() is None
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_dset_changes(columnar):
+
+    ds = dset(A, _columnar=columnar)(A(a=i, b='n%d' % i) for i in range(5))
+    assert ds._changes() is None
+
+    ds._track_changes()
+    assert ds._changes() == ([], [], [])
+
+    del ds[A(a=0)]
+    del ds[A(a=1)]
+    ds._add(A(a=1, b='n1', c=10))     # removed and added again
+    ds._add(A(a=2, b='x'))            # replaced
+    ds._add(A(a=8, b='n8'))
+    ds._add(A(a=9, b='n9'))
+    del ds[A(a=9)]                    # never saved
+
+    inserted, changed, deleted = ds._changes()
+    assert [item.a for item in inserted] == [8]
+    assert deleted == [(0, )]
+    assert [(key.a, dict(modified)) for key, modified in changed] == [
+                (1, dict(c=(10, 5))), (2, dict(b=('x', 'n2')))]
+
+    ds._track_changes()
+    assert ds._changes() == ([], [], [])
+
+
+def test_dset_changes_in_place():
+
+    class B(dobject):
+        sn = datt(int)
+        items = datt(dset(A))
+        __dobject_key__ = [sn]
+
+    obj = B(sn=1, items=[A(a=i, b='n%d' % i) for i in range(3)])
+    obj.items._track_changes()
+
+    obj.items[A(a=1)].b = 'x'
+    item = obj.items[A(a=2)]
+    item.b = 'y'
+    del obj.items[item]
+    assert obj.items._changes() == ([], [((1, ), dict(b=('x', 'n1')))],
+                                    [(2, )])
+
+    # the items set to the attribute replace all of them
+    obj.items = [A(a=0, b='n0'), A(a=2, b='n2'), A(a=3)]
+    inserted, changed, deleted = obj.items._changes()
+    assert [item.a for item in inserted] == [3]
+    assert changed == [] and deleted == [(1, )]
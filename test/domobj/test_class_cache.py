@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import weakref
+
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Item(dobject):
+    order_no = datt(int)
+    sn = datt(int)
+    qty = datt(int)
+    __dobject_key__ = [order_no, sn]
+
+
+class Order(dobject):
+    no = datt(int)
+    items = datt(dset(Item, no='order_no'))
+    __dobject_key__ = [no]
+
+
+def test_dset_class_cache():
+
+    assert dset(Item) is dset(Item)
+    assert dset(Item, _index='qty') is dset(Item, _index=['qty'])
+    assert dset(Item, _sortable='-qty') is dset(Item, _sortable='-qty')
+    assert dset(Item, _columnar=True) is not dset(Item)
+    assert dset(Item, _sortable='+qty') is not dset(Item, _sortable='-qty')
+
+    assert dset(Item, _key=Order.no, no='order_no') is Order.items.type
+    assert dset(Item, _key=Order.no) is not Order.items.type
+    assert dset(Item, _key=Order.no).__dset_links__ == {}
+
+
+def test_reshape_class_cache():
+
+    assert Item._re('sn', 'qty') is Item._re('qty', Item.sn)
+    assert Item._re('sn', 'qty') is not Item._re('sn')
+    assert (Item._re(_subst=dict(order_no='no')) is
+                Item._re(_subst=dict(order_no='no')))
+
+    ds = dset(Item)(Item(order_no=1, sn=i, qty=i % 2) for i in range(4))
+    agg1 = ds._group_by('qty').agg(n=('count', ))
+    agg2 = ds._group_by('qty').agg(n=('count', ))
+    assert agg1.__class__ is agg2.__class__
+
+
+def test_class_cache_by_module():
+
+    namespace = dict(__name__='other_module', Item=Item, dset=dset)
+    exec("reshaped = Item._re('sn', 'qty')\n"
+         "item_dset = dset(Item)", namespace)
+
+    assert namespace['reshaped'].__module__ == 'other_module'
+    assert namespace['reshaped'] is not Item._re('sn', 'qty')
+    assert Item._re('sn', 'qty').__module__ == __name__
+
+    assert namespace['item_dset'].__module__ == 'other_module'
+    assert namespace['item_dset'] is not dset(Item)
+
+
+def test_cache_dropped_with_class():
+
+    class A(dobject):
+        a = datt(int)
+        __dobject_key__ = [a]
+
+    assert dset(A) is dset(A) and A._re('a') is A._re('a')
+
+    ref = weakref.ref(A)
+    del A
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from array import array
+from decimal import Decimal
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Item(dobject):
+    sn = datt(int)
+    name = datt(str)
+    qty = datt(int)
+    price = datt(float)
+
+    __dobject_key__ = [sn]
+
+
+def test_columnar_items():
+
+    ds = dset(Item, _columnar=True)()
+    for i in range(5):
+        ds._add(Item(sn=i, name='n%d' % i, qty=i * 10, price=i / 2))
+
+    assert len(ds) == 5
+    assert isinstance(ds.__dset_columns__[Item.qty.index], array)
+    assert isinstance(ds.__dset_columns__[Item.name.index], list)
+
+    assert ds[2] == Item(sn=2, name='n2', qty=20, price=1.0)
+    assert ds[Item(sn=3)].name == 'n3'
+    assert [item.sn for item in ds] == [0, 1, 2, 3, 4]
+
+    ds._add(dict(sn=2, name='x', qty=1, price=0.5)) # replaced in place
+    assert [item.name for item in ds] == ['n0', 'n1', 'x', 'n3', 'n4']
+
+    del ds[1]
+    assert [item.sn for item in ds] == [0, 2, 3, 4]
+    assert ds[Item(sn=4)].qty == 40
+    assert ds[1].name == 'x'
+
+    ds[Item(sn=3)] = Item(sn=3, name='y', qty=3)
+    assert ds[Item(sn=3)].price is None
+
+    # the materialized item is a copy
+    item = ds[0]
+    item.qty = 1000
+    assert ds[0].qty == 0
+
+    expected = dset(Item)(ds)
+    assert ds.__json_object__() == expected.__json_object__()
+
+    ds._clear()
+    assert len(ds) == 0 and list(ds) == []
+
+
+def test_column_values():
+
+    ds = dset(Item, _columnar=True)(Item(sn=i, qty=i) for i in range(4))
+
+    values = ds._column('qty')
+    assert list(values) == [0, 1, 2, 3]
+
+    # None can not be kept in array, the column turns into list
+    ds._add(Item(sn=9, price=None, qty=None))
+    assert isinstance(ds.__dset_columns__[Item.qty.index], list)
+    assert ds._column('qty') == [0, 1, 2, 3, None]
+
+    with pytest.raises(AttributeError):
+        ds._column('nothing')
+
+
+def test_columnar_attribute():
+
+    class Line(dobject):
+        bill_sn = datt(int)
+        line_no = datt(int)
+        qty = datt(int)
+        __dobject_key__ = [bill_sn, line_no]
+
+    class Bill(dobject):
+        sn = datt(int)
+        lines = datt(dset(Line, sn='bill_sn', _columnar=True))
+        __dobject_key__ = [sn]
+
+    bill = Bill(sn=1, lines=[Line(line_no=1, qty=2), dict(line_no=2, qty=3)])
+    assert bill.lines.__class__.__dset_item_names__ == ('bill_sn', 'line_no',
+                                                        'qty')
+    assert [(l.bill_sn, l.qty) for l in bill.lines] == [(1, 2), (1, 3)]
+
+
+def test_columnar_from_rows():
+
+    ItemSet = dset(Item, _columnar=True)
+    rows = [(i, Decimal(i)) for i in range(3)]
+    ds = ItemSet._from_rows(('sn', 'price'), rows, trusted=False)
+
+    assert ds._column('sn') is not None
+    assert [item.price for item in ds] == [0.0, 1.0, 2.0]
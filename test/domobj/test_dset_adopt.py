@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Item(dobject):
+    order_no = datt(int)
+    sn = datt(int)
+    qty = datt(int)
+    __dobject_key__ = [order_no, sn]
+
+
+class Order(dobject):
+    no = datt(int)
+    items = datt(dset(Item, no='order_no'))
+    __dobject_key__ = [no]
+
+
+def test_adopt_items():
+
+    ds = dset(Item)()
+
+    item = Item(order_no=1, sn=1, qty=1)
+    ds._add(item)
+    assert ds[0] is not item # cloned by default
+
+    ds._add(item, adopt=True)
+    assert ds[0] is item and len(ds) == 1
+
+    ds._add(dict(order_no=1, sn=2), adopt=True) # not an item, cloned
+    assert ds[1].sn == 2
+
+    order = Order(no=1)
+    item = Item(order_no=1, sn=3)
+    order.items._add(item, adopt=True)
+    assert order.items[0] is item
+
+    item = Item(order_no=9, sn=4) # its order_no is substituted
+    order.items._add(item, adopt=True)
+    assert order.items[1] is not item and order.items[1].order_no == 1
+
+
+def test_extend():
+
+    order = Order(no=1)
+    items = [Item(sn=i, qty=i) for i in range(5)]
+
+    order.items._extend(items)
+    assert [(o.order_no, o.sn) for o in order.items] == [
+                (1, 0), (1, 1), (1, 2), (1, 3), (1, 4)]
+    assert all(o is not i for o, i in zip(order.items, items))
+
+    order.items._extend([Item(order_no=1, sn=0, qty=9), Item(sn=5)])
+    assert [o.qty for o in order.items] == [9, 1, 2, 3, 4, None]
+
+    ds = dset(Item)()
+    ds._extend(items, adopt=True)
+    assert all(o is i for o, i in zip(ds, items))
+
+    # the added items are kept when a later one fails
+    with pytest.raises(TypeError):
+        ds += [Item(order_no=2, sn=0), dict(order_no=2, sn='x')]
+
+    assert len(ds) == 6 and ds[-1].order_no == 2
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class B(dobject):
+    x = datt(int)
+    y = datt(int)
+    __dobject_key__ = [x]
+
+
+def make(*xs):
+    return dset(B)(B(x=x, y=x * 10) for x in xs)
+
+
+def test_contains():
+
+    ds = make(1, 2, 3)
+
+    assert B(x=2) in ds
+    assert dict(x=3) in ds
+    assert B(x=4) not in ds
+    assert dict(y=1) not in ds
+    assert 1 not in ds
+    assert (2, ) not in ds and 'x' not in ds and None not in ds
+
+    class C(dobject): # without the key attribute x
+        z = datt(int)
+        __dobject_key__ = [z]
+
+    assert C(z=2) not in ds
+
+
+def test_equal():
+
+    assert make(1, 2, 3) == make(3, 2, 1)
+    assert make(1, 2) != make(1, 2, 3)
+    assert make(1, 2) == [B(x=1), B(x=2)]
+    assert make(1, 2) != (B(x=2), B(x=1))
+    assert make(1) != 1
+
+
+def test_algebra():
+
+    ds1 = make(1, 2, 3, 4)
+    ds2 = make(3, 4, 5)
+    ds2._add(B(x=4, y=0))
+
+    union = ds1 | ds2
+    assert [b.x for b in union] == [1, 2, 3, 4, 5]
+    assert union[B(x=4)].y == 40 # keep the item of the left one
+
+    assert [b.x for b in ds1 & ds2] == [3, 4]
+    assert [b.x for b in ds1 - ds2] == [1, 2]
+    assert [b.x for b in ds1 ^ ds2] == [1, 2, 5]
+
+    assert [b.x for b in ds1._difference([dict(x=1), B(x=3)])] == [2, 4]
+    assert [b.x for b in ds1._union([dict(x=9)])] == [1, 2, 3, 4, 9]
+
+    assert len(ds1) == 4 and len(ds2) == 3 # unchanged
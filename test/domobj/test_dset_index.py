@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+from domainics.domobj.pagination import DPage
+
+
+def setup_module(module):
+    print()
+
+
+class B(dobject):
+    x = datt(int)
+    y = datt(int)
+    __dobject_key__ = [x]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_position_index(columnar):
+
+    ds = dset(B, _columnar=columnar)(B(x=i, y=i * 10) for i in range(6))
+
+    assert [ds[i].x for i in range(len(ds))] == [0, 1, 2, 3, 4, 5]
+    assert ds[-1].x == 5
+
+    del ds[B(x=2)]
+    assert [ds[i].x for i in range(len(ds))] == [0, 1, 3, 4, 5]
+
+    del ds[4]     # the last one
+    ds._add(B(x=9, y=90))
+    ds._add(B(x=1, y=11)) # replaced in place
+    assert [(ds[i].x, ds[i].y) for i in range(len(ds))] == [
+                (0, 0), (1, 11), (3, 30), (4, 40), (9, 90)]
+
+    with pytest.raises(IndexError):
+        ds[5]
+
+    ds._clear()
+    with pytest.raises(IndexError):
+        ds[0]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_slice_and_page(columnar):
+
+    class A(dobject):
+        a = datt(int)
+        bs = datt(dset(B, _columnar=columnar))
+        __dobject_key__ = [a]
+
+    obj = A(a=1, bs=[B(x=i, y=i) for i in range(10)])
+
+    part = obj.bs[2:5]
+    assert part.__class__ is obj.bs.__class__
+    assert part.__dominion_object__ is obj
+    assert [item.x for item in part] == [2, 3, 4]
+    assert [item.x for item in obj.bs[::4]] == [0, 4, 8]
+
+    page = obj.bs._paginate(DPage(start=8, limit=5))
+    assert [item.x for item in page] == [8, 9]
+    assert page._page.start == 8 and page._page.total == 10
+    assert page._page.format_content_range() == 'items=8-9/10'
+    assert DPage(limit=5).format_content_range() == 'items=0-4/*'
+    assert DPage(start=3).format_content_range() == 'items=3-/*'
+
+    page = obj.bs._paginate(DPage(start=10, limit=5)) # beyond the last
+    assert len(page) == 0 and page._page.total == 10
+    assert page._page.format_content_range() == 'items=*/10'
+
+    page = obj.bs._paginate(DPage(start=2))
+    assert page._page.format_content_range() == 'items=2-9/10'
+
+    page = obj.bs._paginate(DPage())
+    assert len(page) == 10
+
+    with pytest.raises(TypeError):
+        obj.bs._paginate((0, 5))
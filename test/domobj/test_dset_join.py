@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Line(dobject):
+    sn = datt(int)
+    product_id = datt(int)
+    qty = datt(int)
+    __dobject_key__ = [sn]
+
+
+class Product(dobject):
+    product_id = datt(int)
+    name = datt(str)
+    qty = datt(int) # the stock, shadowed by Line.qty
+    __dobject_key__ = [product_id]
+
+
+def make_lines(columnar=False):
+    rows = [(1, 10, 1), (2, 20, 2), (3, 10, 3), (4, 30, 4), (5, None, 5)]
+    return dset(Line, _columnar=columnar)._from_rows(
+                        ('sn', 'product_id', 'qty'), rows)
+
+
+def make_products(columnar=False):
+    rows = [(10, 'a', 100), (20, 'b', 200), (40, 'd', 400)]
+    return dset(Product, _columnar=columnar)._from_rows(
+                        ('product_id', 'name', 'qty'), rows)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_inner_join(columnar):
+
+    ds = make_lines(columnar)._join(make_products(columnar), on='product_id')
+
+    item_cls = ds.__dset_item_class__
+    assert list(item_cls.__dobject_key__) == ['sn']
+    assert list(item_cls.__dobject_att__) == ['product_id', 'qty', 'name']
+
+    assert [(o.sn, o.product_id, o.qty, o.name) for o in ds] == [
+                (1, 10, 1, 'a'), (2, 20, 2, 'b'), (3, 10, 3, 'a')]
+
+    # the attributes of combined class are not taken away from Product
+    assert Product.name.owner_class is Product
+    assert Product(product_id=1, name='x').name == 'x'
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_left_join(columnar):
+
+    lines, products = make_lines(columnar), make_products(columnar)
+
+    # hash table on the smaller products
+    ds = lines._join(products, on=Line.product_id, how='left')
+    assert [(o.sn, o.name) for o in ds] == [
+                (1, 'a'), (2, 'b'), (3, 'a'), (4, None), (5, None)]
+
+    # hash table on the smaller lines
+    ds = lines[:2]._join(products, on=['product_id'], how='left')
+    assert [(o.sn, o.name) for o in ds] == [(1, 'a'), (2, 'b')]
+
+    ds = dset(Line)()._join(products, on='product_id', how='left')
+    assert len(ds) == 0
+
+
+def test_join_many_to_many():
+
+    class Tag(dobject):
+        tag_sn = datt(int)
+        product_id = datt(int)
+        label = datt(str)
+        __dobject_key__ = [tag_sn]
+
+    tags = dset(Tag)._from_rows(('tag_sn', 'product_id', 'label'),
+                                [(1, 10, 'x'), (2, 10, 'y'), (3, 20, 'z')])
+    lines = make_lines()
+
+    ds = lines._join(tags, on='product_id')
+    assert list(ds.__dset_item_class__.__dobject_key__) == ['sn', 'tag_sn']
+    assert [(o.sn, o.label) for o in ds] == [
+                (1, 'x'), (1, 'y'), (2, 'z'), (3, 'x'), (3, 'y')]
+
+    ds = tags._join(lines, on='product_id')
+    assert [(o.tag_sn, o.sn) for o in ds] == [
+                (1, 1), (1, 3), (2, 1), (2, 3), (3, 2)]
+
+
+def test_join_same_key_name():
+
+    class Order(dobject):
+        id = datt(int)
+        pid = datt(int)
+        qty = datt(int)
+        __dobject_key__ = [id]
+
+    class Tier(dobject):
+        id = datt(int)
+        pid = datt(int)
+        rate = datt(int)
+        __dobject_key__ = [id]
+
+    orders = dset(Order)._from_rows(('id', 'pid', 'qty'),
+                                    [(1, 10, 5), (2, 20, 6)])
+    tiers = dset(Tier)._from_rows(('id', 'pid', 'rate'),
+                                  [(1, 10, 3), (2, 10, 4), (3, 20, 7)])
+
+    ds = orders._join(tiers, on='pid')
+    item_cls = ds.__dset_item_class__
+    assert list(item_cls.__dobject_key__) == ['id', 'tier_id']
+    assert [(o.id, o.tier_id, o.pid, o.qty, o.rate) for o in ds] == [
+                (1, 1, 10, 5, 3), (1, 2, 10, 5, 4), (2, 3, 20, 6, 7)]
+
+    # joined on the key, the key is the same in both
+    ds = orders._join(tiers, on='id')
+    assert list(ds.__dset_item_class__.__dobject_key__) == ['id']
+    assert [(o.id, o.pid, o.rate) for o in ds] == [(1, 10, 3), (2, 20, 4)]
+
+    class Tier2(dobject):
+        id = datt(int)
+        pid = datt(int)
+        tier2_id = datt(int)
+        __dobject_key__ = [id]
+
+    with pytest.raises(ValueError, match='tier2_id'):
+        orders._join(dset(Tier2)(), on='pid')
+
+
+def test_join_errors():
+
+    lines, products = make_lines(), make_products()
+
+    with pytest.raises(ValueError):
+        lines._join(products, on='name')
+
+    with pytest.raises(ValueError):
+        lines._join(products, on='product_id', how='outer')
+
+    with pytest.raises(TypeError):
+        lines._join(list(products), on='product_id')
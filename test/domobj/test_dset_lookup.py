@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Line(dobject):
+    no = datt(int)
+    sku = datt(str)
+    qty = datt(int)
+    __dobject_key__ = [no]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_declared_index(columnar):
+
+    LineSet = dset(Line, _index=['sku', (Line.sku, 'qty')], _columnar=columnar)
+    assert LineSet.__dset_index_names__ == (('sku',), ('sku', 'qty'))
+
+    ds = LineSet(Line(no=i, sku='s%d' % (i % 3), qty=i % 2) for i in range(9))
+
+    assert [l.no for l in ds._lookup(sku='s1')] == [1, 4, 7]
+    assert [l.no for l in ds._lookup(sku='s1', qty='0')] == [4]
+    assert len(ds._lookup(sku='none')) == 0
+
+    ds._add(Line(no=4, sku='s2', qty=0))     # moved to another value
+    del ds[Line(no=7)]
+    ds[Line(no=10)] = Line(no=10, sku='s1')
+    assert [l.no for l in ds._lookup(sku='s1')] == [1, 10]
+    assert [l.no for l in ds._lookup(sku='s2')] == [2, 5, 8, 4]
+
+    ds._clear()
+    assert len(ds._lookup(sku='s1')) == 0
+    ds._add(Line(no=1, sku='s1'))
+    assert [l.no for l in ds._lookup(sku='s1')] == [1]
+
+
+def test_created_index():
+
+    ds = dset(Line)(Line(no=i, sku='s%d' % (i % 2), qty=i) for i in range(6))
+
+    assert [l.no for l in ds._lookup(qty=3)] == [3] # scanned
+
+    ds._create_index('sku')
+    assert ('sku',) in ds.__dset_indexes__
+    assert [l.no for l in ds._lookup(sku='s0')] == [0, 2, 4]
+
+    with pytest.raises(ValueError):
+        ds._create_index('nothing')
+
+    with pytest.raises(ValueError):
+        ds._lookup(nothing=1)
+
+
+def test_index_of_attribute():
+
+    class Order(dobject):
+        sn = datt(int)
+        lines = datt(dset(Line, _index='sku'))
+        __dobject_key__ = [sn]
+
+    order = Order(sn=1, lines=[dict(no=1, sku='a'), dict(no=2, sku='b')])
+    assert [l.no for l in order.lines._lookup(sku='b')] == [2]
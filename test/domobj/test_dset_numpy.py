@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from importlib import import_module
+from domainics.domobj import dobject, datt, dset, dcol
+
+dset_module = import_module('domainics.domobj.dset')
+dquery_module = import_module('domainics.domobj.dquery')
+
+numpy = pytest.importorskip('numpy')
+
+
+def setup_module(module):
+    print()
+
+
+class Sale(dobject):
+    sn = datt(int)
+    cat = datt(str)
+    qty = datt(int)
+    price = datt(float)
+    __dobject_key__ = [sn]
+
+
+def make_sales(columnar=False):
+    values = [(1, 'a', 3, 1.5), (2, 'b', -5, 2.0), (3, 'a', 1, 0.25),
+              (4, 'c', -2 ** 63, 4.0), (5, 'b', 2 ** 63 - 1, 0.5),
+              (6, 'a', 3, 1.0), (7, 'c', 0, -1.0)]
+
+    return dset(Sale, _columnar=columnar)(
+                    Sale(sn=sn, cat=cat, qty=qty, price=price)
+                        for sn, cat, qty, price in values)
+
+
+def pure_python(monkeypatch, func):
+    """Call func without numpy, as it is not installed"""
+
+    with monkeypatch.context() as m:
+        m.setattr(dset_module, 'numpy', None)
+        m.setattr(dquery_module, 'numpy', None)
+        return func()
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_numpy_column(columnar):
+
+    ds = make_sales(columnar)
+    assert isinstance(ds._column('qty'), numpy.ndarray)
+    assert isinstance(ds._column('price'), numpy.ndarray)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('sortable', ['-qty', '+qty', '-price,+sn',
+                                      '+cat,-qty', '-sn', '+price'])
+def test_numpy_order_by(monkeypatch, columnar, sortable):
+
+    ds = make_sales(columnar)
+
+    def sort():
+        return [s.sn for s in ds._order_by(sortable)]
+
+    assert sort() == pure_python(monkeypatch, sort)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_numpy_order_by_extremes(columnar):
+
+    ds = make_sales(columnar)
+    assert [s.sn for s in ds._order_by('-qty')] == [5, 1, 6, 3, 7, 2, 4]
+    assert [s.sn for s in ds._order_by('+qty')] == [4, 2, 7, 3, 1, 6, 5]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_numpy_where(monkeypatch, columnar):
+
+    ds = make_sales(columnar)
+
+    conditions = [
+        (dcol('qty') > 0, ),
+        (dcol('price') <= 1.0, dcol('qty') != 3),
+        ((dcol('cat') == 'a') | dcol('qty').isin([0, -5]), ),
+        (~dcol('price').isin([1.5, 4.0]), ),
+        (lambda s: s.sn % 2 == 0, dcol('price') > 0),
+        (dcol('qty') == None, ),
+    ]
+
+    for conds in conditions:
+        def where():
+            return [s.sn for s in ds._where(*conds)]
+
+        assert where() == pure_python(monkeypatch, where)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_numpy_group_by(monkeypatch, columnar):
+
+    ds = make_sales(columnar)
+
+    def agg():
+        groups = ds._group_by('cat').agg(n=('count', ), total=('sum', 'price'),
+                                         min='qty', max='qty',
+                                         avg='price')
+        return [(g.cat, g.n, g.total, g.min, g.max, g.avg) for g in groups]
+
+    result = agg()
+    expected = pure_python(monkeypatch, agg)
+    assert [r[:5] for r in result] == [r[:5] for r in expected]
+    assert [r[5] for r in result] == pytest.approx([r[5] for r in expected])
+
+
+def test_descending_column():
+
+    _descending_column = dset_module._descending_column
+
+    columns = [numpy.array([3, 0, 255, 7], dtype=numpy.uint8),
+               numpy.array([True, False, True, False]),
+               numpy.array([-2 ** 63, 0, 2 ** 63 - 1, 0], dtype=numpy.int64),
+               numpy.array([1.5, -2.0, 0.0, 3.0])]
+
+    for column in columns:
+        values = column.tolist()
+        order = numpy.lexsort([_descending_column(column)]).tolist()
+        assert order == sorted(range(len(values)), key=lambda i: -values[i])
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from decimal import Decimal
+from domainics.domobj import dobject, datt, dset, dcol
+
+
+def setup_module(module):
+    print()
+
+
+class Sale(dobject):
+    sn = datt(int)
+    cat = datt(str)
+    qty = datt(int)
+    amount = datt(Decimal)
+    __dobject_key__ = [sn]
+
+
+def make_sales(columnar=False):
+    values = [(1, 'a', 3, '1.5'), (2, 'b', 5, '2'), (3, 'a', 1, None),
+              (4, 'c', None, '4'), (5, 'b', 2, '0.5'), (6, 'a', 3, '1')]
+
+    return dset(Sale, _columnar=columnar)(
+                    Sale(sn=sn, cat=cat, qty=qty, amount=amount)
+                        for sn, cat, qty, amount in values)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_where(columnar):
+
+    ds = make_sales(columnar)
+
+    assert [s.sn for s in ds._where(cat='a')] == [1, 3, 6]
+    assert [s.sn for s in ds._where(dcol('qty') >= '3')] == [1, 2, 6]
+    assert [s.sn for s in ds._where(dcol(Sale.qty) == None)] == [4]
+    assert [s.sn for s in ds._where(dcol('qty') < 3)] == [3, 5]
+    assert [s.sn for s in ds._where(~(dcol('qty') < 3))] == [1, 2, 4, 6]
+
+    cond = (dcol('cat') == 'a') | dcol('cat').isin(['c'])
+    assert [s.sn for s in ds._where(cond, dcol('sn') > 1)] == [3, 4, 6]
+
+    assert [s.sn for s in ds._where(lambda s: s.sn % 2 == 0)] == [2, 4, 6]
+    assert ds._where().__class__ is ds.__class__
+
+    with pytest.raises(ValueError):
+        ds._where(nothing=1)
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_order_by(columnar):
+
+    ds = make_sales(columnar)
+
+    assert [s.sn for s in ds._order_by('-qty')] == [4, 2, 1, 6, 5, 3]
+    assert [s.sn for s in ds._order_by('+cat', '-sn')] == [6, 3, 1, 5, 2, 4]
+    assert [s.sn for s in ds._order_by('+amount,+sn')] == [5, 6, 1, 2, 4, 3]
+    assert [s.sn for s in ds._order_by(Sale.qty)] == [3, 5, 1, 6, 2, 4]
+
+    sorted_ds = dset(Sale, _sortable='+sn')(ds)
+    result = sorted_ds._order_by('-sn')
+    assert [s.sn for s in result] == [6, 5, 4, 3, 2, 1]
+    assert result.__class__.__dset_sortable__ == ()
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_group_by(columnar):
+
+    ds = make_sales(columnar)
+
+    result = ds._group_by('cat').agg(n=('count', ), qty=('sum', 'qty'),
+                                     max='amount', avg=('avg', 'qty'))
+
+    assert list(result.__dset_item_class__.__dobject_key__) == ['cat']
+    assert [(r.cat, r.n, r.qty, r.max, r.avg) for r in result] == [
+                ('a', 3, 7, Decimal('1.5'), 7 / 3),
+                ('b', 2, 7, Decimal('2'), 3.5),
+                ('c', 1, None, Decimal('4'), None)]
+
+    result = ds._where(dcol('qty') > 0)._group_by(Sale.cat).agg(min='qty')
+    assert [(r.cat, r.min) for r in result] == [('a', 1), ('b', 2)]
+
+    with pytest.raises(ValueError):
+        ds._group_by('cat').agg(median='qty')
+
+    with pytest.raises(ValueError):
+        ds._group_by()
+
+
+def test_column():
+
+    ds = make_sales()
+
+    assert list(ds._column('sn')) == [1, 2, 3, 4, 5, 6]
+    assert ds._column('qty') == [3, 5, 1, None, 2, 3]
+
+    with pytest.raises(AttributeError):
+        ds._column('nothing')
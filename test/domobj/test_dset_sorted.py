@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+from domainics.domobj.pagination import DPage
+
+
+def setup_module(module):
+    print()
+
+
+class Item(dobject):
+    sn = datt(int)
+    cat = datt(str)
+    price = datt(int)
+    __dobject_key__ = [sn]
+
+
+def make_items():
+    return [Item(sn=1, cat='b', price=10),
+            Item(sn=2, cat='a', price=30),
+            Item(sn=3, cat='b', price=None),
+            Item(sn=4, cat='a', price=20),
+            Item(sn=5, cat='c', price=20)]
+
+
+def test_sorted_order():
+
+    ItemSet = dset(Item, _sortable='+cat,-price')
+    ds = ItemSet(make_items())
+
+    assert [i.sn for i in ds] == [2, 4, 3, 1, 5] # NULLS FIRST in DESC
+    assert [ds[i].sn for i in range(len(ds))] == [2, 4, 3, 1, 5]
+
+    ds._add(Item(sn=4, cat='c', price=1)) # moved
+    ds._add(Item(sn=6, cat='a', price=30)) # after the same sort values
+    del ds[Item(sn=3)]
+    assert [i.sn for i in ds] == [2, 6, 1, 5, 4]
+
+    ds._clear()
+    ds._add(Item(sn=1, cat='x'))
+    assert [i.sn for i in ds] == [1]
+
+
+def test_sorted_range():
+
+    ds = dset(Item, _sortable=[('price', True), ('sn', False)])(make_items())
+
+    assert [i.sn for i in ds] == [1, 5, 4, 2, 3] # NULLS LAST in ASC
+    assert [i.sn for i in ds._range(20, 30)] == [5, 4, 2]
+    assert [i.sn for i in ds._range(start='20')] == [5, 4, 2, 3]
+    assert [i.sn for i in ds._range(stop=(20, 5))] == [1, 5]
+    assert [i.sn for i in ds._range((20, 4), (20, 4))] == [4]
+
+    with pytest.raises(ValueError):
+        ds._range((1, 2, 3))
+
+
+def test_paginate_sortable():
+
+    ds = dset(Item, _sortable='+cat,-price')(make_items())
+
+    page = ds._paginate(DPage(start=1, limit=2, sortable='+cat'))
+    assert [i.sn for i in page] == [4, 3]
+    assert page._page.total == 5
+
+    # sorted in place as ORDER BY price DESC, sn ASC LIMIT 3
+    page = ds._paginate(DPage(start=0, limit=3, sortable='-price,+sn'))
+    assert [i.sn for i in page] == [3, 2, 4]
+    assert page.__class__.__dset_sortable__ == ()
+
+    plain = dset(Item)(make_items())
+    page = plain._paginate(DPage(start=3, sortable='+price'))
+    assert [i.sn for i in page] == [2, 3]
+
+    with pytest.raises(ValueError):
+        plain._paginate(DPage(sortable='+nothing'))
+
+
+def test_sortable_declaration():
+
+    with pytest.raises(ValueError):
+        dset(Item, _sortable='+nothing')
+
+    with pytest.raises(ValueError):
+        dset(Item, _sortable='+sn', _columnar=True)
+
+    class Order(dobject):
+        no = datt(int)
+        items = datt(dset(Item, _sortable='-sn'))
+        __dobject_key__ = [no]
+
+    order = Order(no=1, items=make_items())
+    assert [i.sn for i in order.items] == [5, 4, 3, 2, 1]
+
+
+def test_sorted_many():
+
+    values = [(i * 7919) % 101 for i in range(100)]
+
+    ds = dset(Item, _sortable='-price')(
+                Item(sn=i, price=v) for i, v in enumerate(values))
+    assert [i.price for i in ds] == sorted(values, reverse=True)
+
+    for i in range(0, 100, 3):
+        ds._add(Item(sn=i, price=-i))
+    ds._add(Item(sn=1000))
+    assert [i.price for i in ds][1:] == sorted([i.price for i in ds][1:],
+                                               reverse=True)
+    assert ds[0].sn == 1000
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from decimal import Decimal
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Sale(dobject):
+    sn = datt(int)
+    category = datt(str)
+    amount = datt(int)
+    __dobject_key__ = [sn]
+
+
+def recompute(ds, func):
+    groups = {}
+    for item in ds:
+        groups.setdefault(item.category, []).append(item.amount)
+    return dict((k, func([v for v in vs if v is not None]))
+                    for k, vs in groups.items())
+
+
+@pytest.mark.parametrize('kwargs', [{}, dict(_columnar=True),
+                                    dict(_sortable='-amount')])
+def test_track_changes(kwargs):
+
+    ds = dset(Sale, **kwargs)(Sale(sn=i, category='ab'[i % 2], amount=i)
+                                for i in range(6))
+
+    ds._track(total=('sum', 'amount'), low=('min', 'amount'),
+              high=('max', 'amount'), n=('count', ), by='category')
+    ds._track(grand=('sum', 'amount'), avg='amount')
+
+    assert ds._tracked('total', 'a') == 0 + 2 + 4
+    assert ds._tracked('low') == {'a': 0, 'b': 1}
+    assert ds._tracked('avg') == 2.5
+
+    ds += Sale(sn=10, category='c', amount=7)
+    ds._add(Sale(sn=0, category='b', amount=9)) # moved from 'a' to 'b'
+    del ds[Sale(sn=4)]                          # the max of 'a' removed
+    ds[Sale(sn=5)] = Sale(sn=5, category='b', amount=None)
+
+    assert ds._tracked('grand') == 2 + 1 + 3 + 9 + 7
+    assert ds._tracked('total') == recompute(ds, sum)
+    assert ds._tracked('high') == recompute(ds, max) == {'a': 2, 'b': 9,
+                                                          'c': 7}
+    assert ds._tracked('low') == recompute(ds, min)
+    assert ds._tracked('n') == {'a': 1, 'b': 4, 'c': 1}
+    assert ds._tracked('n', 'z') == 0 and ds._tracked('high', 'z') is None
+
+    del ds[Sale(sn=2)]
+    assert 'a' not in ds._tracked('n')
+
+    ds._clear()
+    assert ds._tracked('grand') is None and ds._tracked('n') == {}
+
+    ds._add(Sale(sn=1, category='a', amount=Decimal(3)))
+    assert ds._tracked('avg') == 3
+
+    ds._untrack('avg')
+    with pytest.raises(KeyError):
+        ds._tracked('avg')
+
+
+@pytest.mark.parametrize('kwargs', [{}, dict(_sortable='-amount')])
+def test_track_changed_in_place(kwargs):
+
+    ds = dset(Sale, **kwargs)(Sale(sn=i, category='ab'[i % 2], amount=i)
+                                for i in range(4))
+    ds._track(total=('sum', 'amount'), high=('max', 'amount'), by='category')
+    ds._create_index('category')
+
+    item = ds[Sale(sn=2)]
+    item.category = 'z' # changed in place, not seen by the trackers
+    item.amount = 100
+    assert ds._tracked('total') == {'a': 0 + 2, 'b': 1 + 3}
+
+    del ds[item] # removed with the values it was tracked with
+    assert len(ds) == 3
+    assert ds._tracked('total') == recompute(ds, sum) == {'a': 0, 'b': 4}
+    assert ds._tracked('high') == {'a': 0, 'b': 3}
+    assert [o.sn for o in ds._lookup(category='a')] == [0]
+
+    item = ds[Sale(sn=3)]
+    item.amount = 30
+    ds._add(item) # put again, tracked with the new value
+    assert ds._tracked('total') == {'a': 0, 'b': 31}
+    assert ds._tracked('high', 'b') == 30
+
+
+def test_track_errors():
+
+    ds = dset(Sale)()
+
+    with pytest.raises(ValueError):
+        ds._track(total=('sum', 'amount'), by='nothing')
+
+    with pytest.raises(ValueError):
+        ds._track(total=('median', 'amount'))
+
+    ds._track(n=('count', ), by=[Sale.category, 'amount'])
+    ds._add(Sale(sn=1, category='a', amount=1))
+    assert ds._tracked('n') == {('a', 1): 1}
+    assert ds._tracked('n', 'a', 1) == 1
+
+    with pytest.raises(ValueError):
+        ds._tracked('n', 'a')
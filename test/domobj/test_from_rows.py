@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+from decimal import Decimal
+
+def setup_module(module):
+    print()
+
+
+class Item(dobject):
+    bill_sn = datt(int)
+    line_no = datt(int)
+    price = datt(Decimal)
+    qty = datt(int, default=1)
+
+    __dobject_key__ = [bill_sn, line_no]
+
+
+def test_dobject_from_rows():
+
+    columns = ['qty', 'line_no', 'memo', 'bill_sn', 'price']
+    rows = [(2, 1, 'x', 101, Decimal('1.5')),
+            (None, 2, 'y', 101, Decimal('2.5'))]
+
+    objs = Item._from_rows(columns, rows)
+    assert len(objs) == 2
+    assert objs[0].bill_sn == 101 and objs[0].line_no == 1
+    assert objs[0].price == Decimal('1.5') and objs[0].qty == 2
+    assert objs[1].qty == 1 # the default value
+    assert tuple(objs[1].__dobject_key__) == (101, 2)
+
+    objs = Item._from_rows(columns, [('3', '1', 'x', '101', '1.5')])
+    assert objs[0].qty == 3 and objs[0].bill_sn == 101
+    assert objs[0].price == Decimal('1.5')
+
+
+def test_from_rows_cast():
+
+    import datetime as dt
+
+    class Rate(dobject):
+        sn = datt(int)
+        ratio = datt(float)
+        since = datt(dt.date)
+        __dobject_key__ = [sn]
+
+    columns = ['sn', 'ratio', 'since']
+    row = (1, Decimal('0.25'), '2016-03-01')
+
+    # loaded as the constructor casts them by default
+    obj = Rate._from_rows(columns, [row])[0]
+    baseline = Rate(dict(zip(columns, row)))
+    assert obj == baseline
+    assert obj.ratio == baseline.ratio and type(obj.ratio) is float
+    assert obj.since == baseline.since == dt.date(2016, 3, 1)
+
+    obj = dset(Rate)._from_rows(columns, [row])[0]
+    assert type(obj.ratio) is float and obj.since == dt.date(2016, 3, 1)
+
+    # stored as they are if trusted
+    obj = Rate._from_rows(columns, [row], trusted=True)[0]
+    assert type(obj.ratio) is Decimal and obj.since == '2016-03-01'
+
+
+def test_dset_from_rows():
+
+    class Bill(dobject):
+        sn = datt(int)
+        items = datt(dset(Item, sn='bill_sn'))
+        __dobject_key__ = [sn]
+
+    columns = ['line_no', 'price']
+    rows = [(1, Decimal('1.5')), (2, Decimal('2.5')), (1, Decimal('3.5'))]
+
+    ItemSet = Bill.items.type
+    items = ItemSet._from_rows(columns, rows, sn=101)
+    assert len(items) == 2 and items.sn == 101
+    assert [item.bill_sn for item in items] == [101, 101]
+    assert items[0].price == Decimal('3.5') # replaced by the same key
+
+    items = dset(Item)._from_rows(['bill_sn', 'line_no'], [(1, 1), (1, 2)])
+    assert len(items) == 2
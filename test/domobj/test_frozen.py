@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from decimal import Decimal
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class Money(dobject, frozen=True):
+    amount = datt(Decimal)
+    currency = datt(str)
+
+
+class Price(dobject, frozen=True):
+    sku = datt(str)
+    money = datt(Money)
+    __dobject_key__ = [sku]
+
+
+def test_frozen_value_object():
+
+    m = Money(amount=Decimal('1.5'), currency='USD')
+
+    with pytest.raises(AttributeError):
+        m.amount = Decimal(2)
+
+    assert m == Money(amount=Decimal('1.5'), currency='USD')
+    assert hash(m) == hash(Money(amount=Decimal('1.5'), currency='USD'))
+    assert len({m, Money(amount=Decimal('1.5'), currency='USD'),
+                Money(amount=1, currency='USD')}) == 2
+
+    assert Money(m) is m # shared, not copied
+    assert Money(m, currency='EUR').currency == 'EUR'
+
+    class Money2(Money): # the frozen is inherited
+        pass
+
+    with pytest.raises(AttributeError):
+        Money2(amount=1).currency = 'USD'
+
+    with pytest.raises(TypeError):
+        class Unfrozen(Money, frozen=False):
+            pass
+
+
+def test_frozen_attributes():
+
+    with pytest.raises(TypeError):
+        class A(dobject, frozen=True):
+            items = datt(dset(Price))
+
+    class M(dobject):
+        amount = datt(int)
+
+    with pytest.raises(TypeError):
+        class B(dobject, frozen=True):
+            money = datt(M)
+
+    p = Price(sku='a', money=Money(amount=1))
+    assert p.money.amount == 1 and hash(p) == hash(p.__dobject_key__)
+
+
+def test_frozen_in_dset():
+
+    class Order(dobject):
+        no = datt(int)
+        prices = datt(dset(Price))
+        __dobject_key__ = [no]
+
+    price = Price(sku='a', money=Money(amount=1))
+
+    ds = dset(Price)()
+    ds._add(price)
+    assert ds[0] is price
+
+    order = Order(no=1, prices=[price])
+    assert order.prices[0] is price
+
+
+def test_frozen_reshape():
+
+    Amount = Money._re('amount')
+    assert Amount.__dobject_frozen__
+
+    with pytest.raises(AttributeError):
+        Amount(amount=1).amount = 2
+
+
+def test_frozen_multiple_bases():
+
+    class Weight(dobject, frozen=True):
+        grams = datt(int)
+
+    class Parcel(Money, Weight): # both frozen roots
+        pass
+
+    assert Parcel.__dobject_frozen__
+    assert (set(Parcel.__dobject_key__) | set(Parcel.__dobject_att__) ==
+                {'amount', 'currency', 'grams'})
+
+    p = Parcel(amount=Decimal(1), currency='USD', grams=5)
+    assert hash(p) == hash(Parcel(amount=Decimal(1), currency='USD', grams=5))
+
+    with pytest.raises(AttributeError):
+        p.grams = 6
+
+
+def test_frozen_copy():
+
+    import copy
+
+    m = Money(amount=Decimal('1.5'), currency='USD')
+    for m2 in (copy.copy(m), copy.deepcopy(m)):
+        assert m2 == m and hash(m2) == hash(m)
+        assert m2.amount == Decimal('1.5') and m2.currency == 'USD'
+
+        with pytest.raises(AttributeError):
+            m2.amount = Decimal(2)
+
+    p = Price(sku='a', money=m)
+    p2 = copy.deepcopy(p)
+    assert p2 == p and p2.money == m
+
+    class M(dobject): # not frozen, copied as before
+        amount = datt(int)
+
+    m = M(amount=1)
+    assert copy.copy(m).amount == 1
+    m2 = copy.deepcopy(m)
+    m2.amount = 2
+    assert m2.amount == 2 and m.amount == 1
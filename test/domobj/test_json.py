@@ -43,3 +43,42 @@ def test_json():
     assert json1['b'][0]['line'] == 1
     assert json1['b'][1]['a_sn'] == 101
     assert json1['b'][1]['line'] == 2
+
+
+def test_dumps_fast():
+    from domainics.json import dumps, dumps_fast
+    from domainics.db import dsequence
+
+    class B(dobject):
+        x = datt(int)
+        y = datt(str)
+        __dobject_key__ = [x]
+
+    class A(dobject):
+        sn = datt(int)
+        name = datt(str)
+        price = datt(Decimal)
+        at = datt(datetime)
+        day = datt(date)
+        seq = datt(dsequence)
+        ratio = datt(float)
+        flag = datt(bool)
+        extra = datt(object)
+        qty = datt(int, default=3)
+        bs = datt(dset(B))
+        __dobject_key__ = [sn]
+
+    obj = A(sn=1, name='a"é', price=Decimal('1.5'),
+            at=datetime(2020, 1, 2, 3, 4), day=date(2020, 1, 2),
+            seq=dsequence(7), ratio=0.1, flag=True, extra={'k': [1]},
+            bs=[B(x=1, y='b')])
+
+    assert dumps_fast(obj) == dumps(obj)
+    assert dumps_fast(A(sn=2)) == dumps(A(sn=2))
+    assert A.__dict__['__dobject_json_encoder__'] is not None
+
+    ds = dset(A)([obj, A(sn=2, ratio=float('nan'))])
+    assert dumps_fast(ds) == dumps(ds)
+    assert dumps_fast(dset(A)()) == '[]'
+
+    assert dumps_fast([1, obj]) == dumps([1, obj])
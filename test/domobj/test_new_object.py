@@ -46,3 +46,41 @@ def test_new_object():
     assert a1.a is None and a2.a == 3
     with pytest.raises(ValueError) as exc:
         A()._re(123)
+
+
+def test_new_object_sources():
+
+    class B(dobject):
+        x = datt(int)
+        y = datt(int)
+        __dobject_key__ = [x]
+
+    class A(dobject):
+        a = datt(int)
+        b = datt(str)
+        c = datt(int, default=100)
+        d = datt(dset(B))
+
+        __dobject_key__ = [a]
+
+    a1 = A(a=1, b='x', d=[B(x=1, y=2)])
+
+    a2 = A(a1) # the same class
+    assert a2.a == 1 and a2.b == 'x' and a2.c == 100
+    assert len(a2.d) == 1 and a2.d is not a1.d
+
+    a3 = A(a1, b='y')
+    assert a3.a == 1 and a3.b == 'y' and len(a3.d) == 1
+
+    a4 = A(dict(a='2', b='z', e=0), c=None)
+    assert a4.a == 2 and a4.b == 'z' and a4.c == 100
+
+    A1 = A._re('a', 'b', _name='A1')
+    a5 = A1(a1)
+    assert a5.a == 1 and a5.b == 'x'
+
+    with pytest.raises(ValueError):
+        A(a=1, e=2)
+
+    with pytest.raises(ValueError):
+        A(a1, a2)
@@ -70,6 +70,57 @@ def test_bool():
     assert not A(c=100)
     assert A(a=1)
 
-    with pytest.raises(ValueError) as exc:
-        assert A(b=None) == False
-    print(exc)
+    # not compared with the other objects, but not equal
+    assert (A(b=None) == False) is False
+    assert A(b=None) != 0
+
+def test_key_tuple():
+    import gc
+
+    class I(dobject):
+        s = datt(int)
+        n = datt(int)
+        x = datt(int)
+
+        __dobject_key__ =[s, n]
+
+    a = I(s=1, n=2, x=3)
+    key = a.__dobject_key__
+
+    assert isinstance(key, tuple) and key == (1, 2)
+    assert (key.s, key.n) == (1, 2) and key.as_dict() == dict(s=1, n=2)
+    assert repr(key) == 'K(s=1, n=2)'
+    assert I.__dobject_key_class__(dict(s=1, n=2)) == key
+
+    # the key refers to its values only, the object is not in a cycle
+    assert not hasattr(key, '__dict__')
+    assert all(obj is not a for obj in gc.get_referents(key))
+
+def test_hash():
+
+    class A(dobject):
+        a = datt(int)
+        b = datt(int)
+        __dobject_key__ = [a]
+
+    class V(dobject):
+        a = datt(int)
+
+    objs = [A(a=1, b=1), A(a=2), A(a=1, b=2)]
+    assert set(objs) == {A(a=1), A(a=2)}
+    assert dict.fromkeys(objs, 0) == {A(a=1): 0, A(a=2): 0}
+    assert hash(A(a=1)) == hash(A(a=1).__dobject_key__)
+
+    # compared with the key tuple of the same hash, they are not equal
+    mixed = {A(a=1): 'obj', (1, ): 'tuple'}
+    assert len(mixed) == 2
+    assert mixed[A(a=1)] == 'obj' and mixed[(1, )] == 'tuple'
+    assert {A(a=1): 1}.get((1, )) is None
+    assert (1, ) not in {A(a=1)} and A(a=1) not in {(1, )}
+    assert A(a=1) != (1, ) and not A(a=1) == 1
+
+    with pytest.raises(TypeError):
+        hash(V(a=1))
+
+    with pytest.raises(TypeError):
+        hash(dset(A)())
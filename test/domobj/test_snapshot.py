@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+class A(dobject):
+    a = datt(int)
+    b = datt(str)
+    c = datt(int, default=5)
+    __dobject_key__ = [a]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_snapshot(columnar):
+
+    ds = dset(A, _columnar=columnar)(A(a=i, b='n%d' % i) for i in range(4))
+    snap = ds._snapshot()
+    assert len(snap) == 4 and A(a=2) in snap and (9, ) not in snap
+
+    if not columnar:
+        ds[A(a=1)].b = 'x' # copied on write
+    else:
+        ds._add(A(a=1, b='x'))
+    del ds[A(a=0)]
+    ds._add(A(a=7, b='n7'))
+
+    assert snap[A(a=1)].b == 'n1' and ds[A(a=1)].b == 'x'
+    assert [(item.a, item.b, item.c) for item in snap] == [
+                (0, 'n0', 5), (1, 'n1', 5), (2, 'n2', 5), (3, 'n3', 5)]
+
+    inserted, changed, deleted = snap._diff(ds)
+    assert [item.a for item in inserted] == [7]
+    assert changed == [((1, ), dict(b=('x', 'n1')))]
+    assert deleted == [(0, )]
+
+    # the item got from snapshot is copied on write too
+    item = snap[A(a=2)]
+    item.b = 'y'
+    assert snap[A(a=2)].b == 'n2' and ds[A(a=2)].b == 'n2'
+
+    with pytest.raises(AttributeError):
+        snap.x = 1
+
+
+def test_snapshot_shared():
+
+    ds = dset(A)(A(a=i, b='n%d' % i) for i in range(3))
+    item = ds[A(a=1)]
+
+    snap = ds._snapshot()
+    assert snap._entries[(1, )][1] is item.__value_vector__
+
+    item._track_changes()
+    item.c = 6
+    snap2 = ds._snapshot()
+    item.b = 'x'
+    assert list(item._changes().items()) == [('b', ('x', 'n1')),
+                                             ('c', (6, 5))]
+
+    assert snap[A(a=1)].c == 5 and snap[A(a=1)].b == 'n1'
+    assert snap2[A(a=1)].c == 6 and snap2[A(a=1)].b == 'n1'
+
+    # only the diverged item is compared
+    assert snap._diff(ds)[1] == [((1, ), dict(b=('x', 'n1'), c=(6, 5)))]
+    assert snap2._diff(ds)[1] == [((1, ), dict(b=('x', 'n1')))]
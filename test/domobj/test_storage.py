@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+
+
+def setup_module(module):
+    print()
+
+
+def test_value_vector():
+
+    class A(dobject):
+        a = datt(int)
+        b = datt(str)
+        c = datt(int, default=100)
+
+        __dobject_key__ = [a]
+
+    a = A(a=1, b='x')
+    assert not hasattr(a, '__dict__')
+    assert a.__value_vector__ == [1, 'x', None]
+    assert a.c == 100
+    assert a.__value_vector__ == [1, 'x', 100]
+
+    a.b = 'y'
+    assert a.b == 'y' and A.b.index == 1
+
+    with pytest.raises(AttributeError):
+        a.x = 1
+
+
+def test_inherited_positions():
+
+    class A(dobject):
+        a = datt(int)
+        b = datt(int)
+        __dobject_key__ = [a]
+
+    class B(A):
+        c = datt(int)
+        __dobject_key__ = [c]
+
+    # In B, the key attribute c comes first, so that a and b are moved
+    assert tuple(B.__dobject_key__) == ('c',)
+    assert B.c.index == 0 and B.a.index != A.a.index
+
+    b = B(a=1, b=2, c=3)
+    assert b.a == 1 and b.b == 2 and b.c == 3
+    assert tuple(b.__dobject_key__) == (3,)
+
+    a = A(a=1, b=2)
+    assert a.a == 1 and a.b == 2
+
+
+def test_dobject_key():
+
+    class A(dobject):
+        a = datt(int)
+        b = datt(int)
+        __dobject_key__ = [a]
+
+    a = A(a=1, b=2)
+    assert list(A.__dobject_key__) == ['a']
+    assert a.__dobject_key__.a == 1
+
+    with pytest.raises(AttributeError):
+        a.__dobject_key__ = None
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from domainics.domobj import dobject, datt, dset
+from domainics.json import dumps
+
+
+def setup_module(module):
+    print()
+
+
+class Tag(dobject):
+    tag = datt(str)
+    __dobject_key__ = [tag]
+
+
+class A(dobject):
+    sn = datt(int)
+    name = datt(str)
+    secret = datt(str)
+    tags = datt(dset(Tag))
+    __dobject_key__ = [sn]
+
+
+def test_object_view():
+
+    obj = A(sn=1, name='x', secret='s', tags=[Tag(tag='t')])
+
+    view = A._re('sn', 'name')._view(obj)
+    assert (view.sn, view.name) == (1, 'x')
+    assert not hasattr(view, 'secret')
+    assert view.__dobject_key__ == (1, )
+
+    obj.name = 'y' # read through the source
+    assert view.name == 'y'
+    assert view.__json_object__() == {'sn': 1, 'name': 'y'}
+    assert dumps(A._re('sn', 'tags')._view(obj)) == (
+                '{"sn": 1, "tags": [{"tag": "t"}]}')
+
+    with pytest.raises(AttributeError):
+        view.name = 'z'
+
+    copied = A._re('sn', 'name')(view)
+    assert copied.name == 'y' and copied.__class__ is A._re('sn', 'name')
+
+    with pytest.raises(TypeError):
+        A._re('sn')._view(dict(sn=1))
+
+
+def test_view_substituted():
+
+    B = A._re('sn', 'name', _subst=dict(name='title'))
+    obj = A(sn=1, name='x')
+
+    view = B._view(obj)
+    assert view.title == 'x'
+    assert view.__json_object__() == {'sn': 1, 'title': 'x'}
+    assert B(obj).title == view.title
+
+    # not the origin class, the attribute is absent
+    class C(dobject):
+        sn = datt(int)
+        name = datt(str)
+
+    assert B._view(C(sn=2, name='x')).title is None
+
+
+def test_dset_view():
+
+    ds = dset(A)(A(sn=i, name='n%d' % i, secret='s') for i in range(5))
+
+    views = A._re('sn', 'name')._view(ds)
+    assert len(views) == 5
+    assert [v.sn for v in views] == [0, 1, 2, 3, 4]
+    assert views[1].name == 'n1'
+    assert [v.sn for v in views[3:]] == [3, 4]
+    assert views.__json_object__()[0] == {'sn': 0, 'name': 'n0'}
+    assert type(views[0]) is type(views[4])
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from decimal import Decimal
+
+from domainics.domobj import dobject, datt, dset
+from domainics.domobj.pagination import DPage
+from domainics.json import dumps_fast
+
+pytest.importorskip('aiohttp')
+redbean = pytest.importorskip('domainics.redbean')
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+
+def setup_module(module):
+    print()
+
+
+class Item(dobject):
+    sn = datt(int)
+    name = datt(str)
+    price = datt(Decimal)
+    __dobject_key__ = [sn]
+
+
+def make_items(n, page=None):
+    ds = dset(Item)((Item(sn=i, name='n%d' % i, price=Decimal(i) / 4)
+                        for i in range(n)), _page=page)
+    return ds
+
+
+async def fetch(ds, headers=None, chunk_size=65536):
+
+    async def handler(request):
+        return redbean.dset_response(request, ds, chunk_size=chunk_size)
+
+    app = web.Application()
+    app.router.add_get('/items', handler)
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get('/items', headers=headers or {})
+        return resp.status, resp.headers, await resp.text()
+
+
+@pytest.mark.asyncio
+async def test_dset_streamed():
+
+    ds = make_items(500)
+    status, headers, text = await fetch(ds, chunk_size=1024)
+
+    assert status == 200
+    assert headers['Transfer-Encoding'] == 'chunked'
+    assert headers['Content-Type'] == 'application/json; charset=utf-8'
+    assert text == dumps_fast(ds) # the same text as the other responses
+
+    status, headers, text = await fetch(make_items(0))
+    assert status == 200 and text == '[]'
+
+
+@pytest.mark.asyncio
+async def test_dset_page_status():
+
+    ds = make_items(5, DPage(start=10, limit=5))
+
+    # the status is kept unless a range is asked
+    status, headers, text = await fetch(ds)
+    assert status == 200 and 'Content-Range' not in headers
+    assert text == dumps_fast(ds)
+
+    status, headers, text = await fetch(ds, {'Range': 'items=10-14'})
+    assert status == 206
+    assert headers['Content-Range'] == ds._page.format_content_range()